@@ -0,0 +1,303 @@
+"""
+एडमिशन कंट्रोल और बैकप्रेशर (Admission Control & Backpressure)।
+
+1. टोकन बकेट (प्रति क्लाइंट/पीयर): सीमा से ज़्यादा अनुरोध तुरंत 429 + Retry-After पाते हैं।
+   रजिस्टर्ड पीयर्स के ट्रांजैक्शन रिले का क्लाइंट्स से अलग बकेट होता है।
+2. सीमित इनजेस्ट कतार (bounded ingest queue): महँगा काम (हस्ताक्षर जाँच, ब्लॉक सत्यापन,
+   सर्वसम्मति) एक समय में केवल `concurrency` अनुरोध करते हैं; बाकी प्राथमिकता क्रम में
+   (पहले ब्लॉक, फिर ट्रांजैक्शन) इंतज़ार करते हैं। कतार भरी हो या इंतज़ार बहुत लंबा हो तो 503।
+
+Flask (थ्रेड्स) के लिए IngestGate और aiohttp (इवेंट लूप) के लिए AsyncIngestGate।
+सीमाएँ प्रति प्रोसेस हैं (Gunicorn में हर वर्कर की अपनी)।
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from utils.metrics import REGISTRY
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स (ENV से बदली जा सकती हैं)
+# ----------------------------------------------------
+
+# प्रति क्लाइंट ट्रांजैक्शन (प्रति सेकंड / बर्स्ट)। बैच में हर ट्रांजैक्शन एक टोकन लेता है।
+TX_RATE = float(os.environ.get('ADMISSION_TX_RATE', 50))
+TX_BURST = float(os.environ.get('ADMISSION_TX_BURST', 500))
+# रजिस्टर्ड पीयर्स के रिले (gossip) का अलग बकेट, ताकि व्यस्त पीयर क्लाइंट सीमा में न अटके।
+# बर्स्ट = MAX_BATCH_TRANSACTIONS, ताकि पीयर का पूरा बैच एक बार में पास हो सके।
+PEER_TX_RATE = float(os.environ.get('ADMISSION_PEER_TX_RATE', 500))
+PEER_TX_BURST = float(os.environ.get('ADMISSION_PEER_TX_BURST', 5000))
+# प्रति पीयर /blocks/new
+BLOCK_RATE = float(os.environ.get('ADMISSION_BLOCK_RATE', 2))
+BLOCK_BURST = float(os.environ.get('ADMISSION_BLOCK_BURST', 10))
+# प्रति पीयर पूरी सर्वसम्मति (जब ब्लॉक हमारी टिप पर सीधे न जुड़े)
+RESOLVE_RATE = float(os.environ.get('ADMISSION_RESOLVE_RATE', 0.2))
+RESOLVE_BURST = float(os.environ.get('ADMISSION_RESOLVE_BURST', 2))
+
+# इनजेस्ट कतार: कुल (चल रहे + इंतज़ार करते) अनुरोध और एक साथ चलने वाला महँगा काम
+INGEST_MAX_PENDING = int(os.environ.get('INGEST_MAX_PENDING', 256))
+INGEST_CONCURRENCY = int(os.environ.get('INGEST_CONCURRENCY', 4))
+# कतार में अधिकतम इंतज़ार (सेकंड)
+BLOCK_QUEUE_TIMEOUT = 10.0
+TRANSACTION_QUEUE_TIMEOUT = 2.0
+
+# कितने अलग क्लाइंट्स के बकेट याद रखें (पुराने LRU से हटते हैं)
+MAX_TRACKED_CLIENTS = 10000
+# पीयर लिस्ट से IP सेट कितनी देर में दोबारा बनाएँ (सेकंड)
+PEER_REFRESH_SECONDS = 30.0
+
+# प्राथमिकता: छोटा नंबर पहले
+PRIORITY_BLOCK = 0
+PRIORITY_TRANSACTION = 1
+
+ADMISSION_REJECTIONS = REGISTRY.counter('mycoin_admission_rejections_total',
+                                        'Requests rejected by admission control', ('kind', 'reason'))
+INGEST_WAIT_SECONDS = REGISTRY.histogram('mycoin_ingest_queue_wait_seconds',
+                                         'Time spent waiting for an ingest slot', ('kind',))
+INGEST_PENDING = REGISTRY.gauge('mycoin_ingest_queue_pending', 'Requests running or waiting in the ingest queue')
+
+_KIND_NAMES = {PRIORITY_BLOCK: 'block', PRIORITY_TRANSACTION: 'transaction'}
+
+
+# ----------------------------------------------------
+# 1. टोकन बकेट रेट लिमिटर
+# ----------------------------------------------------
+
+class RateLimiter:
+    """ हर key (क्लाइंट IP / पीयर) के लिए एक टोकन बकेट """
+    def __init__(self, rate: float, burst: float, max_keys: int = MAX_TRACKED_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> [tokens, आख़िरी अपडेट का समय]
+        self._buckets: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        """ रिटर्न: (अनुमति, Retry-After सेकंड) """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            # बकेट से बड़ा अनुरोध वरना कभी पास नहीं होगा: पूरा भरा बकेट लेता है।
+            # (/transactions/batch ऐसे बैच पहले ही 413 से लौटा देता है, देखें TransactionLimiter)
+            cost = min(cost, self.burst)
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, 0.0
+            return False, (cost - bucket[0]) / self.rate if self.rate > 0 else 60.0
+
+
+class PeerAddresses:
+    """
+    रजिस्टर्ड पीयर्स के IP पते। नोड लिस्ट पढ़ना और DNS lookup पृष्ठभूमि थ्रेड में हर
+    PEER_REFRESH_SECONDS पर होता है, ताकि अनुरोध (या इवेंट लूप) कभी इंतज़ार न करे;
+    नया पीयर अधिकतम इतनी देर बाद पहचाना जाता है।
+    नोट: एक ही होस्ट पर चल रहे नोड्स (127.0.0.1) के लिए उसी होस्ट के क्लाइंट्स भी पीयर गिने जाते हैं।
+    """
+    def __init__(self, nodes: Callable[[], Iterable[str]], refresh: float = PEER_REFRESH_SECONDS):
+        self.nodes = nodes
+        self.refresh = refresh
+        self._addresses: FrozenSet[str] = frozenset()
+        self._refreshed_at = float('-inf')
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def __contains__(self, address: Optional[str]) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            start = not self._refreshing and now - self._refreshed_at >= self.refresh
+            if start:
+                self._refreshing = True
+                self._refreshed_at = now
+        if start:
+            threading.Thread(target=self._refresh, name='peer-addresses', daemon=True).start()
+        return address in self._addresses
+
+    def _refresh(self):
+        addresses = set()
+        try:
+            for node in list(self.nodes()):
+                host = urlparse(node if '//' in node else f'//{node}').hostname
+                if not host:
+                    continue
+                try:
+                    addresses.update(info[4][0] for info in socket.getaddrinfo(host, None))
+                except OSError:
+                    addresses.add(host)
+            self._addresses = frozenset(addresses)
+        except Exception as e:
+            print(f"WARN: Could not refresh peer addresses: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+class TransactionLimiter:
+    """ /transactions/* के बकेट: क्लाइंट्स के लिए TX_*, रजिस्टर्ड पीयर्स के रिले के लिए PEER_TX_* """
+    def __init__(self, nodes: Callable[[], Iterable[str]]):
+        self.clients = RateLimiter(TX_RATE, TX_BURST)
+        self.peers = RateLimiter(PEER_TX_RATE, PEER_TX_BURST)
+        self.peer_addresses = PeerAddresses(nodes)
+
+    def limiter_for(self, address: Optional[str]) -> RateLimiter:
+        return self.peers if address in self.peer_addresses else self.clients
+
+    def oversized(self, address: Optional[str], count: int) -> Optional[str]:
+        """ बैच बकेट से बड़ा हो तो 413 संदेश (वरना None) """
+        burst = int(self.limiter_for(address).burst)
+        if count > burst:
+            return f'Error: At most {burst} transactions per batch from one client (rate limit burst); split the batch'
+        return None
+
+    def allow(self, address: Optional[str], cost: float = 1.0) -> Tuple[bool, float]:
+        return self.limiter_for(address).allow(address or 'unknown', cost)
+
+
+# ----------------------------------------------------
+# 2. प्राथमिकता वाली सीमित इनजेस्ट कतार (थ्रेड्स के लिए)
+# ----------------------------------------------------
+
+class IngestGate:
+    """
+    महँगे काम के लिए `concurrency` स्लॉट। खाली स्लॉट हमेशा सबसे ऊँची प्राथमिकता (फिर सबसे पुराने)
+    इंतज़ार करते अनुरोध को मिलता है। कुल `max_pending` से अधिक अनुरोध तुरंत अस्वीकार।
+    """
+    def __init__(self, max_pending: int = INGEST_MAX_PENDING, concurrency: int = INGEST_CONCURRENCY):
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._active = 0
+        # [priority, seq, Event, granted]
+        self._waiting: List[list] = []
+        self._seq = itertools.count()
+        INGEST_PENDING.set_function(lambda: self._active + len(self._waiting))
+
+    def acquire(self, priority: int, timeout: float) -> bool:
+        with self._lock:
+            if self._active + len(self._waiting) >= self.max_pending:
+                ADMISSION_REJECTIONS.inc(1, (_KIND_NAMES[priority], 'queue_full'))
+                return False
+            if self._active < self.concurrency and not self._waiting:
+                self._active += 1
+                return True
+            entry = [priority, next(self._seq), threading.Event(), False]
+            heapq.heappush(self._waiting, entry)
+
+        start = time.perf_counter()
+        entry[2].wait(timeout)
+        with self._lock:
+            if not entry[3]:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                ADMISSION_REJECTIONS.inc(1, (_KIND_NAMES[priority], 'queue_timeout'))
+                return False
+        INGEST_WAIT_SECONDS.observe(time.perf_counter() - start, (_KIND_NAMES[priority],))
+        return True
+
+    def release(self):
+        with self._lock:
+            if self._waiting:
+                # स्लॉट सीधे अगले अनुरोध को सौंपें (_active वही रहता है)
+                entry = heapq.heappop(self._waiting)
+                entry[3] = True
+                entry[2].set()
+            else:
+                self._active -= 1
+
+    @contextmanager
+    def admit(self, priority: int, timeout: Optional[float] = None):
+        """ with gate.admit(PRIORITY_BLOCK) as admitted: ... (admitted=False -> 503 लौटाएँ) """
+        if timeout is None:
+            timeout = BLOCK_QUEUE_TIMEOUT if priority == PRIORITY_BLOCK else TRANSACTION_QUEUE_TIMEOUT
+        admitted = self.acquire(priority, timeout)
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                self.release()
+
+
+# ----------------------------------------------------
+# 3. वही कतार asyncio के लिए
+# ----------------------------------------------------
+
+class AsyncIngestGate:
+    """ IngestGate जैसा, लेकिन इंतज़ार करने वाले coroutines हैं (एक ही इवेंट लूप से उपयोग करें) """
+    def __init__(self, max_pending: int = INGEST_MAX_PENDING, concurrency: int = INGEST_CONCURRENCY):
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+        self._active = 0
+        # (priority, seq, Future)
+        self._waiting: List[Tuple[int, int, Any]] = []
+        self._seq = itertools.count()
+        INGEST_PENDING.set_function(lambda: self._active + len(self._waiting))
+
+    async def acquire(self, priority: int, timeout: float) -> bool:
+        if self._active + len(self._waiting) >= self.max_pending:
+            ADMISSION_REJECTIONS.inc(1, (_KIND_NAMES[priority], 'queue_full'))
+            return False
+        if self._active < self.concurrency and not self._waiting:
+            self._active += 1
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._seq), future)
+        heapq.heappush(self._waiting, entry)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            granted = future.done() and not future.cancelled()
+            if not granted:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                future.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                # क्लाइंट चला गया: मिला हुआ स्लॉट आगे सौंपें
+                if granted:
+                    self.release()
+                raise
+            if not granted:
+                ADMISSION_REJECTIONS.inc(1, (_KIND_NAMES[priority], 'queue_timeout'))
+                return False
+        INGEST_WAIT_SECONDS.observe(time.perf_counter() - start, (_KIND_NAMES[priority],))
+        return True
+
+    def release(self):
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(True)
+                return
+        self._active -= 1
+
+    async def run(self, priority: int, coro_fn, *args):
+        """
+        `coro_fn(*args)` को स्लॉट मिलने पर चलाता है।
+        रिटर्न: (admitted, परिणाम)।
+        """
+        timeout = BLOCK_QUEUE_TIMEOUT if priority == PRIORITY_BLOCK else TRANSACTION_QUEUE_TIMEOUT
+        if not await self.acquire(priority, timeout):
+            return False, None
+        try:
+            return True, await coro_fn(*args)
+        finally:
+            self.release()
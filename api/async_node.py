@@ -0,0 +1,780 @@
+"""
+MyCoin नोड का वैकल्पिक asyncio रनटाइम।
+
+Flask वाले api/node_api.py जैसे ही रूट्स, लेकिन aiohttp सर्वर पर:
+- पीयर कॉल्स (प्रसारण, सर्वसम्मति फ़ेच) async HTTP क्लाइंट से समवर्ती रूप से होती हैं,
+  इसलिए धीमा पीयर किसी वर्कर थ्रेड को नहीं रोकता।
+- PoW खोज एक अलग प्रोसेस पूल में चलती है (GIL/इवेंट लूप ब्लॉक नहीं होता)।
+- बाकी CPU-भारी काम (हस्ताक्षर जाँच, चेन सत्यापन, सेव) थ्रेड executor में।
+
+उपयोग:
+    pip install aiohttp
+    python -m api.async_node --port 5000 --connect http://127.0.0.1:5001
+"""
+import argparse
+import asyncio
+import hmac
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:  # pragma: no cover - वैकल्पिक निर्भरता
+    raise SystemExit("async runtime requires aiohttp: pip install aiohttp")
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from core.blockchain import Blockchain, MAX_BATCH_TRANSACTIONS, record_pow
+from core.p2p_network import BROADCAST_SECONDS, BROADCAST_FAILURES
+from core.cryptos import transaction_id
+from core.gossip import GOSSIP_MODE, relay_batches, relay_wait
+from core.events import block_summary, format_sse
+from core.snapshot import build_snapshot, commitment_at, snapshot_sync_enabled
+from core.startup import NodeStartup
+from core.tracing import BlockTracer, default_node_name
+from core.work_manager import WorkManager
+from utils.metrics import REGISTRY, CONTENT_TYPE
+from utils import profiling
+from utils.profiling import span
+from api.admission import (
+    RateLimiter, TransactionLimiter, AsyncIngestGate, PRIORITY_BLOCK, PRIORITY_TRANSACTION,
+    BLOCK_RATE, BLOCK_BURST, RESOLVE_RATE, RESOLVE_BURST, ADMISSION_REJECTIONS,
+)
+from api.response_cache import ResponseCache, CachedResponse, etag_matches
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+
+# एक साथ खुले पीयर कनेक्शन्स की सीमा
+MAX_PEER_CONNECTIONS = 1000
+# /events सब्सक्राइबर्स की सीमा (यहाँ हर सब्सक्राइबर केवल एक coroutine है, थ्रेड नहीं)
+MAX_EVENT_SUBSCRIBERS = int(os.environ.get('MAX_EVENT_SUBSCRIBERS', 10000))
+EVENT_KEEPALIVE_SECONDS = 15
+# एडमिन-केवल सुविधाएँ (सेट न हो तो बंद), हेडर X-Admin-Token से
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+# चेन लोड होने से पहले भी उपलब्ध पाथ
+STARTUP_EXEMPT_PATHS = {'/', '/health', '/ready', '/metrics'}
+
+REQUEST_SECONDS = REGISTRY.histogram('mycoin_http_request_duration_seconds',
+                                     'HTTP request latency per route', ('route', 'method', 'status'))
+
+
+def node_url(node: str, path: str) -> str:
+    # Render URLs के लिए 'https' का उपयोग करें
+    return f'https://{node}{path}' if 'http' not in node and 'https' not in node else f'{node}{path}'
+
+
+# ----------------------------------------------------
+# 1. Async पीयर ट्रांसपोर्ट
+# ----------------------------------------------------
+
+class AsyncTransport:
+    """
+    Blockchain का ट्रांसपोर्ट (core/p2p_network.HttpTransport जैसा इंटरफ़ेस)।
+    प्रसारण इवेंट लूप पर "fire-and-forget" टास्क के रूप में शेड्यूल होता है, इसलिए
+    new_block/new_transaction पीयर्स के जवाब का इंतज़ार नहीं करते।
+    mode='inv' (डिफ़ॉल्ट): केवल IDs घोषित होती हैं (core/gossip.py); 'flood': पूरी बॉडी हर पीयर को।
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, session: 'aiohttp.ClientSession', mode: str = GOSSIP_MODE):
+        self.loop = loop
+        self.session = session
+        self.mode = mode
+
+    def _schedule(self, coro):
+        asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def _post_all(self, nodes, path: str, payload: Dict[str, Any], kind: str,
+                        tracer: Optional[BlockTracer] = None, trace_id: Optional[str] = None):
+        """ हर पीयर को समवर्ती POST; tracer दिया हो तो हर पीयर एक 'forward' ट्रेस स्पैन """
+        async def post(node):
+            start = time.perf_counter()
+            began = tracer.clock() if tracer else 0.0
+            result: Any = 'failed'
+            try:
+                async with self.session.post(node_url(node, path), json=payload) as response:
+                    await response.read()
+                    ok = response.status in (200, 201)
+                    result = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                ok = False
+            if ok:
+                BROADCAST_SECONDS.observe(time.perf_counter() - start, (node, kind))
+            else:
+                BROADCAST_FAILURES.inc(1, (node, kind))
+            if tracer:
+                tracer.record(trace_id, 'forward', began, peer=node, mode='flood', result=result)
+            return ok
+
+        results = await asyncio.gather(*(post(node) for node in nodes))
+        return sum(1 for ok in results if ok)
+
+    async def _post_relay(self, node: str, transactions: List[Dict[str, Any]]) -> bool:
+        """ core/p2p_network._post_relay जैसा: टुकड़ों में /transactions/batch, 429 पर Retry-After मानें """
+        ok = True
+        for batch in relay_batches(transactions):
+            attempt = 0
+            while True:
+                async with self.session.post(node_url(node, '/transactions/batch'),
+                                             json={'transactions': batch}) as response:
+                    await response.read()
+                    status, retry_after = response.status, response.headers.get('Retry-After')
+                wait = relay_wait(status, retry_after, attempt)
+                if wait is None:
+                    break
+                await asyncio.sleep(wait)
+                attempt += 1
+            ok = ok and status in (200, 201)
+        return ok
+
+    async def _relay_all(self, nodes, transactions: List[Dict[str, Any]]):
+        """ flood मोड: हर पीयर को समवर्ती टुकड़ों वाला रिले """
+        async def relay(node):
+            start = time.perf_counter()
+            try:
+                ok = await self._post_relay(node, transactions)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                ok = False
+            if ok:
+                BROADCAST_SECONDS.observe(time.perf_counter() - start, (node, 'transaction_batch'))
+            else:
+                BROADCAST_FAILURES.inc(1, (node, 'transaction_batch'))
+            return ok
+
+        results = await asyncio.gather(*(relay(node) for node in nodes))
+        return sum(1 for ok in results if ok)
+
+    async def _announce_all(self, blockchain: Blockchain, inventory: Dict[str, List[str]]):
+        """ IDs घोषित करें; हर पीयर को केवल वही बॉडीज़ जो उसने माँगीं """
+        tracer = blockchain.tracer
+
+        async def announce(node):
+            start = time.perf_counter()
+            began = tracer.clock()
+            delivered = set()
+            ok = False
+            try:
+                async with self.session.post(node_url(node, '/inv'), json={'inventory': inventory}) as response:
+                    if response.status != 200:
+                        BROADCAST_FAILURES.inc(1, (node, 'inv'))
+                        return False
+                    bodies = blockchain.gossip.bodies((await response.json()).get('request') or {})
+                for block in bodies.get('block', []):
+                    block_hash = blockchain.hash(block)
+                    async with self.session.post(node_url(node, '/blocks/new'),
+                                                 json={'block': block, 'trace': tracer.outgoing(block_hash)}) as response:
+                        await response.read()
+                    delivered.add(block_hash)
+                if bodies.get('tx'):
+                    await self._post_relay(node, bodies['tx'])
+                ok = True
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                BROADCAST_FAILURES.inc(1, (node, 'inv'))
+                return False
+            finally:
+                # core/p2p_network._announce_to_peer जैसे 'forward' स्पैन
+                for block_hash in inventory.get('block', []):
+                    result = 'sent' if block_hash in delivered else ('declined' if ok else 'failed')
+                    tracer.record(block_hash, 'forward', began, peer=node, mode='inv', result=result)
+            BROADCAST_SECONDS.observe(time.perf_counter() - start, (node, 'inv'))
+            return True
+
+        results = await asyncio.gather(*(announce(node) for node in blockchain.view.nodes))
+        return sum(1 for ok in results if ok)
+
+    def broadcast_transaction(self, blockchain: Blockchain, transaction: Dict[str, Any]):
+        if self.mode == 'flood':
+            self._schedule(self._post_all(blockchain.view.nodes, '/transactions/new', transaction, 'transaction'))
+        else:
+            self._schedule(self._announce_all(blockchain, {'tx': [transaction_id(transaction)]}))
+
+    def broadcast_transactions(self, blockchain: Blockchain, transactions: List[Dict[str, Any]]):
+        if not transactions:
+            return
+        if self.mode == 'flood':
+            self._schedule(self._relay_all(blockchain.view.nodes, transactions))
+        else:
+            self._schedule(self._announce_all(blockchain, {'tx': [transaction_id(tx) for tx in transactions]}))
+
+    def broadcast_new_block(self, blockchain: Blockchain, block: Dict[str, Any]):
+        async def run():
+            if self.mode == 'flood':
+                block_hash = blockchain.hash(block)
+                payload = {'block': block, 'trace': blockchain.tracer.outgoing(block_hash)}
+                sent = await self._post_all(blockchain.view.nodes, '/blocks/new', payload, 'block',
+                                            blockchain.tracer, block_hash)
+            else:
+                sent = await self._announce_all(blockchain, {'block': [blockchain.hash(block)]})
+            print(f"P2P: Broadcasting new block {block['index']} to {sent} nodes.")
+        self._schedule(run())
+
+    async def _get_json(self, node: str, path: str, params: Optional[Dict[str, Any]] = None,
+                        timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        kwargs: Dict[str, Any] = {'params': params}
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        try:
+            async with self.session.get(node_url(node, path), **kwargs) as response:
+                if response.status != 200:
+                    return None
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
+
+    async def fetch_chain_async(self, node: str) -> Optional[Dict[str, Any]]:
+        return await self._get_json(node, '/chain')
+
+    def _run(self, coro):
+        """ सिंक्रोनस कॉलर्स (executor/बैकग्राउंड थ्रेड) के लिए: इवेंट लूप पर चलाकर परिणाम का इंतज़ार """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def fetch_chain(self, node: str) -> Optional[Dict[str, Any]]:
+        """ सिंक्रोनस कॉलर्स (executor थ्रेड में Blockchain.resolve_conflicts) के लिए """
+        return self._run(self.fetch_chain_async(node))
+
+    def fetch_snapshot(self, node: str) -> Optional[Dict[str, Any]]:
+        return self._run(self._get_json(node, '/snapshot', timeout=30))
+
+    def fetch_snapshot_commitment(self, node: str, height: int) -> Optional[Dict[str, Any]]:
+        return self._run(self._get_json(node, '/snapshot/commitment', params={'height': height}, timeout=10))
+
+
+# ----------------------------------------------------
+# 2. नोड (रूट हैंडलर्स)
+# ----------------------------------------------------
+
+class AsyncNode:
+    def __init__(self, node_identifier: str):
+        self.node_identifier = node_identifier
+        self.blockchain: Optional[Blockchain] = None
+        self.startup: Optional[NodeStartup] = None
+        self.work: Optional[WorkManager] = None
+        self.transport: Optional[AsyncTransport] = None
+        self.executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4),
+                                           thread_name_prefix='node-worker')
+        # PoW केवल एक प्रोसेस में, ताकि एक समय पर एक ही ब्लॉक माइन हो
+        # 'spawn' ताकि चल रहे थ्रेड्स/इवेंट लूप वाले प्रोसेस को fork न करना पड़े
+        self.mining_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        self.mining_lock = asyncio.Lock()
+        self.event_subscribers = 0
+        # एडमिशन कंट्रोल: प्रति क्लाइंट/पीयर रेट लिमिट और प्राथमिकता वाली इनजेस्ट कतार
+        self.tx_limiter = TransactionLimiter(lambda: self.blockchain.view.nodes)
+        self.block_limiter = RateLimiter(BLOCK_RATE, BLOCK_BURST)
+        self.resolve_limiter = RateLimiter(RESOLVE_RATE, RESOLVE_BURST)
+        self.ingest_gate = AsyncIngestGate()
+        # /chain, /balance, /nodes/resolve के एन्कोड किए गए जवाब (टिप बदलने तक)
+        self.response_cache = ResponseCache()
+        self.templates = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(['html']))
+        self.templates.globals['url_for'] = lambda endpoint, filename: f'/{endpoint}/{filename}'
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    # --- जीवन चक्र (Lifecycle) ---
+    async def on_startup(self, app: web.Application):
+        loop = asyncio.get_running_loop()
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_PEER_CONNECTIONS),
+            timeout=aiohttp.ClientTimeout(total=5),
+        )
+        self.transport = AsyncTransport(loop, session)
+        # Blockchain लोड करना (डिस्क पढ़ना + बैलेंस रीप्ले) और पीयर सिंक बैकग्राउंड थ्रेड में,
+        # ताकि पोर्ट तुरंत बँध जाए (प्रगति /health और /ready पर)
+        self.blockchain = Blockchain(node_address=self.node_identifier, transport=self.transport, defer_load=True)
+        # ट्रेस में यह नोड <host>:<port> के नाम से (एक होस्ट पर कई नोड्स)
+        self.blockchain.tracer.node = default_node_name(app.get('port'))
+        self.startup = NodeStartup(self.blockchain).start(app.get('connect', []), app.get('snapshot_sync', False))
+        self.work = WorkManager(self.blockchain)
+
+    async def on_cleanup(self, app: web.Application):
+        if self.transport is not None:
+            await self.transport.session.close()
+        self.mining_pool.shutdown(cancel_futures=True)
+        self.executor.shutdown(wait=False)
+
+    async def resolve_conflicts(self, block: Optional[Dict[str, Any]] = None, trace: Optional[Dict[str, Any]] = None,
+                                received_at: Optional[float] = None) -> bool:
+        """
+        सभी पीयर्स से चेन समवर्ती रूप से फ़ेच करें, फिर सत्यापन/बदलाव executor में।
+        block/trace/received_at: सर्वसम्मति शुरू करने वाले ब्लॉक का ट्रेस (Blockchain.resolve_conflicts जैसा)।
+        """
+        nodes = list(self.blockchain.view.nodes)
+        trace_id = self.blockchain.trace_received(block, trace, received_at)
+        tracer = self.blockchain.tracer
+
+        async def fetch(node):
+            with tracer.span(trace_id, 'download', peer=node) as attrs:
+                data = await self.transport.fetch_chain_async(node)
+                attrs['result'] = 'ok' if data is not None else 'unreachable'
+            return data
+
+        with span('consensus_fetch'):
+            peer_chains = await asyncio.gather(*(fetch(node) for node in nodes))
+        return await self.run_blocking(self.blockchain.adopt_longest_chain, peer_chains, trace_id)
+
+    # --- एडमिशन कंट्रोल ---
+    @staticmethod
+    def rate_limited(retry_after: float, kind: str) -> web.Response:
+        ADMISSION_REJECTIONS.inc(1, (kind, 'rate_limited'))
+        return web.json_response({'message': 'Too many requests, slow down'}, status=429,
+                                 headers={'Retry-After': str(max(1, int(retry_after + 0.999)))})
+
+    @staticmethod
+    def overloaded() -> web.Response:
+        return web.json_response({'message': 'Node is busy, try again later'}, status=503,
+                                 headers={'Retry-After': '1'})
+
+    @staticmethod
+    def cached_json(request: web.Request, entry: CachedResponse) -> web.Response:
+        """ कैश्ड बाइट्स + ETag; If-None-Match मेल खाने पर 304 """
+        if etag_matches(request.headers.get('If-None-Match'), entry.etag):
+            return web.Response(status=304, headers={'ETag': entry.etag})
+        return web.Response(body=entry.body, content_type='application/json', headers={'ETag': entry.etag})
+
+    # --- स्टार्टअप गेट और हेल्थ ---
+    @web.middleware
+    async def startup_middleware(self, request: web.Request, handler):
+        """ चेन लोड होने तक चेन पर निर्भर अनुरोधों को 503 """
+        if (self.startup.loaded or request.path in STARTUP_EXEMPT_PATHS or request.path.startswith('/static/')
+                or request.path.startswith('/admin/')):
+            return await handler(request)
+        return web.json_response({'message': 'Node is starting up, try again later', 'startup': self.startup.status()},
+                                 status=503, headers={'Retry-After': '2'})
+
+    async def health(self, request: web.Request):
+        status = self.startup.status()
+        return web.json_response(status, status=503 if status['phase'] == 'failed' else 200)
+
+    async def ready(self, request: web.Request):
+        status = self.startup.status()
+        return web.json_response(status, status=200 if status['ready'] else 503)
+
+    # --- मेट्रिक्स मिडलवेयर ---
+    @web.middleware
+    async def latency_middleware(self, request: web.Request, handler):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            resource = request.match_info.route.resource
+            route = resource.canonical if resource is not None else 'unmatched'
+            REQUEST_SECONDS.observe(time.perf_counter() - start, (route, request.method, str(status)))
+
+    # --- UI ---
+    async def index(self, request: web.Request):
+        html = self.templates.get_template('index.html').render(node_id=self.node_identifier)
+        return web.Response(text=html, content_type='text/html')
+
+    @staticmethod
+    def is_admin(request: web.Request) -> bool:
+        token = request.headers.get('X-Admin-Token', '')
+        return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+    @staticmethod
+    async def json_body(request: web.Request) -> Any:
+        """ JSON बॉडी; खराब JSON पर None (हैंडलर 500 की जगह 400 लौटाता है) """
+        try:
+            return await request.json()
+        except ValueError:
+            return None
+
+    # --- एडमिन (node_api.py के /admin/* जैसे) ---
+    async def list_profiles(self, request: web.Request):
+        if not self.is_admin(request):
+            return web.json_response({'message': 'Forbidden'}, status=403)
+        return web.json_response({'profiles': profiling.recent_profiles()}, status=200)
+
+    async def get_profile(self, request: web.Request):
+        if not self.is_admin(request):
+            return web.json_response({'message': 'Forbidden'}, status=403)
+        profile = profiling.get_profile(int(request.match_info['profile_id']))
+        if profile is None:
+            return web.json_response({'message': 'Profile not found'}, status=404)
+        return web.json_response(profile, status=200)
+
+    async def list_traces(self, request: web.Request):
+        if not self.is_admin(request):
+            return web.json_response({'message': 'Forbidden'}, status=403)
+        limit = request.query.get('limit', '1000')
+        limit = int(limit) if limit.lstrip('-').isdigit() else 1000
+        return web.json_response({'spans': self.blockchain.tracer.recent(request.query.get('trace_id'), limit)},
+                                 status=200)
+
+    # --- ब्लॉकचेन ऑपरेशन ---
+    async def mine(self, request: web.Request):
+        # ?reward_address=<पता>: रिवॉर्ड इस नोड की जगह उस पते को (PoW इस नोड का CPU है: केवल एडमिन)
+        reward_address = request.query.get('reward_address')
+        if reward_address and not self.is_admin(request):
+            return web.json_response({'message': 'reward_address requires a valid X-Admin-Token'}, status=403)
+        miner_address = reward_address or self.node_identifier
+        async with self.mining_lock:
+            block = None
+            while block is None:
+                view = self.blockchain.view
+                previous_hash = self.blockchain.hash(view.last_block)
+
+                start = time.perf_counter()
+                proof = await asyncio.get_running_loop().run_in_executor(
+                    self.mining_pool, Blockchain.search_proof, previous_hash, view.difficulty)
+                record_pow(proof + 1, time.perf_counter() - start)
+
+                # None = PoW के दौरान पीयर का ब्लॉक आ गया, नई टिप पर दोबारा माइन करें
+                block = await self.run_blocking(self.blockchain.new_block, proof=proof, previous_hash=previous_hash,
+                                                miner_address=miner_address)
+
+        response = {
+            'message': "नया ब्लॉक सफलतापूर्वक माइन हो गया और नेटवर्क पर प्रसारित हो गया!",
+            'index': block['index'],
+            'transactions': block['transactions'],
+            'proof': block['proof'],
+            'previous_hash': block['previous_hash'],
+            'reward': block['transactions'][0]['amount']
+        }
+        return web.json_response(response, status=200)
+
+    # --- रिमोट माइनिंग (get-work / submit-work) ---
+    async def get_work(self, request: web.Request):
+        miner = request.query.get('miner') or request.remote or 'unknown'
+        work = self.work.get_work(miner, request.query.get('reward_address') or self.node_identifier)
+        if work is None:
+            return web.json_response({'message': 'Chain state is still loading'}, status=503)
+        return web.json_response(work, status=200)
+
+    async def submit_work(self, request: web.Request):
+        values = await self.json_body(request)
+        if not isinstance(values, dict) or 'work_id' not in values or 'nonce' not in values:
+            return web.json_response({'message': 'Error: Missing required values: work_id, nonce'}, status=400)
+
+        # ब्लॉक मिलने पर new_block (सेव + प्रसारण) executor में
+        result = await self.run_blocking(self.work.submit, values['work_id'], values['nonce'])
+        status = {'block': 201, 'share': 200, 'stale': 409, 'duplicate': 409}.get(result['result'], 400)
+        return web.json_response(result, status=status)
+
+    async def work_status(self, request: web.Request):
+        work_id = request.query.get('work_id')
+        if not work_id:
+            return web.json_response({'message': 'Error: Please supply a work_id'}, status=400)
+        return web.json_response(self.work.status(work_id), status=200)
+
+    async def work_miners(self, request: web.Request):
+        return web.json_response(self.work.miners(), status=200)
+
+    async def new_transaction(self, request: web.Request):
+        allowed, retry_after = self.tx_limiter.allow(request.remote)
+        if not allowed:
+            return self.rate_limited(retry_after, 'transaction')
+
+        values = await self.json_body(request)
+
+        required = ['sender', 'recipient', 'amount', 'signature']
+        if not isinstance(values, dict) or not all(k in values for k in required):
+            return web.Response(text='Missing required values: sender, recipient, amount, signature', status=400)
+
+        # सस्ती जाँचें (डुप्लिकेट, बैलेंस) इवेंट लूप पर ही, कतार से पहले
+        error = self.blockchain.precheck_transaction(values['sender'], values['recipient'], values['amount'],
+                                                     values['signature'])
+        if error:
+            return web.json_response({'message': error}, status=406)
+
+        admitted, result = await self.ingest_gate.run(
+            PRIORITY_TRANSACTION, self.run_blocking, partial(self.blockchain.new_transaction, prechecked=True),
+            values['sender'], values['recipient'], values['amount'], values['signature'])
+        if not admitted:
+            return self.overloaded()
+        index, message = result
+        if index is False:
+            return web.json_response({'message': message}, status=406)
+
+        return web.json_response({'message': 'ट्रांजैक्शन सफलतापूर्वक पूल में जोड़ा गया और नेटवर्क पर प्रसारित हो गया।'},
+                                 status=201)
+
+    async def new_transactions_batch(self, request: web.Request):
+        values = await self.json_body(request)
+        transactions = values.get('transactions') if isinstance(values, dict) else None
+
+        if not isinstance(transactions, list):
+            return web.json_response({'message': 'Error: Please supply a list of transactions'}, status=400)
+        if len(transactions) > MAX_BATCH_TRANSACTIONS:
+            return web.json_response({'message': f'Error: At most {MAX_BATCH_TRANSACTIONS} transactions per batch'},
+                                     status=413)
+
+        oversized = self.tx_limiter.oversized(request.remote, len(transactions))
+        if oversized:
+            return web.json_response({'message': oversized}, status=413)
+        allowed, retry_after = self.tx_limiter.allow(request.remote, max(1, len(transactions)))
+        if not allowed:
+            return self.rate_limited(retry_after, 'transaction')
+
+        admitted, results = await self.ingest_gate.run(PRIORITY_TRANSACTION, self.run_blocking,
+                                                       self.blockchain.new_transactions_batch, transactions)
+        if not admitted:
+            return self.overloaded()
+        accepted = sum(1 for result in results if result['accepted'])
+        return web.json_response({
+            'message': f'{accepted} ट्रांजैक्शन पूल में जोड़े गए, {len(results) - accepted} अस्वीकृत।',
+            'accepted': accepted,
+            'rejected': len(results) - accepted,
+            'results': results,
+        }, status=200)
+
+    async def full_chain(self, request: web.Request):
+        def build():
+            view = self.blockchain.view
+            return {'chain': view.chain, 'length': len(view.chain), 'difficulty': view.difficulty,
+                    'pruned_height': view.pruned_height}
+
+        # बड़ी चेन का JSON बनाना भी CPU काम है (केवल कैश मिस पर)
+        tip_key = self.blockchain.tip_key
+        entry = self.response_cache.lookup('chain', ('chain',), tip_key)
+        if entry is None:
+            entry = await self.run_blocking(self.response_cache.build_and_store, ('chain',), tip_key,
+                                            self.blockchain, build)
+        return self.cached_json(request, entry)
+
+    async def get_snapshot(self, request: web.Request):
+        snapshot = await self.run_blocking(build_snapshot, self.blockchain)
+        body = await self.run_blocking(json.dumps, snapshot)
+        return web.Response(text=body, content_type='application/json')
+
+    async def get_snapshot_commitment(self, request: web.Request):
+        height = request.query.get('height', '')
+        if not height.isdigit():
+            return web.json_response({'message': 'Error: Please supply a height'}, status=400)
+        result = await self.run_blocking(commitment_at, self.blockchain, int(height))
+        if result is None:
+            return web.json_response({'message': 'Height not available on this node'}, status=404)
+        return web.json_response(result, status=200)
+
+    async def get_address_balance(self, request: web.Request):
+        address = request.match_info['address']
+        entry = self.response_cache.get_or_build('balance', ('balance', address), self.blockchain, lambda: {
+            'address': address,
+            'balance': self.blockchain.get_balance(address),
+            'message': 'Balance retrieved successfully'
+        })
+        return self.cached_json(request, entry)
+
+    # --- P2P और नेटवर्क प्रबंधन ---
+    async def receive_new_block(self, request: web.Request):
+        received_at = time.time()
+        peer = request.remote or 'unknown'
+        allowed, retry_after = self.block_limiter.allow(peer)
+        if not allowed:
+            return self.rate_limited(retry_after, 'block')
+
+        values = await self.json_body(request)
+        if not isinstance(values, dict):
+            values = {}
+        block = values.get('block')
+        trace = values.get('trace')
+        if block is None:
+            return web.json_response({'message': 'Error: Missing block data'}, status=400)
+
+        ignored = web.json_response({'message': 'New block received, but local chain is authoritative or block is old.'},
+                                    status=200)
+        # सस्ती जाँच: पहले से ज्ञात/पुराने ब्लॉक पर कोई महँगा काम नहीं
+        kind = self.blockchain.classify_block(block)
+        if kind == 'invalid':
+            return web.json_response({'message': 'Error: Malformed block'}, status=400)
+        if kind in ('known', 'stale'):
+            return ignored
+
+        async def ingest():
+            # इंतज़ार के दौरान टिप बदल सकती है, इसलिए दोबारा वर्गीकृत करें
+            kind = self.blockchain.classify_block(block)
+            if kind == 'extends_tip':
+                accepted, message = await self.run_blocking(self.blockchain.add_block, block, trace, received_at)
+                if accepted:
+                    return web.json_response({'message': 'New block accepted and added to the chain.'}, status=200)
+                return web.json_response({'message': f'Error: Block rejected: {message}'}, status=400)
+            if kind != 'ahead':
+                return ignored
+
+            # हम पीछे हैं या फ़ोर्क पर हैं: पूरी सर्वसम्मति (प्रति पीयर सीमित)
+            allowed, retry_after = self.resolve_limiter.allow(peer)
+            if not allowed:
+                return self.rate_limited(retry_after, 'block')
+            if await self.resolve_conflicts(block, trace, received_at):
+                return web.json_response({'message': 'New block received, chain updated via consensus.'}, status=200)
+            return ignored
+
+        admitted, response = await self.ingest_gate.run(PRIORITY_BLOCK, ingest)
+        return response if admitted else self.overloaded()
+
+    async def receive_inventory(self, request: web.Request):
+        """ node_api.py के /inv जैसा: केवल अनदेखी IDs माँगें """
+        values = await self.json_body(request)
+        inventory = values.get('inventory') if isinstance(values, dict) else None
+        if not isinstance(inventory, dict):
+            return web.json_response({'message': 'Error: Please supply an inventory'}, status=400)
+        return web.json_response({'request': self.blockchain.want_inventory(inventory)}, status=200)
+
+    async def register_nodes(self, request: web.Request):
+        values = await self.json_body(request)
+        nodes = values.get('nodes') if isinstance(values, dict) else None
+        if nodes is None:
+            return web.Response(text="Error: Please supply a valid list of nodes", status=400)
+
+        for node in nodes:
+            self.blockchain.register_node(node)
+        await self.run_blocking(self.blockchain.save)
+
+        return web.json_response({'message': 'नए नोड्स जोड़ दिए गए हैं', 'total_nodes': list(self.blockchain.view.nodes)},
+                                 status=201)
+
+    async def get_nodes(self, request: web.Request):
+        nodes_list = list(self.blockchain.view.nodes)
+        return web.json_response({'message': 'Current network nodes', 'nodes': nodes_list, 'count': len(nodes_list)},
+                                 status=200)
+
+    async def consensus(self, request: web.Request):
+        replaced = await self.resolve_conflicts()
+
+        def build():
+            if replaced:
+                return {'message': 'चेन को सबसे लंबी, वैध चेन से बदल दिया गया', 'new_chain': self.blockchain.view.chain}
+            return {'message': 'हमारी चेन आधिकारिक (authoritative) है', 'chain': self.blockchain.view.chain}
+
+        entry = await self.run_blocking(self.response_cache.get_or_build, 'resolve', ('resolve', replaced),
+                                        self.blockchain, build)
+        return self.cached_json(request, entry)
+
+    async def metrics(self, request: web.Request):
+        return web.Response(body=REGISTRY.render().encode(), headers={'Content-Type': CONTENT_TYPE})
+
+    # --- इवेंट स्ट्रीम (Server-Sent Events) ---
+    async def event_stream(self, request: web.Request):
+        """ node_api.py के /events जैसा ही; EventBus listener केवल इस coroutine को जगाता है """
+        if self.event_subscribers >= MAX_EVENT_SUBSCRIBERS:
+            return web.json_response({'message': 'Too many event subscribers, try again later'}, status=503)
+
+        events = self.blockchain.events
+        last_event_id = request.headers.get('Last-Event-ID')
+        if last_event_id is not None and last_event_id.isdigit():
+            cursor = int(last_event_id)
+            replay = []
+        else:
+            cursor = events.seq
+            from_height = request.query.get('from_height')
+            replay = self.blockchain.view.chain[max(int(from_height), 0):] if from_height and from_height.isdigit() else []
+
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        listener = partial(loop.call_soon_threadsafe, wakeup.set)
+
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+        self.event_subscribers += 1
+        events.add_listener(listener)
+        try:
+            await response.prepare(request)
+            await response.write(b'retry: 3000\n\n')
+            if replay:
+                body = ''.join(format_sse((cursor, 'block', block_summary(block, Blockchain.hash(block))))
+                               for block in replay)
+                await response.write(body.encode())
+            while True:
+                wakeup.clear()
+                # timeout=0: कभी रुकता नहीं, इसलिए इवेंट लूप पर सीधे पढ़ना सुरक्षित है
+                new_events, cursor, lost = events.read(cursor)
+                if lost:
+                    await response.write(format_sse((cursor, 'resync', {'height': self.blockchain.view.length})).encode())
+                elif new_events:
+                    await response.write(''.join(format_sse(event) for event in new_events).encode())
+                else:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), EVENT_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        await response.write(b': keepalive\n\n')
+        except ConnectionResetError:
+            # क्लाइंट ने कनेक्शन बंद कर दिया
+            pass
+        finally:
+            events.remove_listener(listener)
+            self.event_subscribers -= 1
+        return response
+
+
+def create_app(node_identifier: Optional[str] = None, connect: Optional[List[str]] = None,
+               snapshot_sync: bool = False, port: Optional[int] = None) -> web.Application:
+    node = AsyncNode(node_identifier or str(uuid4()).replace('-', ''))
+    app = web.Application(middlewares=[node.latency_middleware, node.startup_middleware])
+    app['node'] = node
+    app['connect'] = connect or []
+    app['snapshot_sync'] = snapshot_sync
+    app['port'] = port
+    app.on_startup.append(node.on_startup)
+    app.on_cleanup.append(node.on_cleanup)
+
+    app.router.add_get('/', node.index)
+    app.router.add_get('/mine', node.mine)
+    app.router.add_get('/work', node.get_work)
+    app.router.add_post('/work/submit', node.submit_work)
+    app.router.add_get('/work/status', node.work_status)
+    app.router.add_get('/work/miners', node.work_miners)
+    app.router.add_post('/transactions/new', node.new_transaction)
+    app.router.add_post('/transactions/batch', node.new_transactions_batch)
+    app.router.add_get('/chain', node.full_chain)
+    app.router.add_get('/snapshot', node.get_snapshot)
+    app.router.add_get('/snapshot/commitment', node.get_snapshot_commitment)
+    app.router.add_get('/balance/{address:.+}', node.get_address_balance)
+    app.router.add_post('/blocks/new', node.receive_new_block)
+    app.router.add_post('/inv', node.receive_inventory)
+    app.router.add_post('/nodes/register', node.register_nodes)
+    app.router.add_get('/nodes/get', node.get_nodes)
+    app.router.add_get('/nodes/resolve', node.consensus)
+    app.router.add_get('/metrics', node.metrics)
+    app.router.add_get('/health', node.health)
+    app.router.add_get('/ready', node.ready)
+    app.router.add_get('/events', node.event_stream)
+    app.router.add_get('/admin/profiles', node.list_profiles)
+    app.router.add_get(r'/admin/profiles/{profile_id:\d+}', node.get_profile)
+    app.router.add_get('/admin/traces', node.list_traces)
+    app.router.add_static('/static', STATIC_DIR)
+    return app
+
+
+# ----------------------------------------------------
+# 3. App चलाना (Execution)
+# ----------------------------------------------------
+
+def run_node():
+    parser = argparse.ArgumentParser(description="MyCoin Blockchain Node (asyncio runtime)")
+    parser.add_argument('-p', '--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--connect', type=str, nargs='*', default=None,
+                        help='A list of initial peer node URLs to connect to (e.g., http://localhost:5001)')
+    parser.add_argument('--snapshot-sync', action='store_true',
+                        help='Bootstrap from a peer state snapshot and backfill full history in the background')
+    args = parser.parse_args()
+
+    connect = [peer.strip() for peer in (args.connect or []) if peer.strip()]
+    if os.environ.get('CONNECT_NODE'):
+        connect.append(os.environ['CONNECT_NODE'])
+
+    print(f"\nStarting async API server on port: {args.port}...")
+    web.run_app(create_app(connect=connect, snapshot_sync=args.snapshot_sync or snapshot_sync_enabled(),
+                           port=args.port), host='0.0.0.0', port=args.port)
+
+
+if __name__ == '__main__':
+    run_node()
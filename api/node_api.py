@@ -1,13 +1,35 @@
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, jsonify, request, render_template, g, Response, stream_with_context
 from uuid import uuid4
 import os
+import time
+import hmac
+import threading
 import requests
 import argparse
 
 # मुख्य कोर लॉजिक को कोर डायरेक्टरी से इंपोर्ट करें
-from core.blockchain import Blockchain
-# Persistence (Node List Saving) के लिए आवश्यक
-from utils.data_storage import save_blockchain
+from core.blockchain import Blockchain, MAX_BATCH_TRANSACTIONS
+# Gunicorn मल्टी-वर्कर मोड में साझा स्टेट ओनर से जुड़ने के लिए
+from core.state_server import connect_from_env
+# /events स्ट्रीम के लिए कॉम्पैक्ट पेलोड और SSE फ़ॉर्मेट
+from core.events import block_summary, format_sse
+# नए नोड्स के तेज़ बूटस्ट्रैप के लिए बैलेंस-स्टेट स्नैपशॉट
+from core.snapshot import build_snapshot, commitment_at, snapshot_sync_enabled
+# डिस्क लोड और पीयर सिंक बैकग्राउंड में, ताकि पोर्ट तुरंत बँध जाए
+from core.startup import NodeStartup
+# रिमोट माइनर्स के लिए get-work / submit-work
+from core.work_manager import WorkManager
+# Prometheus मेट्रिक्स
+from utils.metrics import REGISTRY, CONTENT_TYPE
+# ऑन-डिमांड प्रोफ़ाइलिंग (केवल एडमिन के लिए)
+from utils import profiling
+# रेट लिमिट और प्राथमिकता वाली इनजेस्ट कतार
+from api.admission import (
+    RateLimiter, TransactionLimiter, IngestGate, PRIORITY_BLOCK, PRIORITY_TRANSACTION,
+    BLOCK_RATE, BLOCK_BURST, RESOLVE_RATE, RESOLVE_BURST, ADMISSION_REJECTIONS,
+)
+# पढ़ने वाले एंडपॉइंट्स के लिए टिप-आधारित रिस्पॉन्स कैश (ETag/304)
+from api.response_cache import ResponseCache, CachedResponse, etag_matches
 
 
 # ----------------------------------------------------
@@ -18,12 +40,20 @@ from utils.data_storage import save_blockchain
 # P2P/Render डिप्लॉयमेंट के लिए टेम्पलेट पाथ को सही करें
 app = Flask(__name__, template_folder='../templates', static_folder='../static')
 
-# इस नोड के लिए एक अद्वितीय ID बनाएँ
-node_identifier = str(uuid4()).replace('-', '')
+# यदि CHAIN_STATE_ADDRESS सेट है (gunicorn.conf.py), तो सभी वर्कर्स एक ही स्टेट ओनर
+# प्रोसेस की चेन, मेमोरी पूल और बैलेंस का उपयोग करते हैं।
+blockchain = connect_from_env()
 
-# Blockchain क्लास शुरू करें (यह Persistence के कारण डेटा लोड करेगी)
-# node_address को node_identifier के रूप में पास करें
-blockchain = Blockchain(node_address=node_identifier)
+if blockchain is not None:
+    # नोड ID भी ओनर प्रोसेस से लें ताकि सभी वर्कर्स एक ही पते पर माइन करें
+    node_identifier = blockchain.node_address
+else:
+    # इस नोड के लिए एक अद्वितीय ID बनाएँ
+    node_identifier = str(uuid4()).replace('-', '')
+
+    # Blockchain क्लास शुरू करें; Persistence से डेटा लोड नीचे NodeStartup बैकग्राउंड में करता है
+    # node_address को node_identifier के रूप में पास करें
+    blockchain = Blockchain(node_address=node_identifier, defer_load=True)
 
 # ----------------------------------------------------
 # 1.5 P2P ऑटो-कनेक्शन लॉजिक (Render/ENV के लिए नया)
@@ -32,19 +62,210 @@ blockchain = Blockchain(node_address=node_identifier)
 # CLI आर्ग्युमेंट्स को पार्स करें
 parser = argparse.ArgumentParser(description="MyCoin Blockchain Node")
 parser.add_argument('--connect', type=str, default=None, help='URL of an existing node to connect to')
+parser.add_argument('--snapshot-sync', action='store_true',
+                    help='Bootstrap from the peer state snapshot instead of replaying the full chain')
 # Gunicorn को चलाने के लिए 'unknown' आवश्यक है
 args, unknown = parser.parse_known_args()
 
 # ENV वेरिएबल (Render के लिए) या CLI आर्ग्युमेंट से कनेक्शन URL प्राप्त करें
 connect_node_url = os.environ.get('CONNECT_NODE', args.connect)
 
-# P2P ऑटो-कनेक्शन लॉजिक
-if connect_node_url:
-    print(f"INFO: Attempting to connect to network peer: {connect_node_url}")
-    # Node A को '/nodes/register' अनुरोध भेजने के लिए
-    blockchain.register_node(connect_node_url)
-    # वैकल्पिक: चेन को तुरंत सिंक करने का प्रयास करें
-    blockchain.resolve_conflicts()
+# लोड और P2P ऑटो-कनेक्शन बैकग्राउंड में (साझा स्टेट मोड में यह काम ओनर प्रोसेस करता है)
+if os.environ.get('CHAIN_STATE_ADDRESS'):
+    STARTUP = None
+else:
+    if connect_node_url:
+        print(f"INFO: Will connect to network peer in the background: {connect_node_url}")
+    # पीयर को रजिस्टर करके चेन सिंक करें (--snapshot-sync पर पहले स्नैपशॉट से)
+    STARTUP = NodeStartup(blockchain).start([connect_node_url] if connect_node_url else [],
+                                            args.snapshot_sync or snapshot_sync_enabled())
+
+# रिमोट माइनिंग का काम (साझा स्टेट मोड में ओनर प्रोसेस में, ताकि हर वर्कर एक ही काम देखे)
+WORK = blockchain.work if os.environ.get('CHAIN_STATE_ADDRESS') else WorkManager(blockchain)
+
+
+# ----------------------------------------------------
+# 1.6 अनुरोध लेटेंसी मेट्रिक्स
+# ----------------------------------------------------
+
+REQUEST_SECONDS = REGISTRY.histogram('mycoin_http_request_duration_seconds',
+                                     'HTTP request latency per route', ('route', 'method', 'status'))
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _observe_request_latency(response):
+    start = g.get('request_start')
+    if start is not None:
+        # कच्चे URL की जगह रूट पैटर्न (जैसे /balance/<address>) का उपयोग करें ताकि लेबल सीमित रहें
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(time.perf_counter() - start, (route, request.method, str(response.status_code)))
+    return response
+
+
+# ----------------------------------------------------
+# 1.7 ऑन-डिमांड प्रोफ़ाइलिंग (Admin Only)
+# ----------------------------------------------------
+# ADMIN_TOKEN सेट न होने पर प्रोफ़ाइलिंग पूरी तरह बंद रहती है।
+# किसी एक अनुरोध को प्रोफ़ाइल करने के लिए हेडर भेजें:
+#   X-Admin-Token: <token>
+#   X-Profile: spans   (केवल स्पैन ब्रेकडाउन)  या  X-Profile: sample  (स्पैन + स्टैक सैंपलिंग)
+# परिणाम /admin/profiles से प्राप्त करें; रिस्पॉन्स में X-Profile-Id हेडर लौटता है।
+
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+
+def _is_admin() -> bool:
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+@app.before_request
+def _start_profile():
+    mode = request.headers.get('X-Profile')
+    if mode in ('spans', 'sample') and _is_admin():
+        recorder = profiling.ProfileRecorder(f'{request.method} {request.path}', sample=(mode == 'sample'))
+        g.profile_recorder = recorder.__enter__()
+
+
+@app.after_request
+def _finish_profile(response):
+    recorder = g.pop('profile_recorder', None)
+    if recorder is not None:
+        result = recorder.finish()
+        response.headers['X-Profile-Id'] = str(result['id'])
+    return response
+
+
+@app.teardown_request
+def _abort_profile(exc):
+    # अपवाद (exception) की स्थिति में भी रिकॉर्डिंग बंद करें ताकि span() फिर से no-op हो जाए
+    recorder = g.pop('profile_recorder', None)
+    if recorder is not None:
+        recorder.finish()
+
+
+@app.route('/admin/profiles', methods=['GET'])
+def list_profiles():
+    """ पिछली रिकॉर्ड की गई प्रोफ़ाइल्स का सारांश """
+    if not _is_admin():
+        return jsonify({'message': 'Forbidden'}), 403
+    return jsonify({'profiles': profiling.recent_profiles()}), 200
+
+
+@app.route('/admin/profiles/<int:profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """ एक प्रोफ़ाइल: स्पैन टाइमलाइन, प्रति-चरण ब्रेकडाउन और (यदि सैंपल किया गया) collapsed stacks """
+    if not _is_admin():
+        return jsonify({'message': 'Forbidden'}), 403
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        return jsonify({'message': 'Profile not found'}), 404
+    return jsonify(profile), 200
+
+
+@app.route('/admin/traces', methods=['GET'])
+def list_traces():
+    """
+    हाल के ब्लॉक प्रसार स्पैन (core/tracing.py)। ?trace_id=<ब्लॉक हैश> केवल एक ब्लॉक, ?limit=N।
+    benchmarks/trace_collector.py --node <URL> इसे सभी नोड्स से इकट्ठा करता है।
+    """
+    if not _is_admin():
+        return jsonify({'message': 'Forbidden'}), 403
+    limit = request.args.get('limit', 1000, type=int)
+    return jsonify({'spans': blockchain.tracer.recent(request.args.get('trace_id'), limit)}), 200
+
+
+# ----------------------------------------------------
+# 1.8 एडमिशन कंट्रोल (Admission Control)
+# ----------------------------------------------------
+# /transactions/* प्रति क्लाइंट (रजिस्टर्ड पीयर्स का अलग बकेट) और /blocks/new प्रति पीयर टोकन बकेट से सीमित हैं (429)।
+# महँगा काम (हस्ताक्षर, ब्लॉक सत्यापन, सर्वसम्मति) एक सीमित कतार से गुज़रता है जिसमें
+# ब्लॉक्स ट्रांजैक्शन से पहले चलते हैं; कतार भरी होने पर 503।
+
+TX_LIMITER = TransactionLimiter(blockchain.peer_nodes)
+BLOCK_LIMITER = RateLimiter(BLOCK_RATE, BLOCK_BURST)
+RESOLVE_LIMITER = RateLimiter(RESOLVE_RATE, RESOLVE_BURST)
+INGEST_GATE = IngestGate()
+
+
+def _rate_limited(retry_after: float, kind: str):
+    ADMISSION_REJECTIONS.inc(1, (kind, 'rate_limited'))
+    response = jsonify({'message': 'Too many requests, slow down'})
+    response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response, 429
+
+
+def _overloaded():
+    response = jsonify({'message': 'Node is busy, try again later'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+# ----------------------------------------------------
+# 1.9 रिस्पॉन्स कैश (Response Cache)
+# ----------------------------------------------------
+# /chain, /balance और /nodes/resolve के एन्कोड किए गए जवाब तब तक दोबारा इस्तेमाल होते हैं
+# जब तक चेन की टिप नहीं बदलती। क्लाइंट If-None-Match भेजे तो बिना बॉडी के 304।
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def _cached_json(entry: CachedResponse):
+    if etag_matches(request.headers.get('If-None-Match'), entry.etag):
+        response = Response(status=304)
+    else:
+        response = Response(entry.body, status=200, mimetype='application/json')
+    response.headers['ETag'] = entry.etag
+    return response
+
+
+# ----------------------------------------------------
+# 1.10 स्टार्टअप गेट और हेल्थ (Startup Gate & Health)
+# ----------------------------------------------------
+# चेन लोड होने तक चेन पर निर्भर हर अनुरोध को 503 + Retry-After मिलता है।
+# /health: प्रोसेस ज़िंदा है (लोड फ़ेल होने पर 503)। /ready: लोड + शुरुआती पीयर सिंक पूरा।
+
+STARTUP_EXEMPT_ENDPOINTS = {'health', 'ready', 'metrics', 'index', 'static', 'list_profiles', 'get_profile',
+                            'list_traces'}
+_state_loaded = False
+
+
+def _startup_status() -> dict:
+    if STARTUP is not None:
+        return STARTUP.status()
+    return blockchain.startup_status()
+
+
+@app.before_request
+def _require_loaded_state():
+    global _state_loaded
+    if _state_loaded or request.endpoint in STARTUP_EXEMPT_ENDPOINTS:
+        return None
+    status = _startup_status()
+    if status['loaded']:
+        # लोड एक बार ही होता है: आगे से जाँच (और साझा मोड में IPC) की ज़रूरत नहीं
+        _state_loaded = True
+        return None
+    response = jsonify({'message': 'Node is starting up, try again later', 'startup': status})
+    response.headers['Retry-After'] = '2'
+    return response, 503
+
+
+@app.route('/health', methods=['GET'])
+def health():
+    status = _startup_status()
+    return jsonify(status), 503 if status['phase'] == 'failed' else 200
+
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    status = _startup_status()
+    return jsonify(status), 200 if status['ready'] else 503
 
 
 # ----------------------------------------------------
@@ -70,21 +291,31 @@ def index():
 def mine():
     """
     एक नया ब्लॉक माइन करता है।
+    ?reward_address=<पता> देने पर रिवॉर्ड उस पते को जाता है (जैसे लोड टेस्ट के वॉलेट्स को फ़ंड करना),
+    वरना इस नोड के पते को। PoW इस नोड का CPU खर्च करता है, इसलिए reward_address केवल X-Admin-Token के साथ।
     नोट: broadcast_new_block() कॉल blockchain.py में है।
     """
-    # 1. अगला प्रूफ-ऑफ-वर्क खोजें
-    last_block = blockchain.last_block
-    proof = blockchain.proof_of_work(last_block)
-
-    # 2. रिवॉर्ड और नया ब्लॉक बनाएँ
-    previous_hash = blockchain.hash(last_block)
-
-    # यह कॉल ब्लॉक को चेन में जोड़ती है, डिस्क पर सेव करती है, और P2P पर प्रसारित करती है।
-    block = blockchain.new_block(
-        proof=proof,
-        previous_hash=previous_hash,
-        miner_address=node_identifier
-    )
+    reward_address = request.args.get('reward_address')
+    if reward_address and not _is_admin():
+        return jsonify({'message': 'reward_address requires a valid X-Admin-Token'}), 403
+    miner_address = reward_address or node_identifier
+    block = None
+    while block is None:
+        # 1. अगला प्रूफ-ऑफ-वर्क खोजें (लॉक के बाहर; इस दौरान पाठक और दूसरे लेखक नहीं रुकते)
+        # साझा स्टेट मोड में खोज इसी वर्कर में होती है; ओनर तक केवल तैयार प्रूफ जाता है
+        last_block, difficulty = blockchain.mining_target()
+        proof = blockchain.proof_of_work(last_block, difficulty)
+
+        # 2. रिवॉर्ड और नया ब्लॉक बनाएँ
+        previous_hash = blockchain.hash(last_block)
+
+        # यह कॉल ब्लॉक को चेन में जोड़ती है, डिस्क पर सेव करती है, और P2P पर प्रसारित करती है।
+        # None = PoW के दौरान टिप बदल गई (पीयर का ब्लॉक आया), नई टिप पर दोबारा माइन करें।
+        block = blockchain.new_block(
+            proof=proof,
+            previous_hash=previous_hash,
+            miner_address=miner_address
+        )
 
     response = {
         'message': "नया ब्लॉक सफलतापूर्वक माइन हो गया और नेटवर्क पर प्रसारित हो गया!",
@@ -96,6 +327,50 @@ def mine():
     }
     return jsonify(response), 200
 
+# ----------------------------------------------------
+# 3.1 रिमोट माइनिंग (get-work / submit-work, core/work_manager.py देखें)
+# ----------------------------------------------------
+
+@app.route('/work', methods=['GET'])
+def get_work():
+    """
+    वर्तमान टिप पर इस माइनर की अपनी नॉन्स रेंज।
+    ?miner=<नाम> आँकड़ों के लिए (डिफ़ॉल्ट: क्लाइंट IP), ?reward_address=<पता> रिवॉर्ड के लिए (डिफ़ॉल्ट: यह नोड)।
+    """
+    miner = request.args.get('miner') or request.remote_addr or 'unknown'
+    work = WORK.get_work(miner, request.args.get('reward_address') or node_identifier)
+    if work is None:
+        return jsonify({'message': 'Chain state is still loading'}), 503
+    return jsonify(work), 200
+
+
+@app.route('/work/submit', methods=['POST'])
+def submit_work():
+    """ एक share जमा करें; result = block | share | stale | invalid | duplicate """
+    values = request.get_json(silent=True) or {}
+    if 'work_id' not in values or 'nonce' not in values:
+        return jsonify({'message': 'Error: Missing required values: work_id, nonce'}), 400
+
+    result = WORK.submit(values['work_id'], values['nonce'])
+    status = {'block': 201, 'share': 200, 'stale': 409, 'duplicate': 409}.get(result['result'], 400)
+    return jsonify(result), status
+
+
+@app.route('/work/status', methods=['GET'])
+def work_status():
+    """ क्या यह काम अभी भी वर्तमान टिप पर है (माइनर इसे हर कुछ सेकंड पूछता है) """
+    work_id = request.args.get('work_id')
+    if not work_id:
+        return jsonify({'message': 'Error: Please supply a work_id'}), 400
+    return jsonify(WORK.status(work_id)), 200
+
+
+@app.route('/work/miners', methods=['GET'])
+def work_miners():
+    """ हर रिमोट माइनर की share दर, अनुमानित हैशरेट और stale/invalid गिनती """
+    return jsonify(WORK.miners()), 200
+
+
 # नया ट्रांजैक्शन एंडपॉइंट
 @app.route('/transactions/new', methods=['POST'])
 def new_transaction():
@@ -103,19 +378,32 @@ def new_transaction():
     मेमोरी पूल में एक नया ट्रांजैक्शन जोड़ता है।
     प्रसारण (Broadcasting) लॉजिक blockchain.py में है।
     """
+    allowed, retry_after = TX_LIMITER.allow(request.remote_addr)
+    if not allowed:
+        return _rate_limited(retry_after, 'transaction')
+
     values = request.get_json()
 
     required = ['sender', 'recipient', 'amount', 'signature']
     if not all(k in values for k in required):
         return 'Missing required values: sender, recipient, amount, signature', 400
 
-    # new_transaction() में हस्ताक्षर, बैलेंस और प्रसारण की जाँच होती है
-    index, message = blockchain.new_transaction(
-        values['sender'],
-        values['recipient'],
-        values['amount'],
-        values['signature']
-    )
+    # सस्ती जाँचें (डुप्लिकेट, बैलेंस) कतार से पहले
+    error = blockchain.precheck_transaction(values['sender'], values['recipient'], values['amount'], values['signature'])
+    if error:
+        return jsonify({'message': error}), 406
+
+    # new_transaction() में हस्ताक्षर, (लॉक के अंदर दोबारा) बैलेंस और प्रसारण की जाँच होती है
+    with INGEST_GATE.admit(PRIORITY_TRANSACTION) as admitted:
+        if not admitted:
+            return _overloaded()
+        index, message = blockchain.new_transaction(
+            values['sender'],
+            values['recipient'],
+            values['amount'],
+            values['signature'],
+            prechecked=True
+        )
 
     if index is False:
         return jsonify({'message': message}), 406
@@ -123,29 +411,168 @@ def new_transaction():
     response = {'message': f'ट्रांजैक्शन सफलतापूर्वक पूल में जोड़ा गया और नेटवर्क पर प्रसारित हो गया।'}
     return jsonify(response), 201
 
-# पूरी चेन दिखाने का एंडपॉइंट
-@app.route('/chain', methods=['GET'])
-def full_chain():
-    """ पूरी ब्लॉकचेन को रिटर्न करता है (सर्वसम्मति द्वारा उपयोग किया जाता है) """
+# बैच ट्रांजैक्शन एंडपॉइंट
+@app.route('/transactions/batch', methods=['POST'])
+def new_transactions_batch():
+    """
+    एक ही अनुरोध में कई हस्ताक्षरित ट्रांजैक्शन स्वीकार करता है।
+    हर ट्रांजैक्शन का अलग परिणाम (accepted/message) उसी क्रम में लौटाया जाता है।
+    """
+    values = request.get_json(silent=True) or {}
+    transactions = values.get('transactions')
+
+    if not isinstance(transactions, list):
+        return jsonify({'message': 'Error: Please supply a list of transactions'}), 400
+    if len(transactions) > MAX_BATCH_TRANSACTIONS:
+        return jsonify({'message': f'Error: At most {MAX_BATCH_TRANSACTIONS} transactions per batch'}), 413
+
+    # बैच में हर ट्रांजैक्शन एक टोकन लेता है
+    oversized = TX_LIMITER.oversized(request.remote_addr, len(transactions))
+    if oversized:
+        return jsonify({'message': oversized}), 413
+    allowed, retry_after = TX_LIMITER.allow(request.remote_addr, max(1, len(transactions)))
+    if not allowed:
+        return _rate_limited(retry_after, 'transaction')
+
+    with INGEST_GATE.admit(PRIORITY_TRANSACTION) as admitted:
+        if not admitted:
+            return _overloaded()
+        results = blockchain.new_transactions_batch(transactions)
+    accepted = sum(1 for result in results if result['accepted'])
+
     response = {
-        'chain': blockchain.chain,
-        'length': len(blockchain.chain),
-        'difficulty': blockchain.difficulty
+        'message': f'{accepted} ट्रांजैक्शन पूल में जोड़े गए, {len(results) - accepted} अस्वीकृत।',
+        'accepted': accepted,
+        'rejected': len(results) - accepted,
+        'results': results,
     }
     return jsonify(response), 200
 
+# पूरी चेन दिखाने का एंडपॉइंट
+@app.route('/chain', methods=['GET'])
+def full_chain():
+    """
+    पूरी ब्लॉकचेन को रिटर्न करता है (सर्वसम्मति द्वारा उपयोग किया जाता है)।
+    pruned_height > 0 का मतलब है कि उससे नीचे के ब्लॉक्स केवल हेडर हैं (pruned नोड)।
+    सभी फ़ील्ड्स एक ही प्रकाशित व्यू से आते हैं। `version` शामिल नहीं: वह हर मेमपूल बदलाव पर
+    बदलता है, जबकि यह जवाब टिप बदलने तक कैश रहता है।
+    """
+    def build():
+        view = blockchain.view
+        return {
+            'chain': view.chain,
+            'length': len(view.chain),
+            'difficulty': view.difficulty,
+            'pruned_height': view.pruned_height,
+        }
+
+    return _cached_json(RESPONSE_CACHE.get_or_build('chain', ('chain',), blockchain, build))
+
+# स्नैपशॉट एंडपॉइंट (नए नोड्स के तेज़ बूटस्ट्रैप के लिए)
+@app.route('/snapshot', methods=['GET'])
+def get_snapshot():
+    """
+    हाल की ऊँचाई H पर बैलेंस स्टेट, उसका कमिटमेंट, H तक के हेडर्स और उसके बाद के पूरे ब्लॉक्स।
+    """
+    if os.environ.get('CHAIN_STATE_ADDRESS'):
+        snapshot = blockchain.get_snapshot()
+    else:
+        snapshot = build_snapshot(blockchain)
+    return jsonify(snapshot), 200
+
+
+@app.route('/snapshot/commitment', methods=['GET'])
+def get_snapshot_commitment():
+    """ किसी ऊँचाई पर हमारा स्नैपशॉट कमिटमेंट (दूसरे पीयर का स्नैपशॉट जाँचने के लिए) """
+    height = request.args.get('height', type=int)
+    if height is None:
+        return jsonify({'message': 'Error: Please supply a height'}), 400
+
+    if os.environ.get('CHAIN_STATE_ADDRESS'):
+        result = blockchain.get_snapshot_commitment(height)
+    else:
+        result = commitment_at(blockchain, height)
+    if result is None:
+        return jsonify({'message': 'Height not available on this node'}), 404
+    return jsonify(result), 200
+
 # बैलेंस एंडपॉइंट
-@app.route('/balance/<address>', methods=['GET'])
+@app.route('/balance/<path:address>', methods=['GET'])
 def get_address_balance(address):
     """ किसी दिए गए पते का वर्तमान बैलेंस रिटर्न करता है। """
-    balance = blockchain.balance_manager.get_balance(address)
+    def build():
+        return {
+            'address': address,
+            'balance': blockchain.get_balance(address),
+            'message': 'Balance retrieved successfully'
+        }
+
+    return _cached_json(RESPONSE_CACHE.get_or_build('balance', ('balance', address), blockchain, build))
+
 
-    response = {
-        'address': address,
-        'balance': balance,
-        'message': 'Balance retrieved successfully'
-    }
-    return jsonify(response), 200
+
+# ----------------------------------------------------
+# 3.5 इवेंट स्ट्रीम (Server-Sent Events)
+# ----------------------------------------------------
+# पूरी /chain को बार-बार पोल करने की जगह क्लाइंट /events से जुड़ते हैं और केवल बदलाव पाते हैं:
+#   block          -> {height, hash, previous_hash, timestamp, miner, tx_count}
+#   reorg          -> {fork_height, old_height, new_height, new_tip}
+#   mempool_add    -> {id, sender, recipient, amount}
+#   mempool_remove -> {ids, reason: mined|confirmed}
+#   resync         -> {height} (क्लाइंट बहुत पीछे रह गया; /chain से दोबारा सिंक करें)
+# ?from_height=N देने पर N के बाद के मौजूदा ब्लॉक्स पहले 'block' इवेंट के रूप में भेजे जाते हैं।
+# दोबारा जुड़ने पर ब्राउज़र Last-Event-ID भेजता है और स्ट्रीम वहीं से आगे चलती है।
+
+# हर सब्सक्राइबर एक वर्कर थ्रेड घेरता है, इसलिए संख्या सीमित है
+MAX_EVENT_SUBSCRIBERS = int(os.environ.get('MAX_EVENT_SUBSCRIBERS', 32))
+EVENT_KEEPALIVE_SECONDS = 15
+_event_slots = threading.BoundedSemaphore(MAX_EVENT_SUBSCRIBERS)
+
+
+@app.route('/events', methods=['GET'])
+def event_stream():
+    """ नए ब्लॉक, reorg और मेमोरी पूल बदलावों की text/event-stream स्ट्रीम """
+    if not _event_slots.acquire(blocking=False):
+        return jsonify({'message': 'Too many event subscribers, try again later'}), 503
+
+    try:
+        last_event_id = request.headers.get('Last-Event-ID')
+        if last_event_id is not None and last_event_id.isdigit():
+            # दोबारा कनेक्शन: पिछली स्ट्रीम के आख़िरी इवेंट से आगे
+            cursor = int(last_event_id)
+            replay = []
+        else:
+            # पहले कर्सर लें, फिर चेन पढ़ें: बीच में आया ब्लॉक छूटेगा नहीं (अधिक से अधिक दो बार आएगा)
+            cursor = blockchain.events.seq
+            from_height = request.args.get('from_height', type=int)
+            replay = blockchain.chain_slice(max(from_height, 0)) if from_height is not None else []
+    except Exception:
+        _event_slots.release()
+        raise
+
+    def generate(cursor):
+        # retry: ब्राउज़र कनेक्शन टूटने पर कितनी देर बाद दोबारा जुड़े (ms)
+        yield 'retry: 3000\n\n'
+        for block in replay:
+            yield format_sse((cursor, 'block', block_summary(block, blockchain.hash(block))))
+        while True:
+            events, cursor, lost = blockchain.events.read(cursor, EVENT_KEEPALIVE_SECONDS)
+            if lost:
+                yield format_sse((cursor, 'resync', {'height': blockchain.chain_length()}))
+                continue
+            if not events:
+                yield ': keepalive\n\n'
+                continue
+            yield ''.join(format_sse(event) for event in events)
+
+    response = Response(stream_with_context(generate(cursor)), mimetype='text/event-stream')
+    # स्लॉट रिस्पॉन्स बंद होने पर लौटता है (WSGI सर्वर हमेशा close() बुलाता है), जनरेटर के finally में
+    # नहीं: बॉडी का पहला हिस्सा भेजने से पहले क्लाइंट चला जाए तो जनरेटर कभी शुरू ही नहीं होता
+    response.call_on_close(_event_slots.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    # nginx/Render जैसे प्रॉक्सी को बफ़रिंग से रोकें
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 
 # ----------------------------------------------------
@@ -158,15 +585,48 @@ def receive_new_block():
     """
     नेटवर्क से एक नया ब्लॉक प्राप्त करें और सर्वसम्मति (Consensus) द्वारा
     अपनी चेन को अपडेट करने का प्रयास करें।
+    वैकल्पिक 'trace' = भेजने वाले का ट्रेस संदर्भ (core/tracing.py); receive स्पैन यहीं से शुरू होता है।
     """
+    received_at = time.time()
+    peer = request.remote_addr or 'unknown'
+    allowed, retry_after = BLOCK_LIMITER.allow(peer)
+    if not allowed:
+        return _rate_limited(retry_after, 'block')
+
     values = request.get_json()
     block = values.get('block')
+    trace = values.get('trace')
 
     if block is None:
         return jsonify({'message': 'Error: Missing block data'}), 400
 
-    # P2P से प्राप्त ब्लॉक को प्रोसेस करने का सबसे आसान और सुरक्षित तरीका सर्वसम्मति चलाना है।
-    replaced = blockchain.resolve_conflicts()
+    # सस्ती जाँच: पहले से ज्ञात/पुराने ब्लॉक पर कोई महँगा काम नहीं
+    kind = blockchain.classify_block(block)
+    if kind == 'invalid':
+        return jsonify({'message': 'Error: Malformed block'}), 400
+    if kind in ('known', 'stale'):
+        return jsonify({'message': 'New block received, but local chain is authoritative or block is old.'}), 200
+
+    with INGEST_GATE.admit(PRIORITY_BLOCK) as admitted:
+        if not admitted:
+            return _overloaded()
+
+        # इंतज़ार के दौरान टिप बदल सकती है, इसलिए दोबारा वर्गीकृत करें
+        kind = blockchain.classify_block(block)
+        if kind == 'extends_tip':
+            # ब्लॉक सीधे हमारी टिप पर जुड़ता है: केवल इसी ब्लॉक को जाँचें
+            accepted, message = blockchain.add_block(block, trace, received_at)
+            if accepted:
+                return jsonify({'message': 'New block accepted and added to the chain.'}), 200
+            return jsonify({'message': f'Error: Block rejected: {message}'}), 400
+        if kind != 'ahead':
+            return jsonify({'message': 'New block received, but local chain is authoritative or block is old.'}), 200
+
+        # हम पीछे हैं या फ़ोर्क पर हैं: पूरी सर्वसम्मति (प्रति पीयर सीमित)
+        allowed, retry_after = RESOLVE_LIMITER.allow(peer)
+        if not allowed:
+            return _rate_limited(retry_after, 'block')
+        replaced = blockchain.resolve_conflicts(block, trace, received_at)
 
     if replaced:
         return jsonify({'message': 'New block received, chain updated via consensus.'}), 200
@@ -174,6 +634,22 @@ def receive_new_block():
         return jsonify({'message': 'New block received, but local chain is authoritative or block is old.'}), 200
 
 
+# इन्वेंटरी घोषणा एंडपॉइंट (P2P गॉसिप, core/gossip.py देखें)
+@app.route('/inv', methods=['POST'])
+def receive_inventory():
+    """
+    पीयर ट्रांजैक्शन/ब्लॉक IDs घोषित करता है; जवाब में केवल वे IDs माँगी जाती हैं जो इस नोड
+    ने अब तक नहीं देखीं। पीयर फिर उनकी बॉडीज़ /transactions/batch और /blocks/new पर भेजता है।
+    """
+    values = request.get_json(silent=True) or {}
+    inventory = values.get('inventory')
+
+    if not isinstance(inventory, dict):
+        return jsonify({'message': 'Error: Please supply an inventory'}), 400
+
+    return jsonify({'request': blockchain.want_inventory(inventory)}), 200
+
+
 # अन्य नोड्स को रजिस्टर करने का एंडपॉइंट
 @app.route('/nodes/register', methods=['POST'])
 def register_nodes():
@@ -188,12 +664,12 @@ def register_nodes():
         blockchain.register_node(node)
 
     # नोड लिस्ट को डिस्क पर सेव करें (Persistence)
-    save_blockchain(blockchain.chain, blockchain.difficulty, blockchain.nodes)
+    blockchain.save()
 
 
     response = {
         'message': 'नए नोड्स जोड़ दिए गए हैं',
-        'total_nodes': list(blockchain.nodes),
+        'total_nodes': list(blockchain.peer_nodes()),
     }
     return jsonify(response), 201
 
@@ -206,7 +682,7 @@ def get_nodes():
     डिबगिंग के लिए उपयोगी।
     """
     # नोड लिस्ट को JSON के अनुकूल लिस्ट में बदलें
-    nodes_list = list(blockchain.nodes)
+    nodes_list = list(blockchain.peer_nodes())
 
     response = {
         'message': 'Current network nodes',
@@ -222,18 +698,29 @@ def consensus():
     """ सबसे लंबी और वैध चेन के लिए बलपूर्वक जाँच करता है। """
     replaced = blockchain.resolve_conflicts()
 
-    if replaced:
-        response = {
-            'message': 'चेन को सबसे लंबी, वैध चेन से बदल दिया गया',
-            'new_chain': blockchain.chain
-        }
-    else:
-        response = {
+    def build():
+        if replaced:
+            return {
+                'message': 'चेन को सबसे लंबी, वैध चेन से बदल दिया गया',
+                'new_chain': blockchain.view.chain
+            }
+        return {
             'message': 'हमारी चेन आधिकारिक (authoritative) है',
-            'chain': blockchain.chain
+            'chain': blockchain.view.chain
         }
 
-    return jsonify(response), 200
+    return _cached_json(RESPONSE_CACHE.get_or_build('resolve', ('resolve', replaced), blockchain, build))
+
+
+# मेट्रिक्स एंडपॉइंट (Prometheus text format)
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """ HTTP लेटेंसी, PoW, मेमोरी पूल, P2P, persistence और सर्वसम्मति के मेट्रिक्स लौटाता है। """
+    body = REGISTRY.render()
+    if os.environ.get('CHAIN_STATE_ADDRESS'):
+        # साझा स्टेट मोड: नोड के आंतरिक मेट्रिक्स ओनर प्रोसेस में दर्ज होते हैं
+        body += blockchain.metrics_text()
+    return Response(body, mimetype=None, content_type=CONTENT_TYPE)
 
 
 # ----------------------------------------------------
@@ -0,0 +1,123 @@
+"""
+पढ़ने वाले एंडपॉइंट्स (/chain, /balance, /nodes/resolve) के लिए टिप-आधारित रिस्पॉन्स कैश।
+
+1. हर एंट्री पहले से एन्कोड किए गए JSON बाइट्स और उनका ETag रखती है, इसलिए हिट पर न तो
+   रिस्पॉन्स दोबारा बनता है और न ही सीरियलाइज़ होता है।
+2. कैश एक समय पर केवल एक चेन पहचान (`ChainView.tip_key`: टिप हैश + प्रून ऊँचाई) के लिए
+   एंट्रीज़ रखता है। नई टिप का पहला रिस्पॉन्स आते ही पुरानी टिप की सारी एंट्रीज़ हट जाती हैं;
+   उससे पहले भी पुरानी टिप वाली एंट्री कभी नहीं लौटती (हर lookup नवीनतम टिप से तुलना करता है)।
+   मेमोरी पूल पर निर्भर रिस्पॉन्स अपनी key में `view.version` जोड़ें।
+3. कुल बाइट्स `max_bytes` तक सीमित (LRU से पुरानी एंट्रीज़ हटती हैं)।
+4. If-None-Match मेल खाने पर 304 (बॉडी के बिना)।
+
+कैश प्रति प्रोसेस है (Gunicorn में हर वर्कर का अपना)।
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+from utils.metrics import REGISTRY
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स (ENV से बदली जा सकती हैं)
+# ----------------------------------------------------
+
+# कैश की कुल सीमा (एन्कोड किए गए बॉडी बाइट्स)। 0 = कैश बंद।
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+CACHE_REQUESTS = REGISTRY.counter('mycoin_response_cache_requests_total',
+                                  'Response cache lookups', ('endpoint', 'result'))
+CACHE_BYTES = REGISTRY.gauge('mycoin_response_cache_bytes', 'Encoded response bytes held in the cache')
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def encode_json(payload: Any) -> bytes:
+    """ कॉम्पैक्ट JSON (टपल्स लिस्ट बन जाते हैं) """
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """ If-None-Match हेडर (कई ETags, W/ या * के साथ) में हमारा ETag है या नहीं """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == '*' or candidate == etag:
+            return True
+    return False
+
+
+# ----------------------------------------------------
+# 1. बाइट्स से सीमित LRU कैश
+# ----------------------------------------------------
+
+class ResponseCache:
+    """ key -> CachedResponse, केवल वर्तमान चेन पहचान (tip_key) के लिए """
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, CachedResponse]' = OrderedDict()
+        self._bytes = 0
+        self._tip_key: Optional[str] = None
+        self._lock = threading.Lock()
+        CACHE_BYTES.set_function(lambda: self._bytes)
+
+    def lookup(self, endpoint: str, key: Hashable, tip_key: str) -> Optional[CachedResponse]:
+        """ `tip_key` नवीनतम चेन पहचान है (blockchain.tip_key); अलग टिप की एंट्री कभी नहीं लौटती """
+        with self._lock:
+            entry = self._entries.get(key) if tip_key == self._tip_key else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        CACHE_REQUESTS.inc(1, (endpoint, 'hit' if entry is not None else 'miss'))
+        return entry
+
+    def store(self, key: Hashable, tip_key: str, body: bytes) -> CachedResponse:
+        """
+        `tip_key` वाली चेन से बना बॉडी रखता है। कॉलर सुनिश्चित करे कि बॉडी बनाते समय टिप वही रही
+        (`build_and_store` देखें)। नई टिप की पहली एंट्री पुरानी टिप की सारी एंट्रीज़ हटा देती है।
+        """
+        entry = CachedResponse(body, make_etag(body))
+        if len(body) > self.max_bytes:
+            return entry
+
+        with self._lock:
+            if tip_key != self._tip_key:
+                self._entries.clear()
+                self._bytes = 0
+                self._tip_key = tip_key
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+        return entry
+
+    def build_and_store(self, key: Hashable, tip_key: str, blockchain, build: Callable[[], Any]) -> CachedResponse:
+        """
+        `build()` का JSON बनाकर रखता है — केवल तभी जब बनाते समय टिप (`tip_key`) नहीं बदली
+        (वरना बॉडी किस टिप का है यह पक्का नहीं, इसलिए बिना कैश किए लौटाएँ)।
+        """
+        body = encode_json(build())
+        if blockchain.tip_key != tip_key:
+            return CachedResponse(body, make_etag(body))
+        return self.store(key, tip_key, body)
+
+    def get_or_build(self, endpoint: str, key: Hashable, blockchain, build: Callable[[], Any]) -> CachedResponse:
+        tip_key = blockchain.tip_key
+        return self.lookup(endpoint, key, tip_key) or self.build_and_store(key, tip_key, blockchain, build)
@@ -112,9 +112,71 @@ function viewChain() {
         });
 }
 
+// ----------------------------------------
+// 5. लाइव अपडेट (/events स्ट्रीम)
+// ----------------------------------------
+// पूरी /chain को बार-बार फ़ेच करने की जगह नोड केवल बदलाव भेजता है।
+const LIVE_BLOCKS_SHOWN = 20;
+const liveBlocks = [];          // सबसे नए ब्लॉक सबसे पहले
+const liveMempool = new Set();  // पूल में मौजूद ट्रांजैक्शन IDs
+let liveSource = null;
+
+function renderLive() {
+    const tip = liveBlocks.length ? liveBlocks[0] : null;
+    document.getElementById('live-height').textContent = tip ? tip.height : '-';
+    document.getElementById('live-mempool').textContent = liveMempool.size;
+    document.getElementById('live-blocks').textContent = liveBlocks
+        .map(b => `#${b.height}  ${b.hash.slice(0, 16)}…  txs: ${b.tx_count}  miner: ${String(b.miner).slice(0, 16)}`)
+        .join('\n');
+}
+
+function connectEvents(fromHeight) {
+    if (liveSource) {
+        liveSource.close();
+    }
+    // ब्राउज़र दोबारा जुड़ने पर ख़ुद Last-Event-ID भेजता है, इसलिए केवल पहली बार from_height चाहिए
+    liveSource = new EventSource(`${API_BASE_URL}/events?from_height=${fromHeight}`);
+
+    liveSource.addEventListener('block', e => {
+        const block = JSON.parse(e.data);
+        // reorg या दोबारा भेजे गए ब्लॉक: उसी ऊँचाई वाले पुराने ब्लॉक हटाएँ
+        while (liveBlocks.length && liveBlocks[0].height >= block.height) {
+            liveBlocks.shift();
+        }
+        liveBlocks.unshift(block);
+        liveBlocks.length = Math.min(liveBlocks.length, LIVE_BLOCKS_SHOWN);
+        renderLive();
+    });
+    liveSource.addEventListener('reorg', e => {
+        const reorg = JSON.parse(e.data);
+        while (liveBlocks.length && liveBlocks[0].height > reorg.fork_height) {
+            liveBlocks.shift();
+        }
+        renderLive();
+    });
+    liveSource.addEventListener('mempool_add', e => {
+        liveMempool.add(JSON.parse(e.data).id);
+        renderLive();
+    });
+    liveSource.addEventListener('mempool_remove', e => {
+        JSON.parse(e.data).ids.forEach(id => liveMempool.delete(id));
+        renderLive();
+    });
+    liveSource.addEventListener('resync', e => {
+        // हम बहुत पीछे रह गए: आख़िरी ज्ञात ऊँचाई से नई स्ट्रीम शुरू करें
+        const tip = liveBlocks.length ? liveBlocks[0].height : 0;
+        liveMempool.clear();
+        connectEvents(tip);
+    });
+}
+
 // पेज लोड होने पर Node ID को ट्रांजैक्शन इनपुट में प्री-फिल करें
 document.addEventListener('DOMContentLoaded', () => {
     const nodeId = document.getElementById('node-address').textContent;
     document.getElementById('sender-pubkey').value = nodeId;
     document.getElementById('balance-address').value = nodeId;
+
+    if (window.EventSource) {
+        connectEvents(0);
+    }
 });
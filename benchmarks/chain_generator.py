@@ -0,0 +1,168 @@
+"""
+बेंचमार्क के लिए निर्धारक (deterministic) सिंथेटिक चेन जनरेटर।
+
+एक ही seed और पैरामीटर से हमेशा बिल्कुल वही चेन बनती है: वही वॉलेट, वही असली
+ECDSA-हस्ताक्षरित ट्रांजैक्शन, वही टाइमस्टैम्प और वही PoW प्रूफ। इससे अलग-अलग रन
+(और अलग-अलग कमिट) के परिणामों की तुलना की जा सकती है।
+
+उपयोग:
+    python -m benchmarks.chain_generator --blocks 1000 --txs-per-block 10 --addresses 50 -o chain.json
+"""
+import argparse
+import base64
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+from Crypto.PublicKey import ECC
+from Crypto.Signature import DSS
+
+from core.blockchain import Blockchain
+from core.cryptos import hash_transaction
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+GENESIS_TIMESTAMP = 1700000000.0
+BLOCK_SPACING_SECONDS = 600
+DEFAULT_DIFFICULTY = 1
+
+
+# ----------------------------------------------------
+# 1. निर्धारक वॉलेट
+# ----------------------------------------------------
+
+def generate_wallets(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    seed से निर्धारक P-256 की-पेयर बनाता है।
+    हर वॉलेट में 'public_address', 'private_key' (PEM) और इम्पोर्ट की गई '_key' होती है।
+    """
+    rng = random.Random(seed)
+    wallets = []
+    for _ in range(count):
+        key = ECC.generate(curve='P-256', randfunc=rng.randbytes)
+        public_key_der = key.public_key().export_key(format='DER')
+        wallets.append({
+            'public_address': base64.b64encode(public_key_der).decode('utf-8'),
+            'private_key': key.export_key(format='PEM'),
+            '_key': key,
+        })
+    return wallets
+
+
+class _Signer:
+    """
+    RFC 6979 (deterministic ECDSA) से हस्ताक्षर करता है ताकि चेन हर बार एक जैसी बने।
+    एक जैसे (sender, recipient, amount) का हस्ताक्षर भी एक जैसा होता है, इसलिए उसे कैश किया जाता है।
+    """
+    def __init__(self):
+        self._cache: Dict[tuple, str] = {}
+
+    def sign(self, wallet: Dict[str, Any], recipient: str, amount: float) -> str:
+        cache_key = (wallet['public_address'], recipient, amount)
+        signature = self._cache.get(cache_key)
+        if signature is None:
+            h = hash_transaction(wallet['public_address'], recipient, amount)
+            signature_bytes = DSS.new(wallet['_key'], 'deterministic-rfc6979').sign(h)
+            signature = base64.b64encode(signature_bytes).decode('utf-8')
+            self._cache[cache_key] = signature
+        return signature
+
+
+# ----------------------------------------------------
+# 2. चेन जनरेशन
+# ----------------------------------------------------
+
+def generate_chain(blocks: int, txs_per_block: int = 10, addresses: int = 50,
+                   difficulty: int = DEFAULT_DIFFICULTY, seed: int = 0,
+                   wallets: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    `blocks` ब्लॉक्स की एक वैध चेन बनाता है (जेनेसिस सहित)।
+
+    - कॉइनबेस रिवॉर्ड वॉलेट्स में बारी-बारी से जाता है।
+    - हर ब्लॉक में अधिकतम `txs_per_block` हस्ताक्षरित ट्रांजैक्शन होते हैं, केवल उन्हीं
+      भेजने वालों से जिनके पास पर्याप्त बैलेंस है, ताकि बैलेंस रीप्ले कभी ऋणात्मक न हो।
+    - हर ब्लॉक का प्रूफ `difficulty` पर असली PoW से निकाला जाता है, इसलिए
+      `Blockchain.is_valid_chain` पूरी चेन को वैध मानता है।
+    """
+    rng = random.Random(seed)
+    wallets = wallets or generate_wallets(addresses, seed)
+    signer = _Signer()
+    balances = {w['public_address']: 0.0 for w in wallets}
+
+    chain: List[Dict[str, Any]] = []
+    previous_hash = '1'
+    proof = 100
+
+    for index in range(1, blocks + 1):
+        miner = wallets[(index - 1) % len(wallets)]['public_address']
+        transactions = [{
+            'sender': "SYSTEM_COINBASE",
+            'recipient': miner,
+            'amount': Blockchain.get_mining_reward(index),
+            'signature': 'GENESIS_SIG',
+        }]
+
+        if index > 1:
+            for _ in range(txs_per_block):
+                sender = rng.choice(wallets)
+                amount = round(rng.randint(1, 100) / 100, 2)
+                if balances[sender['public_address']] < amount:
+                    continue
+                recipient = rng.choice(wallets)['public_address']
+                transactions.append({
+                    'sender': sender['public_address'],
+                    'recipient': recipient,
+                    'amount': amount,
+                    'signature': signer.sign(sender, recipient, amount),
+                })
+                balances[sender['public_address']] -= amount
+                balances[recipient] += amount
+
+        balances[miner] += transactions[0]['amount']
+
+        block = {
+            'index': index,
+            'timestamp': GENESIS_TIMESTAMP + (index - 1) * BLOCK_SPACING_SECONDS,
+            'transactions': transactions,
+            'proof': proof,
+            'previous_hash': previous_hash,
+            'miner': miner,
+            'difficulty': difficulty,
+        }
+        chain.append(block)
+
+        previous_hash = Blockchain.hash(block)
+        proof = Blockchain.search_proof(previous_hash, difficulty)
+
+    return {
+        'chain': chain,
+        'difficulty': difficulty,
+        'nodes': [],
+        'wallets': [{'public_address': w['public_address'], 'private_key': w['private_key']} for w in wallets],
+    }
+
+
+# ----------------------------------------------------
+# 3. CLI
+# ----------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="MyCoin synthetic chain generator")
+    parser.add_argument('--blocks', type=int, default=1000)
+    parser.add_argument('--txs-per-block', type=int, default=10)
+    parser.add_argument('--addresses', type=int, default=50)
+    parser.add_argument('--difficulty', type=int, default=DEFAULT_DIFFICULTY)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=str, default='synthetic_chain.json')
+    args = parser.parse_args()
+
+    data = generate_chain(args.blocks, args.txs_per_block, args.addresses, args.difficulty, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump(data, f)
+    print(f"Generated {len(data['chain'])} blocks -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+"""
+नोड API के लिए HTTP लोड जनरेटर (open-loop)।
+
+1. core/cryptos से वॉलेट्स बनाता है और हर वॉलेट को /mine?reward_address= से फ़ंड करता है
+   (नोड का ADMIN_TOKEN चाहिए: --admin-token या ADMIN_TOKEN ENV)।
+2. पूरे टेस्ट के सभी ट्रांजैक्शन पहले से साइन कर लेता है (साइनिंग का खर्च माप में न आए)।
+3. हर चरण (step) में तय दर (requests/sec) पर अनुरोध भेजता है — जवाब का इंतज़ार किए बिना
+   (open-loop), और लेटेंसी *तय भेजने के समय* से मापी जाती है। इसलिए नोड धीमा हो तो कतार में
+   लगा समय भी लेटेंसी में गिना जाता है (coordinated omission नहीं)।
+4. हर दर के लिए प्रति एंडपॉइंट थ्रूपुट और p50/p90/p99 लेटेंसी — यानी थ्रूपुट-लेटेंसी कर्व — JSON में।
+
+एंडपॉइंट मिश्रण: /transactions/new, /balance/<address>, /chain और /mine (--mix से वज़न)।
+कई --node देने पर अनुरोध उनमें बारी-बारी से बँटते हैं; --connect-peers उन्हें आपस में पीयर बनाता है।
+
+नोट: नोड का एडमिशन कंट्रोल प्रति क्लाइंट IP ट्रांजैक्शन सीमित करता है (ADMISSION_TX_RATE /
+ADMISSION_TX_BURST); क्षमता मापने के लिए नोड को ऊँची सीमा के साथ चलाएँ। 429 जवाब अलग गिने जाते हैं।
+
+उपयोग (केवल लोकल नोड्स पर):
+    python -m benchmarks.load_generator --node http://127.0.0.1:5000 --admin-token <ADMIN_TOKEN> \\
+        --rates 10 50 100 200 --step-duration 20
+    python -m benchmarks.load_generator --node http://127.0.0.1:5000 --node http://127.0.0.1:5001 \\
+        --connect-peers --mix transactions=0.7 balance=0.2 chain=0.05 mine=0.05 -o load.json
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from Crypto.PublicKey import ECC
+
+from core.cryptos import generate_wallet, sign_transaction_with_key
+
+from .run_benchmarks import _git_commit
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+ENDPOINTS = ('transactions', 'balance', 'chain', 'mine')
+DEFAULT_MIX = {'transactions': 0.8, 'balance': 0.15, 'chain': 0.05, 'mine': 0.0}
+# हर ट्रांजैक्शन की राशि (छोटी, ताकि एक ब्लॉक रिवॉर्ड हज़ारों ट्रांजैक्शन चला सके)
+MIN_AMOUNT = 0.0001
+MAX_AMOUNT = 0.01
+REQUEST_TIMEOUT = 30
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1', '0.0.0.0')
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _make_session(concurrency: int) -> requests.Session:
+    """ keep-alive कनेक्शन पूल (wallet_cli जैसा) """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# ----------------------------------------------------
+# 1. वॉलेट्स, फ़ंडिंग और पहले से साइन किए ट्रांजैक्शन
+# ----------------------------------------------------
+
+def create_wallets(count: int) -> List[Dict[str, Any]]:
+    wallets = []
+    for _ in range(count):
+        wallet = generate_wallet()
+        wallet['_key'] = ECC.import_key(wallet['private_key'])
+        wallets.append(wallet)
+    return wallets
+
+
+def fund_wallets(session: requests.Session, node: str, wallets: List[Dict[str, Any]], blocks_per_wallet: int):
+    """ हर वॉलेट के लिए ब्लॉक माइन करके उसे ब्लॉक रिवॉर्ड दिलाता है """
+    for wallet in wallets:
+        for _ in range(blocks_per_wallet):
+            response = session.get(f'{node}/mine', params={'reward_address': wallet['public_address']},
+                                   timeout=600)
+            response.raise_for_status()
+    balances = [session.get(f"{node}/balance/{wallet['public_address']}", timeout=REQUEST_TIMEOUT).json()['balance']
+                for wallet in wallets]
+    print(f"Funded {len(wallets)} wallets, balances: min={min(balances)} max={max(balances)}")
+
+
+def presign_transactions(wallets: List[Dict[str, Any]], count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """ वॉलेट्स के बीच `count` छोटे भुगतान, बारी-बारी से हर वॉलेट से """
+    transactions = []
+    start = time.perf_counter()
+    for i in range(count):
+        sender = wallets[i % len(wallets)]
+        recipient = wallets[(i + 1 + rng.randrange(len(wallets) - 1)) % len(wallets)] if len(wallets) > 1 else sender
+        amount = round(rng.uniform(MIN_AMOUNT, MAX_AMOUNT), 6)
+        transactions.append({
+            'sender': sender['public_address'],
+            'recipient': recipient['public_address'],
+            'amount': amount,
+            'signature': sign_transaction_with_key(sender['_key'], sender['public_address'],
+                                                   recipient['public_address'], amount),
+        })
+    print(f"Signed {count} transactions in {time.perf_counter() - start:.2f}s")
+    return transactions
+
+
+# ----------------------------------------------------
+# 2. Open-loop लोड चरण
+# ----------------------------------------------------
+
+class LoadStep:
+    """ एक दर पर एक चरण के परिणाम (कई वर्कर थ्रेड्स से रिकॉर्ड) """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {endpoint: [] for endpoint in ENDPOINTS}
+        self.statuses: Dict[str, Counter] = {endpoint: Counter() for endpoint in ENDPOINTS}
+        self.last_completion = 0.0
+
+    def record(self, endpoint: str, status: str, latency: float, completed_at: float):
+        with self._lock:
+            self.statuses[endpoint][status] += 1
+            if status.startswith('2'):
+                self.latencies[endpoint].append(latency)
+            self.last_completion = max(self.last_completion, completed_at)
+
+
+def _request(session: requests.Session, node: str, endpoint: str, payload: Any) -> requests.Response:
+    if endpoint == 'transactions':
+        return session.post(f'{node}/transactions/new', json=payload, timeout=REQUEST_TIMEOUT)
+    if endpoint == 'balance':
+        return session.get(f'{node}/balance/{payload}', timeout=REQUEST_TIMEOUT)
+    if endpoint == 'chain':
+        return session.get(f'{node}/chain', timeout=REQUEST_TIMEOUT)
+    return session.get(f'{node}/mine', params={'reward_address': payload}, timeout=600)
+
+
+def run_step(session: requests.Session, nodes: List[str], rate: float, duration: float, mix: Dict[str, float],
+             transactions: List[Dict[str, Any]], wallets: List[Dict[str, Any]], executor: ThreadPoolExecutor,
+             rng: random.Random, poisson: bool) -> Dict[str, Any]:
+    step = LoadStep()
+    endpoints = [endpoint for endpoint in ENDPOINTS if mix.get(endpoint, 0) > 0]
+    weights = [mix[endpoint] for endpoint in endpoints]
+    node_cycle = itertools.cycle(nodes)
+    tx_iter = iter(transactions)
+
+    def send(endpoint: str, node: str, payload: Any, scheduled: float):
+        try:
+            response = _request(session, node, endpoint, payload)
+            status = str(response.status_code)
+        except requests.exceptions.RequestException as e:
+            status = type(e).__name__
+        completed = time.perf_counter()
+        step.record(endpoint, status, completed - scheduled, completed)
+
+    futures = []
+    total = int(rate * duration)
+    start = time.perf_counter()
+    scheduled = start
+    for i in range(total):
+        scheduled = scheduled + (rng.expovariate(rate) if poisson else 1.0 / rate) if i else start
+        endpoint = rng.choices(endpoints, weights)[0]
+        if endpoint == 'transactions':
+            payload = next(tx_iter, None)
+            if payload is None:
+                print("WARN: Ran out of pre-signed transactions")
+                break
+        else:
+            payload = rng.choice(wallets)['public_address']
+
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        futures.append(executor.submit(send, endpoint, next(node_cycle), payload, scheduled))
+
+    wait(futures)
+    elapsed = max(step.last_completion, time.perf_counter()) - start
+
+    result: Dict[str, Any] = {'target_rate': rate, 'sent': len(futures), 'elapsed_s': elapsed, 'endpoints': {}}
+    ok_total = 0
+    for endpoint in endpoints:
+        latencies = step.latencies[endpoint]
+        statuses = step.statuses[endpoint]
+        ok_total += len(latencies)
+        result['endpoints'][endpoint] = {
+            'sent': sum(statuses.values()),
+            'ok': len(latencies),
+            'throughput_rps': len(latencies) / elapsed if elapsed > 0 else None,
+            'statuses': dict(statuses),
+            'p50_s': _percentile(latencies, 0.5),
+            'p90_s': _percentile(latencies, 0.9),
+            'p99_s': _percentile(latencies, 0.99),
+            'max_s': max(latencies) if latencies else None,
+        }
+    result['throughput_rps'] = ok_total / elapsed if elapsed > 0 else None
+    return result
+
+
+# ----------------------------------------------------
+# 3. CLI
+# ----------------------------------------------------
+
+def _parse_mix(items: Optional[List[str]]) -> Dict[str, float]:
+    if not items:
+        return dict(DEFAULT_MIX)
+    mix = {endpoint: 0.0 for endpoint in ENDPOINTS}
+    for item in items:
+        name, _, weight = item.partition('=')
+        if name not in mix:
+            raise SystemExit(f"Unknown endpoint in --mix: {name} (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def _check_local(nodes: List[str], allow_remote: bool):
+    for node in nodes:
+        host = urlparse(node).hostname
+        if host not in LOCAL_HOSTS and not allow_remote:
+            raise SystemExit(f"Refusing to load-test non-local node {node} (use --allow-remote for your own hosts)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MyCoin HTTP load generator (open-loop)")
+    parser.add_argument('--node', action='append', default=None, help='Node URL (repeat for several nodes)')
+    parser.add_argument('--allow-remote', action='store_true', help='Allow non-localhost node URLs')
+    parser.add_argument('--connect-peers', action='store_true', help='Register the given nodes as peers of each other')
+    parser.add_argument('--rates', type=float, nargs='+', default=[10, 25, 50, 100])
+    parser.add_argument('--step-duration', type=float, default=20, help='Seconds per rate step')
+    parser.add_argument('--mix', type=str, nargs='*', default=None, help='endpoint=weight, e.g. transactions=0.8 balance=0.2')
+    parser.add_argument('--poisson', action='store_true', help='Poisson arrivals instead of a fixed interval')
+    parser.add_argument('--wallets', type=int, default=10)
+    parser.add_argument('--blocks-per-wallet', type=int, default=1, help='Blocks mined to fund each wallet')
+    parser.add_argument('--concurrency', type=int, default=256, help='Max in-flight requests')
+    parser.add_argument('--admin-token', type=str, default=os.environ.get('ADMIN_TOKEN'),
+                        help="Node ADMIN_TOKEN, required to mine rewards to the test wallets")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=str, default='load_results.json')
+    args = parser.parse_args()
+
+    nodes = [node.rstrip('/') for node in (args.node or ['http://127.0.0.1:5000'])]
+    _check_local(nodes, args.allow_remote)
+    mix = _parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    session = _make_session(args.concurrency)
+    if args.admin_token:
+        # /mine?reward_address= केवल एडमिन के लिए
+        session.headers['X-Admin-Token'] = args.admin_token
+
+    if args.connect_peers and len(nodes) > 1:
+        for node in nodes:
+            others = [other for other in nodes if other != node]
+            session.post(f'{node}/nodes/register', json={'nodes': others}, timeout=REQUEST_TIMEOUT).raise_for_status()
+
+    wallets = create_wallets(args.wallets)
+    fund_wallets(session, nodes[0], wallets, args.blocks_per_wallet)
+    tx_share = mix['transactions'] / sum(mix.values())
+    tx_needed = int(sum(rate * args.step_duration for rate in args.rates) * tx_share * 1.2) + 10
+    transactions = presign_transactions(wallets, tx_needed, rng)
+
+    steps = []
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix='load') as executor:
+        for rate in args.rates:
+            count = int(rate * args.step_duration * tx_share * 1.2) + 1
+            step_transactions, transactions = transactions[:count], transactions[count:]
+            result = run_step(session, nodes, rate, args.step_duration, mix, step_transactions, wallets,
+                              executor, rng, args.poisson)
+            steps.append(result)
+            tx = result['endpoints'].get('transactions', {})
+            p99 = tx.get('p99_s')
+            print(f"rate={rate:>8.1f}/s  achieved={result['throughput_rps']:.1f}/s  "
+                  f"tx p50={tx.get('p50_s') or 0:.4f}s p99={p99 or 0:.4f}s  tx statuses={tx.get('statuses')}")
+    session.close()
+
+    report = {
+        'meta': {
+            'timestamp': time.time(),
+            'git_commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'params': {k: v for k, v in vars(args).items() if k != 'output'},
+        },
+        'results': steps,
+    }
+    with open(os.path.abspath(args.output), 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
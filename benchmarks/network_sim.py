@@ -0,0 +1,654 @@
+"""
+एक ही प्रोसेस में कई नोड्स वाला नेटवर्क सिम्युलेटर (गॉसिप और सर्वसम्मति के लिए)।
+
+हर नोड एक असली `Blockchain` है (persist=False), लेकिन HttpTransport की जगह `LocalTransport`
+संदेशों को एक वर्चुअल-टाइम इवेंट कतार में डालता है। हर लिंक पर लेटेंसी (+ jitter),
+बैंडविड्थ (भेजने वाले का अपलिंक एक समय में एक संदेश भेजता है) और पैकेट लॉस, और
+बीच में नेटवर्क विभाजन (partition) मॉडल किए जाते हैं। माइनिंग एक्सपोनेंशियल
+अंतराल पर होती है (PoW कम कठिनाई पर असली चलता है), इसलिए 50 नोड्स के घंटों का नेटवर्क
+कुछ सेकंड में चलता है।
+
+नोड्स वही करते हैं जो HTTP नोड करता है (api/node_api.py का /blocks/new और /inv):
+    - टिप पर सीधे जुड़ने वाला ब्लॉक -> add_block (जो उसे आगे घोषित करता है)
+    - आगे का ब्लॉक -> भेजने वाले से /chain लेकर adopt_longest_chain
+    - नया ट्रांजैक्शन -> new_transaction (जो आगे सभी पीयर्स को प्रसारित करता है)
+    - --gossip inv: केवल IDs घोषित (inv_*), पीयर अनदेखी IDs माँगता है (getdata_*), फिर बॉडी;
+      --gossip flood: पूरी बॉडी सीधे हर पीयर को (पुराना व्यवहार)
+
+रिपोर्ट (JSON): ब्लॉक प्रसार समय (50/90/100% नोड्स तक), भेजे गए बाइट्स और संदेश (प्रकार के अनुसार),
+प्रति ट्रांजैक्शन संदेश/बाइट्स/बॉडीज़, orphan और reorg दर, और माइनिंग रुकने / विभाजन ख़त्म होने
+के बाद सर्वसम्मति तक का समय।
+एक ही seed से हर रन की घटनाएँ एक जैसी रहती हैं, इसलिए इसे रिग्रेशन रन में चलाया जा सकता है।
+
+उपयोग:
+    python -m benchmarks.network_sim --nodes 50 --degree 8 --duration 3600 -o sim.json
+    python -m benchmarks.network_sim --nodes 20 --partition-at 600 --partition-duration 900 --compare sim.json
+    # नोड्स बढ़ने पर प्रति ट्रांजैक्शन संदेश (flood बनाम inv)
+    python -m benchmarks.network_sim --sweep-nodes 5,10,20,40 --degree 4 --duration 600 -o gossip_sweep.json
+"""
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.blockchain import Blockchain
+from core.cryptos import sign_transaction_with_key, transaction_id
+from core.gossip import Gossip
+from core.snapshot import build_snapshot, commitment_at
+from core.tracing import BlockTracer
+
+from .chain_generator import generate_wallets
+from .run_benchmarks import _git_commit
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+# हर HTTP संदेश पर हेडर आदि का अनुमानित खर्च (बाइट्स)
+HTTP_OVERHEAD_BYTES = 200
+# आगे के ब्लॉक पर एक ही पीयर से /chain दोबारा माँगने से पहले कितना रुकें (वर्चुअल सेकंड)
+CHAIN_FETCH_RETRY_SECONDS = 2.0
+# सिम्युलेशन में PoW कठिनाई (असली खोज चलती है, इसलिए कम रखें)
+SIM_DIFFICULTY = 1
+# ट्रांजैक्शन प्रसार से जुड़े संदेश (प्रति ट्रांजैक्शन आँकड़ों के लिए)
+TX_MESSAGE_KINDS = ('transaction', 'transaction_batch', 'inv_tx', 'getdata_tx')
+
+
+def _payload_size(payload: Any) -> int:
+    return len(json.dumps(payload)) + HTTP_OVERHEAD_BYTES
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    """ nearest-rank percentile (खाली सूची पर None) """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _summary(values: List[float]) -> Dict[str, Optional[float]]:
+    return {'count': len(values), 'median': _percentile(values, 0.5),
+            'p90': _percentile(values, 0.9), 'max': max(values) if values else None}
+
+
+# ----------------------------------------------------
+# 1. वर्चुअल-टाइम इवेंट कतार
+# ----------------------------------------------------
+
+class Simulator:
+    """ डिस्क्रीट-इवेंट शेड्यूलर: (समय, क्रम) के अनुसार कॉलबैक चलाता है """
+    def __init__(self):
+        self.now = 0.0
+        self._queue: List[Tuple[float, int, Callable, Tuple[Any, ...]]] = []
+        self._seq = itertools.count()
+
+    def schedule_at(self, at: float, fn: Callable, *args):
+        heapq.heappush(self._queue, (max(at, self.now), next(self._seq), fn, args))
+
+    def schedule(self, delay: float, fn: Callable, *args):
+        self.schedule_at(self.now + delay, fn, *args)
+
+    def run(self, until: float):
+        while self._queue and self._queue[0][0] <= until:
+            at, _, fn, args = heapq.heappop(self._queue)
+            self.now = at
+            fn(*args)
+        self.now = max(self.now, until)
+
+
+# ----------------------------------------------------
+# 2. नेटवर्क (लिंक्स, विभाजन, आँकड़े)
+# ----------------------------------------------------
+
+class SimNetwork:
+    def __init__(self, sim: Simulator, rng, latency: float, jitter: float, bandwidth: float, loss: float,
+                 gossip: str = 'inv', inv_interval: float = 0.0):
+        self.sim = sim
+        self.rng = rng
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.loss = loss
+        # 'inv' या 'flood'; inv_interval > 0 पर ट्रांजैक्शन IDs इतने सेकंड इकट्ठा होकर एक inv में जाती हैं
+        self.gossip = gossip
+        self.inv_interval = inv_interval
+        self.nodes: Dict[str, 'SimNode'] = {}
+        self._uplink_free_at: Dict[str, float] = {}
+        # (शुरू, अंत, नोड -> समूह)
+        self.partitions: List[Tuple[float, float, Dict[str, int]]] = []
+
+        self.bytes_by_kind: Counter = Counter()
+        self.messages_by_kind: Counter = Counter()
+        self.dropped_by_kind: Counter = Counter()
+        # भेजी गई बॉडीज़ ('tx' / 'block'), एक batch संदेश में कई
+        self.bodies_sent: Counter = Counter()
+
+        # मेट्रिक्स
+        self.mined: Dict[str, Tuple[float, str]] = {}
+        self.first_seen: Dict[str, Dict[str, float]] = {}
+        self.reorg_depths: List[int] = []
+        self.tips: Dict[str, str] = {}
+        self.tip_counts: Counter = Counter()
+        self.watch_convergence_from: List[float] = []
+        self.converged_at: Dict[float, float] = {}
+
+    def partitioned(self, src: str, dst: str) -> bool:
+        now = self.sim.now
+        return any(start <= now < end and groups.get(src) != groups.get(dst)
+                   for start, end, groups in self.partitions)
+
+    def send(self, src: str, dst: str, kind: str, size: int, handler: Callable, *args):
+        """ src के अपलिंक से dst तक एक संदेश; पहुँचने पर dst पर handler(*args) चलता है """
+        self.messages_by_kind[kind] += 1
+        self.bytes_by_kind[kind] += size
+        if self.partitioned(src, dst) or (self.loss and self.rng.random() < self.loss):
+            self.dropped_by_kind[kind] += 1
+            return
+
+        departure = max(self.sim.now, self._uplink_free_at.get(src, 0.0))
+        transmit = size / self.bandwidth if self.bandwidth else 0.0
+        self._uplink_free_at[src] = departure + transmit
+        arrival = departure + transmit + self.latency + self.rng.uniform(0, self.jitter)
+        self.sim.schedule_at(arrival, self.deliver, dst, handler, args)
+
+    def deliver(self, dst: str, handler: Callable, args: Tuple[Any, ...]):
+        handler(*args)
+        self.observe(self.nodes[dst])
+
+    def observe(self, node: 'SimNode'):
+        """ नोड के EventBus से नए ब्लॉक/reorg पढ़कर प्रसार और टिप दर्ज करता है """
+        events, node.cursor, _ = node.blockchain.events.read(node.cursor)
+        changed = False
+        for _, event_type, payload in events:
+            if event_type == 'block':
+                self.first_seen.setdefault(payload['hash'], {}).setdefault(node.name, self.sim.now)
+                changed = True
+            elif event_type == 'reorg':
+                self.reorg_depths.append(payload['old_height'] - payload['fork_height'])
+                changed = True
+        if changed or node.name not in self.tips:
+            self.set_tip(node.name, Blockchain.hash(node.blockchain.view.last_block))
+
+    def set_tip(self, name: str, tip: str):
+        old = self.tips.get(name)
+        if old == tip:
+            return
+        if old is not None:
+            self.tip_counts[old] -= 1
+            if not self.tip_counts[old]:
+                del self.tip_counts[old]
+        self.tips[name] = tip
+        self.tip_counts[tip] += 1
+        self.check_convergence()
+
+    def check_convergence(self):
+        if len(self.tip_counts) != 1 or len(self.tips) != len(self.nodes):
+            return
+        for since in self.watch_convergence_from:
+            if since <= self.sim.now and since not in self.converged_at:
+                self.converged_at[since] = self.sim.now
+
+
+class LocalTransport:
+    """ HttpTransport जैसा इंटरफ़ेस, लेकिन संदेश SimNetwork की वर्चुअल कतार से जाते हैं """
+    def __init__(self, network: SimNetwork, name: str):
+        self.network = network
+        self.name = name
+        # inv_interval तक रुकी हुई ट्रांजैक्शन IDs
+        self._pending_tx_ids: List[str] = []
+
+    def _peers(self, blockchain: Blockchain) -> List[str]:
+        # क्रम निर्धारक रहे (अपलिंक पर संदेशों का क्रम परिणाम बदलता है)
+        return sorted(blockchain.view.nodes)
+
+    def broadcast_transaction(self, blockchain: Blockchain, transaction: Dict[str, Any]):
+        if self.network.gossip == 'inv':
+            return self.announce(blockchain, 'tx', [transaction_id(transaction)])
+        size = _payload_size(transaction)
+        for peer in self._peers(blockchain):
+            self.network.bodies_sent['tx'] += 1
+            self.network.send(self.name, peer, 'transaction', size,
+                              self.network.nodes[peer].receive_transaction, transaction)
+
+    def broadcast_transactions(self, blockchain: Blockchain, transactions: List[Dict[str, Any]]):
+        if not transactions:
+            return
+        if self.network.gossip == 'inv':
+            return self.announce(blockchain, 'tx', [transaction_id(tx) for tx in transactions])
+        size = _payload_size({'transactions': transactions})
+        for peer in self._peers(blockchain):
+            self.network.bodies_sent['tx'] += len(transactions)
+            self.network.send(self.name, peer, 'transaction_batch', size,
+                              self.network.nodes[peer].receive_transactions, transactions)
+
+    def broadcast_new_block(self, blockchain: Blockchain, block: Dict[str, Any]):
+        peers = self._peers(blockchain)
+        if self.network.gossip == 'inv':
+            self.announce(blockchain, 'block', [Blockchain.hash(block)])
+            return len(peers)
+        size = _payload_size({'block': block})
+        for peer in peers:
+            self.network.bodies_sent['block'] += 1
+            self.network.send(self.name, peer, 'block', size, self.network.nodes[peer].receive_block, block, self.name)
+        return len(peers)
+
+    # --- इन्वेंटरी गॉसिप (/inv) ---
+    def announce(self, blockchain: Blockchain, kind: str, ids: List[str]):
+        """ IDs सभी पीयर्स को घोषित करें; ट्रांजैक्शन IDs inv_interval तक इकट्ठा हो सकती हैं (ब्लॉक तुरंत) """
+        if kind == 'tx' and self.network.inv_interval > 0:
+            if not self._pending_tx_ids:
+                self.network.sim.schedule(self.network.inv_interval, self._flush_transactions, blockchain)
+            self._pending_tx_ids.extend(ids)
+            return
+        self._send_inventory(blockchain, kind, ids)
+
+    def _flush_transactions(self, blockchain: Blockchain):
+        ids, self._pending_tx_ids = self._pending_tx_ids, []
+        self._send_inventory(blockchain, 'tx', ids)
+
+    def _send_inventory(self, blockchain: Blockchain, kind: str, ids: List[str]):
+        size = _payload_size({'inventory': {kind: ids}})
+        for peer in self._peers(blockchain):
+            self.network.send(self.name, peer, f'inv_{kind}', size,
+                              self.network.nodes[peer].receive_inventory, self.name, kind, ids)
+
+    # सिंक्रोनस फ़ेच (resolve_conflicts / snapshot_sync सीधे बुलाए जाएँ तब): तुरंत जवाब, बाइट्स गिने जाते हैं
+    def fetch_chain(self, node: str) -> Optional[Dict[str, Any]]:
+        if node not in self.network.nodes or self.network.partitioned(self.name, node):
+            return None
+        data = self.network.nodes[node].chain_response()
+        self.network.messages_by_kind['chain'] += 1
+        self.network.bytes_by_kind['chain'] += _payload_size(data)
+        return data
+
+    def fetch_snapshot(self, node: str) -> Optional[Dict[str, Any]]:
+        if node not in self.network.nodes or self.network.partitioned(self.name, node):
+            return None
+        snapshot = build_snapshot(self.network.nodes[node].blockchain)
+        self.network.messages_by_kind['snapshot'] += 1
+        self.network.bytes_by_kind['snapshot'] += _payload_size(snapshot)
+        return snapshot
+
+    def fetch_snapshot_commitment(self, node: str, height: int) -> Optional[Dict[str, Any]]:
+        if node not in self.network.nodes or self.network.partitioned(self.name, node):
+            return None
+        return commitment_at(self.network.nodes[node].blockchain, height)
+
+
+# ----------------------------------------------------
+# 3. सिम्युलेटेड नोड
+# ----------------------------------------------------
+
+class SimNode:
+    def __init__(self, network: SimNetwork, name: str, wallet: Dict[str, Any]):
+        self.network = network
+        self.name = name
+        self.wallet = wallet
+        self.blockchain = Blockchain(node_address=wallet['public_address'],
+                                     transport=LocalTransport(network, name), persist=False)
+        # seen-set की समय-खिड़की वर्चुअल समय पर चले
+        self.blockchain.gossip = Gossip(clock=lambda: network.sim.now)
+        # ट्रेस स्पैन भी वर्चुअल समय पर और केवल मेमोरी में (TRACE_DIR सेट हो तब भी)
+        self.blockchain.tracer = BlockTracer(node=name, directory=None, clock=lambda: network.sim.now)
+        self.cursor = 0
+        # पीयर -> आख़िरी /chain अनुरोध का समय
+        self._chain_requests: Dict[str, float] = {}
+
+    def chain_response(self) -> Dict[str, Any]:
+        """ /chain जैसा जवाब (एक ही व्यू से) """
+        view = self.blockchain.view
+        return {'chain': list(view.chain), 'length': len(view.chain), 'difficulty': view.difficulty,
+                'pruned_height': view.pruned_height}
+
+    # --- संदेश हैंडलर्स ---
+    def receive_transaction(self, transaction: Dict[str, Any]):
+        self.blockchain.new_transaction(transaction['sender'], transaction['recipient'],
+                                        transaction['amount'], transaction['signature'])
+
+    def receive_transactions(self, transactions: List[Dict[str, Any]]):
+        self.blockchain.new_transactions_batch(transactions)
+
+    def receive_block(self, block: Dict[str, Any], sender: str):
+        kind = self.blockchain.classify_block(block)
+        if kind == 'extends_tip':
+            self.blockchain.add_block(block)
+        elif kind == 'ahead':
+            last_request = self._chain_requests.get(sender)
+            if last_request is not None and self.network.sim.now - last_request < CHAIN_FETCH_RETRY_SECONDS:
+                return
+            self._chain_requests[sender] = self.network.sim.now
+            self.network.send(self.name, sender, 'chain_request', HTTP_OVERHEAD_BYTES,
+                              self.network.nodes[sender].serve_chain, self.name)
+
+    def receive_inventory(self, sender: str, kind: str, ids: List[str]):
+        """ /inv: अनदेखी IDs भेजने वाले से माँगें """
+        wanted = self.blockchain.want_inventory({kind: ids}).get(kind)
+        if wanted:
+            self.network.send(self.name, sender, f'getdata_{kind}', _payload_size({'request': {kind: wanted}}),
+                              self.network.nodes[sender].serve_data, self.name, kind, wanted)
+
+    def serve_data(self, requester: str, kind: str, ids: List[str]):
+        """ /inv के जवाब की माँग: केवल माँगी गई बॉडीज़ भेजें """
+        bodies = self.blockchain.gossip.bodies({kind: ids}).get(kind, [])
+        target = self.network.nodes[requester]
+        self.network.bodies_sent[kind] += len(bodies)
+        if kind == 'block':
+            for block in bodies:
+                self.network.send(self.name, requester, 'block', _payload_size({'block': block}),
+                                  target.receive_block, block, self.name)
+        elif len(bodies) == 1:
+            self.network.send(self.name, requester, 'transaction', _payload_size(bodies[0]),
+                              target.receive_transaction, bodies[0])
+        elif bodies:
+            self.network.send(self.name, requester, 'transaction_batch', _payload_size({'transactions': bodies}),
+                              target.receive_transactions, bodies)
+
+    def serve_chain(self, requester: str):
+        data = self.chain_response()
+        self.network.send(self.name, requester, 'chain', _payload_size(data),
+                          self.network.nodes[requester].receive_chain, data, self.name)
+
+    def receive_chain(self, data: Dict[str, Any], sender: str):
+        self._chain_requests.pop(sender, None)
+        self.blockchain.adopt_longest_chain([data])
+
+    # --- स्थानीय काम ---
+    def mine(self) -> Dict[str, Any]:
+        view = self.blockchain.view
+        previous_hash = Blockchain.hash(view.last_block)
+        proof = Blockchain.search_proof(previous_hash, view.difficulty)
+        block = self.blockchain.new_block(proof, previous_hash, self.wallet['public_address'])
+        self.network.mined[Blockchain.hash(block)] = (self.network.sim.now, self.name)
+        self.network.observe(self)
+        return block
+
+    def submit_transaction(self, recipient: str, amount: float) -> bool:
+        address = self.wallet['public_address']
+        signature = sign_transaction_with_key(self.wallet['_key'], address, recipient, amount)
+        index, _ = self.blockchain.new_transaction(address, recipient, amount, signature)
+        return index is not False
+
+
+# ----------------------------------------------------
+# 4. परिदृश्य (Scenario) चलाना
+# ----------------------------------------------------
+
+def build_topology(names: List[str], degree: int, rng) -> Dict[str, set]:
+    """ degree=0: पूरा मेश; वरना हर नोड `degree` रैंडम पीयर्स से जुड़ता है (लिंक दोनों तरफ़) """
+    peers = {name: set() for name in names}
+    for name in names:
+        others = [other for other in names if other != name]
+        chosen = others if not degree or degree >= len(others) else rng.sample(others, degree)
+        for other in chosen:
+            peers[name].add(other)
+            peers[other].add(name)
+    return peers
+
+
+def run_simulation(nodes: int = 20, degree: int = 0, duration: float = 3600.0, block_interval: float = 60.0,
+                   latency: float = 0.1, jitter: float = 0.05, bandwidth: float = 1_000_000.0, loss: float = 0.0,
+                   tx_rate: float = 0.2, partition_at: Optional[float] = None, partition_duration: float = 0.0,
+                   drain: float = 300.0, seed: int = 0, gossip: str = 'inv', inv_interval: float = 0.0) -> Dict[str, Any]:
+    """ एक परिदृश्य चलाकर मेट्रिक्स रिटर्न करता है (स्क्रिप्ट्स से सीधे भी बुलाया जा सकता है) """
+    rng = random.Random(seed)
+    sim = Simulator()
+    network = SimNetwork(sim, rng, latency, jitter, bandwidth, loss, gossip, inv_interval)
+
+    names = [f'node{i}' for i in range(nodes)]
+    wallets = generate_wallets(nodes, seed)
+    for name, wallet in zip(names, wallets):
+        network.nodes[name] = SimNode(network, name, wallet)
+
+    # सभी नोड्स एक ही जेनेसिस से शुरू हों
+    first = network.nodes[names[0]].blockchain
+    with first.lock:
+        first.chain[0]['difficulty'] = SIM_DIFFICULTY
+        first.difficulty = SIM_DIFFICULTY
+        first.publish_view()
+    for name, peers in build_topology(names, degree, rng).items():
+        blockchain = network.nodes[name].blockchain
+        with blockchain.lock:
+            blockchain.difficulty = SIM_DIFFICULTY
+            if blockchain is not first:
+                blockchain.replace_chain(list(first.view.chain))
+            for peer in sorted(peers):
+                blockchain.register_node(peer)
+        network.nodes[name].cursor = blockchain.events.seq
+        network.observe(network.nodes[name])
+
+    if partition_at is not None and partition_duration > 0:
+        groups = {name: (0 if i < nodes // 2 else 1) for i, name in enumerate(names)}
+        network.partitions.append((partition_at, partition_at + partition_duration, groups))
+        heal_at = partition_at + partition_duration
+        network.watch_convergence_from.append(heal_at)
+        sim.schedule_at(heal_at, network.check_convergence)
+    network.watch_convergence_from.append(duration)
+
+    # माइनिंग: पूरे नेटवर्क पर औसतन हर block_interval में एक ब्लॉक, हर नोड की बराबर हैशरेट
+    node_rate = 1.0 / (block_interval * nodes)
+
+    def mine(node: SimNode):
+        node.mine()
+        schedule_mining(node)
+
+    def schedule_mining(node: SimNode):
+        at = sim.now + rng.expovariate(node_rate)
+        if at < duration:
+            sim.schedule_at(at, mine, node)
+
+    for name in names:
+        schedule_mining(network.nodes[name])
+
+    # ट्रांजैक्शन: जिस नोड के वॉलेट में पैसे हैं वह किसी दूसरे नोड को भेजता है
+    tx_stats = Counter()
+
+    def submit_transaction():
+        node = network.nodes[rng.choice(names)]
+        balance = node.blockchain.get_balance(node.wallet['public_address'])
+        amount = round(rng.uniform(0.01, 1.0), 4)
+        if balance >= amount:
+            recipient = network.nodes[rng.choice([name for name in names if name != node.name])]
+            tx_stats['accepted' if node.submit_transaction(recipient.wallet['public_address'], amount) else 'rejected'] += 1
+            network.observe(node)
+        else:
+            tx_stats['unfunded'] += 1
+        schedule_transaction()
+
+    def schedule_transaction():
+        at = sim.now + rng.expovariate(tx_rate)
+        if at < duration:
+            sim.schedule_at(at, submit_transaction)
+
+    if tx_rate > 0:
+        schedule_transaction()
+
+    sim.schedule_at(duration, network.check_convergence)
+    wall_start = time.perf_counter()
+    sim.run(duration + drain)
+    wall_seconds = time.perf_counter() - wall_start
+
+    return _report(network, names, tx_stats, duration, wall_seconds)
+
+
+def _report(network: SimNetwork, names: List[str], tx_stats: Counter, duration: float,
+            wall_seconds: float) -> Dict[str, Any]:
+    # सबसे लंबी चेन (बराबरी पर सबसे ज़्यादा नोड्स वाली टिप) को अंतिम सर्वसम्मति मानें
+    views = [network.nodes[name].blockchain.view for name in names]
+    best = max(views, key=lambda view: (len(view.chain), network.tip_counts.get(Blockchain.hash(view.last_block), 0)))
+    best_hashes = {Blockchain.hash(block) for block in best.chain}
+
+    mined = network.mined
+    orphaned = [block_hash for block_hash in mined if block_hash not in best_hashes]
+
+    node_count = len(names)
+    reach = {0.5: [], 0.9: [], 1.0: []}
+    for block_hash, (mined_at, _) in mined.items():
+        if block_hash not in best_hashes:
+            continue
+        delays = sorted(seen_at - mined_at for seen_at in network.first_seen.get(block_hash, {}).values())
+        for fraction, values in reach.items():
+            needed = max(1, math.ceil(fraction * node_count))
+            if len(delays) >= needed:
+                values.append(delays[needed - 1])
+
+    convergence = {}
+    for since in network.watch_convergence_from:
+        label = 'after_mining_stopped' if since == duration else 'after_partition_healed'
+        converged_at = network.converged_at.get(since)
+        convergence[label] = converged_at - since if converged_at is not None else None
+
+    total_bytes = sum(network.bytes_by_kind.values())
+    accepted = tx_stats['accepted']
+    per_transaction = {
+        'messages': sum(network.messages_by_kind[kind] for kind in TX_MESSAGE_KINDS) / accepted,
+        'bytes': sum(network.bytes_by_kind[kind] for kind in TX_MESSAGE_KINDS) / accepted,
+        # आदर्श: हर दूसरे नोड तक एक बार (nodes - 1)
+        'bodies': network.bodies_sent['tx'] / accepted,
+    } if accepted else None
+    return {
+        'blocks_mined': len(mined),
+        'best_chain_length': len(best.chain),
+        'orphaned_blocks': len(orphaned),
+        'orphan_rate': len(orphaned) / len(mined) if mined else 0.0,
+        'reorgs': len(network.reorg_depths),
+        'reorgs_per_node_hour': len(network.reorg_depths) / node_count / (duration / 3600.0) if duration else None,
+        'reorg_depth': _summary(network.reorg_depths),
+        'propagation_s': {
+            'to_50pct': _summary(reach[0.5]),
+            'to_90pct': _summary(reach[0.9]),
+            'to_all': _summary(reach[1.0]),
+            'fully_propagated_fraction': len(reach[1.0]) / (len(mined) - len(orphaned)) if len(mined) > len(orphaned) else None,
+        },
+        'convergence_s': convergence,
+        'converged': len(network.tip_counts) == 1,
+        'distinct_tips_at_end': len(network.tip_counts),
+        'bytes_total': total_bytes,
+        'bytes_by_kind': dict(network.bytes_by_kind),
+        'messages_total': sum(network.messages_by_kind.values()),
+        'messages_by_kind': dict(network.messages_by_kind),
+        'dropped_by_kind': dict(network.dropped_by_kind),
+        'bodies_sent': dict(network.bodies_sent),
+        'per_transaction': per_transaction,
+        'transactions': dict(tx_stats),
+        'wall_seconds': wall_seconds,
+    }
+
+
+# ----------------------------------------------------
+# 5. CLI और तुलना
+# ----------------------------------------------------
+
+# --compare में दिखाए जाने वाले मेट्रिक्स (डॉट पाथ)
+COMPARE_METRICS = (
+    'orphan_rate', 'reorgs', 'propagation_s.to_90pct.median', 'propagation_s.to_all.p90',
+    'convergence_s.after_mining_stopped', 'convergence_s.after_partition_healed', 'bytes_total', 'messages_total',
+    'per_transaction.messages', 'per_transaction.bytes', 'per_transaction.bodies',
+)
+
+
+def _lookup(results: Dict[str, Any], path: str):
+    value: Any = results
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    print(f"\n{'metric':<40} {'baseline':>14} {'current':>14}")
+    for path in COMPARE_METRICS:
+        base, cur = _lookup(baseline.get('results', {}), path), _lookup(current['results'], path)
+        if base is None and cur is None:
+            continue
+        fmt = lambda value: f'{value:>14.4f}' if isinstance(value, float) else f'{str(value):>14}'
+        print(f'{path:<40} {fmt(base)} {fmt(cur)}')
+
+
+def sweep(node_counts: List[int], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """ हर नोड संख्या पर flood और inv दोनों चलाकर प्रति ट्रांजैक्शन संदेश/बाइट्स की तालिका """
+    rows = []
+    print(f"\n{'nodes':>6} {'gossip':>7} {'msgs/tx':>9} {'bytes/tx':>10} {'bodies/tx':>10} {'to_all p90':>11}")
+    for nodes in node_counts:
+        for gossip in ('flood', 'inv'):
+            results = run_simulation(**dict(params, nodes=nodes, gossip=gossip))
+            per_tx = results['per_transaction'] or {}
+            row = {'nodes': nodes, 'gossip': gossip, 'per_transaction': results['per_transaction'],
+                   'propagation_to_all_p90_s': results['propagation_s']['to_all']['p90'],
+                   'messages_by_kind': results['messages_by_kind'], 'transactions': results['transactions']}
+            rows.append(row)
+            fmt = lambda value, width: f'{value:>{width}.1f}' if value is not None else f"{'n/a':>{width}}"
+            print(f"{nodes:>6} {gossip:>7} {fmt(per_tx.get('messages'), 9)} {fmt(per_tx.get('bytes'), 10)} "
+                  f"{fmt(per_tx.get('bodies'), 10)} {fmt(row['propagation_to_all_p90_s'], 11)}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MyCoin in-process network simulator")
+    parser.add_argument('--nodes', type=int, default=20)
+    parser.add_argument('--degree', type=int, default=0, help='Random peers per node (0 = full mesh)')
+    parser.add_argument('--duration', type=float, default=3600, help='Virtual seconds of mining')
+    parser.add_argument('--block-interval', type=float, default=60, help='Network-wide mean seconds per block')
+    parser.add_argument('--latency', type=float, default=0.1, help='One-way link latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.05, help='Extra random latency in seconds')
+    parser.add_argument('--bandwidth', type=float, default=1_000_000, help='Uplink bytes per second (0 = unlimited)')
+    parser.add_argument('--loss', type=float, default=0.0, help='Probability a message is dropped')
+    parser.add_argument('--tx-rate', type=float, default=0.2, help='Network-wide transactions per second')
+    parser.add_argument('--partition-at', type=float, default=None, help='Split the network in two halves at this time')
+    parser.add_argument('--partition-duration', type=float, default=0.0)
+    parser.add_argument('--drain', type=float, default=300, help='Virtual seconds to keep delivering after mining stops')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--gossip', choices=('inv', 'flood'), default='inv',
+                        help='inv: announce ids and send only requested bodies; flood: send full bodies to every peer')
+    parser.add_argument('--inv-interval', type=float, default=0.0,
+                        help='Batch transaction announcements for this many seconds (0 = announce immediately)')
+    parser.add_argument('--sweep-nodes', type=str, default=None,
+                        help='Comma-separated node counts; run flood and inv at each and report messages per transaction')
+    parser.add_argument('-o', '--output', type=str, default='sim_results.json')
+    parser.add_argument('--compare', type=str, default=None, help='Baseline results JSON to compare against')
+    args = parser.parse_args()
+
+    params = {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'sweep_nodes')}
+    meta = {
+        'timestamp': time.time(),
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'params': params,
+    }
+    if args.sweep_nodes:
+        rows = sweep([int(count) for count in args.sweep_nodes.split(',') if count.strip()], params)
+        with open(os.path.abspath(args.output), 'w') as f:
+            json.dump({'meta': meta, 'sweep': rows}, f, indent=4)
+        print(f"Sweep results written to {args.output}")
+        return
+
+    results = run_simulation(**params)
+
+    report = {'meta': meta, 'results': results}
+    with open(os.path.abspath(args.output), 'w') as f:
+        json.dump(report, f, indent=4)
+
+    propagation = results['propagation_s']
+    print(f"Blocks mined: {results['blocks_mined']}  orphan rate: {results['orphan_rate']:.3f}  reorgs: {results['reorgs']}")
+    seconds = lambda value: f'{value:.3f}s' if value is not None else 'n/a'
+    print(f"Propagation to 90% (median): {seconds(propagation['to_90pct']['median'])}  "
+          f"to all (p90): {seconds(propagation['to_all']['p90'])}")
+    print(f"Convergence: {results['convergence_s']}  bytes: {results['bytes_total']}  messages: {results['messages_total']}")
+    print(f"Simulated in {results['wall_seconds']:.2f}s, results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
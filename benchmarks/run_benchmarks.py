@@ -0,0 +1,258 @@
+"""
+MyCoin के हॉट पाथ्स के लिए बेंचमार्क सूट।
+
+सभी बेंचमार्क `chain_generator` से बनी निर्धारक चेन पर चलते हैं और परिणाम JSON में
+लिखे जाते हैं, ताकि दो रन (जैसे किसी बदलाव से पहले और बाद) की तुलना की जा सके।
+
+उपयोग:
+    python -m benchmarks.run_benchmarks --blocks 1000 --txs-per-block 10 -o before.json
+    python -m benchmarks.run_benchmarks --blocks 1000 --txs-per-block 10 -o after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from core.blockchain import Blockchain
+from core.cryptos import verify_signature
+from utils.data_storage import save_blockchain, load_blockchain
+
+from .chain_generator import generate_chain
+
+# ----------------------------------------------------
+# 1. टाइमिंग हेल्पर
+# ----------------------------------------------------
+
+def measure(fn: Callable[[], Any], repeat: int, ops: int = 1,
+            setup: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """ `fn` को `repeat` बार चलाकर सेकंड्स में समय और ops/sec रिटर्न करता है। """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        'repeat': repeat,
+        'ops': ops,
+        'min_s': best,
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'ops_per_s': ops / best if best > 0 else None,
+    }
+
+
+def _make_blockchain(data: Dict[str, Any]) -> Blockchain:
+    """ मौजूदा (अस्थायी) डायरेक्टरी में एक Blockchain बनाकर उसमें सिंथेटिक चेन डालता है। """
+    blockchain = Blockchain(node_address='benchmark-node')
+    blockchain.chain = list(data['chain'])
+    blockchain.difficulty = data['difficulty']
+    blockchain.balance_manager.recalculate_balances()
+    blockchain.publish_view()
+    return blockchain
+
+
+def _signed_transactions(chain: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    txs = []
+    for block in chain:
+        for tx in block['transactions']:
+            if tx['sender'] != "SYSTEM_COINBASE":
+                txs.append(tx)
+                if len(txs) >= limit:
+                    return txs
+    return txs
+
+
+# ----------------------------------------------------
+# 2. बेंचमार्क्स
+# ----------------------------------------------------
+
+def bench_pow_search(data, args):
+    blockchain = _make_blockchain(data)
+    blockchain.difficulty = args.pow_difficulty
+    last_block = blockchain.last_block
+    proofs = []
+
+    result = measure(lambda: proofs.append(blockchain.proof_of_work(last_block)), args.repeat)
+    # प्रूफ = कोशिश किए गए हैश की संख्या - 1
+    hashes = proofs[-1] + 1
+    result['hashes'] = hashes
+    result['hashes_per_s'] = hashes / result['min_s'] if result['min_s'] > 0 else None
+    result['difficulty'] = args.pow_difficulty
+    return result
+
+
+def bench_block_hash(data, args):
+    chain = data['chain']
+    return measure(lambda: [Blockchain.hash(block) for block in chain], args.repeat, ops=len(chain))
+
+
+def bench_chain_validation(data, args):
+    blockchain = _make_blockchain(data)
+    chain = data['chain']
+
+    def run():
+        is_valid, message = blockchain.is_valid_chain(chain)
+        assert is_valid, message
+
+    return measure(run, args.repeat, ops=len(chain))
+
+
+def bench_balance_replay(data, args):
+    blockchain = _make_blockchain(data)
+    tx_count = sum(len(block['transactions']) for block in data['chain'])
+    return measure(blockchain.balance_manager.recalculate_balances, args.repeat, ops=tx_count)
+
+
+def bench_persistence_save(data, args):
+    result = measure(lambda: save_blockchain(data['chain'], data['difficulty'], set()),
+                     args.repeat, ops=len(data['chain']))
+    result['bytes'] = os.path.getsize(os.path.join('data', 'blockchain.json'))
+    return result
+
+
+def bench_persistence_load(data, args):
+    save_blockchain(data['chain'], data['difficulty'], set())
+    return measure(load_blockchain, args.repeat, ops=len(data['chain']))
+
+
+def bench_signature_verify(data, args):
+    txs = _signed_transactions(data['chain'], args.verify_count)
+
+    def run():
+        for tx in txs:
+            assert verify_signature(tx['sender'], tx['signature'], tx['sender'], tx['recipient'], tx['amount'])
+
+    return measure(run, args.repeat, ops=len(txs))
+
+
+def bench_consensus_merge(data, args):
+    """
+    सर्वसम्मति का लोकल हिस्सा: लंबी चेन की जाँच करना और उसे अपनाना
+    (बैलेंस रीप्ले + मेमोरी पूल क्लीनअप + सेव)। नेटवर्क फ़ेच इसमें शामिल नहीं है।
+    """
+    chain = data['chain']
+    local_length = max(1, len(chain) // 2)
+    mempool = _signed_transactions(chain[local_length:], args.verify_count)
+    blockchain = _make_blockchain(data)
+
+    def setup():
+        blockchain.chain = chain[:local_length]
+        blockchain.current_transactions = list(mempool)
+        blockchain.publish_view()
+
+    def run():
+        is_valid, message = blockchain.is_valid_chain(chain)
+        assert is_valid, message
+        blockchain.replace_chain(list(chain))
+
+    return measure(run, args.repeat, ops=len(chain), setup=setup)
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'pow_search': bench_pow_search,
+    'block_hash': bench_block_hash,
+    'chain_validation': bench_chain_validation,
+    'balance_replay': bench_balance_replay,
+    'persistence_save': bench_persistence_save,
+    'persistence_load': bench_persistence_load,
+    'signature_verify': bench_signature_verify,
+    'consensus_merge': bench_consensus_merge,
+}
+
+
+# ----------------------------------------------------
+# 3. परिणाम और तुलना
+# ----------------------------------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """ दो रन के min_s की तुलना प्रिंट करता है (अनुपात < 1 = तेज़) """
+    print(f"\n{'benchmark':<20} {'baseline_s':>12} {'current_s':>12} {'ratio':>8}")
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        ratio = result['min_s'] / base['min_s'] if base['min_s'] else float('nan')
+        print(f"{name:<20} {base['min_s']:>12.6f} {result['min_s']:>12.6f} {ratio:>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MyCoin benchmark suite")
+    parser.add_argument('--blocks', type=int, default=1000)
+    parser.add_argument('--txs-per-block', type=int, default=10)
+    parser.add_argument('--addresses', type=int, default=50)
+    parser.add_argument('--difficulty', type=int, default=1, help='Difficulty of the generated chain')
+    parser.add_argument('--pow-difficulty', type=int, default=4, help='Difficulty for the PoW search benchmark')
+    parser.add_argument('--verify-count', type=int, default=500, help='Signatures per verify/mempool benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--chain-file', type=str, default=None, help='Reuse a chain written by chain_generator')
+    parser.add_argument('--only', type=str, nargs='*', choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument('-o', '--output', type=str, default='bench_results.json')
+    parser.add_argument('--compare', type=str, default=None, help='Baseline results JSON to compare against')
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output)
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    if args.chain_file:
+        with open(args.chain_file) as f:
+            data = json.load(f)
+    else:
+        start = time.perf_counter()
+        data = generate_chain(args.blocks, args.txs_per_block, args.addresses, args.difficulty, args.seed)
+        print(f"Generated {len(data['chain'])} blocks in {time.perf_counter() - start:.2f}s")
+
+    results: Dict[str, Any] = {}
+    # Persistence बेंचमार्क्स असली data/ फ़ोल्डर को न छुएँ, इसलिए अस्थायी डायरेक्टरी में चलाएँ
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='mycoin-bench-') as workdir:
+        os.chdir(workdir)
+        try:
+            for name in args.only or BENCHMARKS:
+                results[name] = BENCHMARKS[name](data, args)
+                print(f"{name:<20} min={results[name]['min_s']:.6f}s ops/s={results[name]['ops_per_s']}")
+        finally:
+            os.chdir(original_cwd)
+
+    report = {
+        'meta': {
+            'timestamp': time.time(),
+            'git_commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'blocks': len(data['chain']),
+            'transactions': sum(len(block['transactions']) for block in data['chain']),
+            'params': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        },
+        'results': results,
+    }
+
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\nResults written to {output_path}")
+
+    if compare_path:
+        with open(compare_path) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""
+ब्लॉक प्रसार ट्रेस कलेक्टर (core/tracing.py के स्पैन से प्रति-ब्लॉक टाइमलाइन)।
+
+हर नोड अपने स्पैन <TRACE_DIR>/<node>.<pid>.jsonl में लिखता है (या /admin/traces पर देता है)।
+यह स्क्रिप्ट सभी नोड्स के स्पैन ब्लॉक हैश (trace_id) से जोड़कर बताती है कि हर ब्लॉक हर नोड तक
+कितनी देर में पहुँचा और वह समय कहाँ गया:
+    transit  -> भेजने वाले के sent_at से इस नोड पर HTTP अनुरोध आने तक (नेटवर्क + पीयर का लूप)
+    receive  -> अनुरोध आने से सत्यापन शुरू होने तक (रेट लिमिट, एडमिशन कतार, हैशिंग)
+    download -> सर्वसम्मति में पीयर्स से /chain लाना (resolve_conflicts)
+    validate, apply, persist (save_blockchain), forward (पहले से आख़िरी पीयर तक प्रसारण)
+arrival = origin पर PoW पूरा होने (created_at) से इस नोड पर ब्लॉक लागू होने तक।
+
+समय दीवार-घड़ी के हैं, इसलिए एक ही होस्ट के नोड्स (एक ही TRACE_DIR) सीधे तुलनीय हैं।
+
+उपयोग:
+    TRACE_DIR=/tmp/traces PORT=5001 python -m api.node_api   (हर नोड, एक ही TRACE_DIR)
+    python -m benchmarks.trace_collector --dir /tmp/traces
+    python -m benchmarks.trace_collector --node http://127.0.0.1:5001 --node http://127.0.0.1:5002 \\
+        --admin-token <ADMIN_TOKEN> --spans -o timelines.json
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+STAGES = ('transit', 'receive', 'download', 'validate', 'apply', 'persist', 'forward')
+FETCH_LIMIT = 20_000
+
+
+# ----------------------------------------------------
+# 1. स्पैन इकट्ठा करना
+# ----------------------------------------------------
+
+def load_spans(directory: str) -> List[Dict[str, Any]]:
+    """ डायरेक्टरी की सभी *.jsonl फ़ाइलें (अधूरी/ख़राब पंक्तियाँ छोड़ दी जाती हैं) """
+    spans = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.jsonl'))):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(item, dict) and 'trace_id' in item:
+                    spans.append(item)
+    return spans
+
+
+def fetch_spans(node: str, admin_token: Optional[str], limit: int = FETCH_LIMIT) -> List[Dict[str, Any]]:
+    """ एक नोड के /admin/traces से हाल के स्पैन """
+    try:
+        response = requests.get(f"{node.rstrip('/')}/admin/traces", params={'limit': limit},
+                                headers={'X-Admin-Token': admin_token or ''}, timeout=10)
+    except requests.exceptions.RequestException as e:
+        print(f"WARN: Could not fetch traces from {node}: {e}", file=sys.stderr)
+        return []
+    if response.status_code != 200:
+        print(f"WARN: Could not fetch traces from {node}: HTTP {response.status_code}", file=sys.stderr)
+        return []
+    return response.json().get('spans', [])
+
+
+def _dedupe(spans: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # फ़ाइल और /admin/traces दोनों से आया एक ही स्पैन एक बार गिनें
+    unique = {}
+    for item in spans:
+        key = (item.get('trace_id'), item.get('node'), item.get('span'), item.get('start'), item.get('peer'))
+        unique[key] = item
+    return list(unique.values())
+
+
+# ----------------------------------------------------
+# 2. प्रति-ब्लॉक टाइमलाइन
+# ----------------------------------------------------
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return round(value * 1000, 3) if value is not None else None
+
+
+def _first(spans: List[Dict[str, Any]], name: str, ok_only: bool = False) -> Optional[Dict[str, Any]]:
+    for item in spans:
+        if item['span'] == name and (not ok_only or item.get('result', 'ok') == 'ok'):
+            return item
+    return None
+
+
+def _node_timeline(spans: List[Dict[str, Any]], t0: float) -> Dict[str, Any]:
+    """ एक नोड पर एक ब्लॉक के स्पैन से चरणों का समय (ms) """
+    spans = sorted(spans, key=lambda item: item['start'])
+    receives = [item for item in spans if item['span'] == 'receive']
+    accepted = next((item for item in receives if item.get('result') != 'duplicate'), None)
+    apply = _first(spans, 'apply', ok_only=True)
+    downloads = [item for item in spans if item['span'] == 'download']
+    forwards = [item for item in spans if item['span'] == 'forward']
+
+    stages: Dict[str, Optional[float]] = dict.fromkeys(STAGES)
+    if accepted is not None:
+        if accepted.get('sent_at') is not None:
+            stages['transit'] = _ms(accepted['start'] - accepted['sent_at'])
+        stages['receive'] = accepted['duration_ms']
+    if downloads:
+        # async नोड पर डाउनलोड समवर्ती होते हैं: पहले शुरू से आख़िरी ख़त्म तक
+        stages['download'] = _ms(max(item['end'] for item in downloads) - min(item['start'] for item in downloads))
+    for name in ('validate', 'persist'):
+        item = _first(spans, name)
+        if item is not None:
+            stages[name] = item['duration_ms']
+    if apply is not None:
+        stages['apply'] = apply['duration_ms']
+    if forwards:
+        stages['forward'] = _ms(max(item['end'] for item in forwards) - min(item['start'] for item in forwards))
+
+    first = spans[0]
+    return {
+        'hop': (apply or accepted or first).get('hop'),
+        'from': accepted.get('from') if accepted else None,
+        'via': 'consensus' if (accepted or {}).get('via') == 'consensus' else ('origin' if first.get('hop') == 0 else 'direct'),
+        'arrival_ms': _ms(apply['end'] - t0) if apply is not None else None,
+        'stages': stages,
+        'duplicates': sum(1 for item in receives if item.get('result') == 'duplicate'),
+        'rejected': next((item.get('result') for item in spans
+                          if item['span'] in ('validate', 'apply') and item.get('result', 'ok') != 'ok'), None),
+        'forwards': [{'peer': item.get('peer'), 'result': item.get('result'), 'mode': item.get('mode'),
+                      'start_ms': _ms(item['start'] - t0), 'duration_ms': item['duration_ms']} for item in forwards],
+    }
+
+
+def build_timelines(spans: Iterable[Dict[str, Any]], include_spans: bool = False) -> List[Dict[str, Any]]:
+    """ स्पैन को ब्लॉक (trace_id) और नोड के हिसाब से जोड़ता है; ब्लॉक्स ऊँचाई के क्रम में """
+    by_block: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for item in _dedupe(spans):
+        by_block[item['trace_id']].append(item)
+
+    timelines = []
+    for trace_id, items in by_block.items():
+        origin_spans = [item for item in items if item.get('hop') == 0]
+        created = [item['created_at'] for item in items if item.get('created_at') is not None]
+        # origin का अपना created_at सबसे भरोसेमंद; न मिले तो पीयर्स के संदर्भ से, वरना पहला स्पैन
+        t0 = (origin_spans[0]['created_at'] if origin_spans and origin_spans[0].get('created_at') is not None
+              else min(created) if created else min(item['start'] for item in items))
+        origin = next((item['origin'] for item in items if item.get('origin')), None)
+
+        per_node: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for item in items:
+            per_node[item['node']].append(item)
+        nodes = {node: _node_timeline(node_spans, t0) for node, node_spans in per_node.items()}
+        arrivals = [node['arrival_ms'] for node in nodes.values() if node['arrival_ms'] is not None]
+
+        timeline = {
+            'trace_id': trace_id,
+            'index': next((item['index'] for item in items if item.get('index') is not None), None),
+            'origin': origin,
+            'created_at': t0,
+            'nodes_reached': len(arrivals),
+            'nodes_seen': len(nodes),
+            'last_arrival_ms': max(arrivals) if arrivals else None,
+            'nodes': dict(sorted(nodes.items(), key=lambda kv: (kv[1]['arrival_ms'] is None, kv[1]['arrival_ms'] or 0))),
+        }
+        if include_spans:
+            timeline['spans'] = [dict(item, offset_ms=_ms(item['start'] - t0))
+                                 for item in sorted(items, key=lambda item: item['start'])]
+        timelines.append(timeline)
+
+    timelines.sort(key=lambda timeline: (timeline['index'] is None, timeline['index'] or 0, timeline['created_at']))
+    return timelines
+
+
+def summarize(timelines: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """ सभी ब्लॉक्स/नोड्स पर हर चरण का median/p90/max (origin और रिसीवर अलग) """
+    samples: Dict[str, Dict[str, List[float]]] = {'origin': defaultdict(list), 'receiver': defaultdict(list)}
+    arrivals = []
+    for timeline in timelines:
+        for node in timeline['nodes'].values():
+            role = 'origin' if node['hop'] == 0 else 'receiver'
+            for stage, value in node['stages'].items():
+                if value is not None:
+                    samples[role][stage].append(value)
+            if role == 'receiver' and node['arrival_ms'] is not None:
+                arrivals.append(node['arrival_ms'])
+
+    def stats(values: List[float]) -> Dict[str, float]:
+        ordered = sorted(values)
+        return {'count': len(ordered), 'median_ms': round(statistics.median(ordered), 3),
+                'p90_ms': round(ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))], 3),
+                'max_ms': round(ordered[-1], 3)}
+
+    return {
+        'blocks': len(timelines),
+        'arrival': stats(arrivals) if arrivals else None,
+        'stages': {role: {stage: stats(values[stage]) for stage in STAGES if values.get(stage)}
+                   for role, values in samples.items()},
+    }
+
+
+# ----------------------------------------------------
+# 3. रिपोर्ट
+# ----------------------------------------------------
+
+def _cell(value: Any, width: int) -> str:
+    if value is None:
+        return '-'.rjust(width)
+    if isinstance(value, float):
+        return f'{value:.1f}'.rjust(width)
+    return str(value).rjust(width)
+
+
+def print_report(timelines: List[Dict[str, Any]], summary: Dict[str, Any]):
+    name_width = max([len(node) for timeline in timelines for node in timeline['nodes']] + [4])
+    header = f"  {'node'.ljust(name_width)} {'hop':>3} {'arrival':>9} " + ' '.join(f'{stage:>9}' for stage in STAGES)
+    for timeline in timelines:
+        print(f"\nBlock {timeline['index']} {timeline['trace_id'][:16]}  origin {timeline['origin'] or '?'}  "
+              f"reached {timeline['nodes_reached']}/{timeline['nodes_seen']} nodes"
+              + (f", last after {timeline['last_arrival_ms']:.1f} ms" if timeline['last_arrival_ms'] is not None else ''))
+        print(header)
+        for name, node in timeline['nodes'].items():
+            row = f"  {name.ljust(name_width)} {_cell(node['hop'], 3)} {_cell(node['arrival_ms'], 9)} "
+            row += ' '.join(_cell(node['stages'][stage], 9) for stage in STAGES)
+            notes = [f"via {node['via']}"] if node['via'] == 'consensus' else []
+            if node['from']:
+                notes.append(f"from {node['from']}")
+            if node['duplicates']:
+                notes.append(f"{node['duplicates']} duplicate(s)")
+            if node['rejected']:
+                notes.append(f"rejected: {node['rejected']}")
+            print(row + (f"  ({', '.join(notes)})" if notes else ''))
+
+    print(f"\nSummary over {summary['blocks']} blocks (ms)")
+    if summary['arrival']:
+        arrival = summary['arrival']
+        print(f"  arrival at peers: median {arrival['median_ms']:.1f}  p90 {arrival['p90_ms']:.1f}  max {arrival['max_ms']:.1f}")
+    for role, stages in summary['stages'].items():
+        for stage, values in stages.items():
+            print(f"  {role:<8} {stage:<9} median {values['median_ms']:>9.1f}  p90 {values['p90_ms']:>9.1f}  "
+                  f"max {values['max_ms']:>9.1f}  (n={values['count']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild per-block propagation timelines from node trace spans")
+    parser.add_argument('--dir', action='append', default=[], help='TRACE_DIR with <node>.<pid>.jsonl files (repeatable)')
+    parser.add_argument('--node', action='append', default=[], help='Node URL to read /admin/traces from (repeatable)')
+    parser.add_argument('--admin-token', type=str, default=os.environ.get('ADMIN_TOKEN'))
+    parser.add_argument('--block', type=str, default=None, help='Only this block hash (prefix)')
+    parser.add_argument('--last', type=int, default=None, help='Only the last N blocks')
+    parser.add_argument('--spans', action='store_true', help='Include raw spans in the JSON output')
+    parser.add_argument('-o', '--output', type=str, default=None, help='Write timelines and summary as JSON')
+    args = parser.parse_args()
+
+    if not args.dir and not args.node:
+        parser.error('give at least one --dir or --node')
+
+    spans: List[Dict[str, Any]] = []
+    for directory in args.dir:
+        spans.extend(load_spans(directory))
+    for node in args.node:
+        spans.extend(fetch_spans(node, args.admin_token))
+
+    timelines = build_timelines(spans, include_spans=args.spans)
+    if args.block:
+        timelines = [timeline for timeline in timelines if timeline['trace_id'].startswith(args.block)]
+    if args.last:
+        timelines = timelines[-args.last:]
+    summary = summarize(timelines)
+
+    print_report(timelines, summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'summary': summary, 'blocks': timelines}, f, indent=2)
+        print(f"\nTimelines written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
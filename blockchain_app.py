@@ -1,7 +1,9 @@
 import os
 import argparse
 from uuid import uuid4
-from api.node_api import app, blockchain, node_identifier # node_api से Flask app और blockchain ऑब्जेक्ट को इंपोर्ट करें
+from api.node_api import app, blockchain, node_identifier, STARTUP # node_api से Flask app और बैकग्राउंड स्टार्टअप को इंपोर्ट करें
+from core.tracing import default_node_name
+from core.snapshot import snapshot_sync_enabled
 
 # ----------------------------------------------------
 # 1. कॉन्फ़िगरेशन और तर्क (Configuration & Arguments)
@@ -28,33 +30,31 @@ def run_node():
         help='A list of initial peer node URLs to connect to (e.g., http://localhost:5001)'
     )
 
+    # पूरी चेन रीप्ले करने की जगह पीयर के स्टेट स्नैपशॉट से शुरू करें (हिस्ट्री बैकग्राउंड में आती है)
+    parser.add_argument(
+        '--snapshot-sync',
+        action='store_true',
+        help='Bootstrap from a peer state snapshot and backfill full history in the background'
+    )
+
     args = parser.parse_args()
     port = args.port
+    # ट्रेस में यह नोड <host>:<port> के नाम से (start_nodes.sh PORT सेट नहीं करता)
+    blockchain.tracer.node = default_node_name(port)
     
     print("--------------------------------------------------")
     print("       🚀 MyCoin Blockchain Node Initializing      ")
     print("--------------------------------------------------")
     print(f"Node ID: {node_identifier}")
-    print(f"Initial Difficulty: {blockchain.difficulty}")
-    print(f"Genesis Block Index: {blockchain.last_block['index']}")
-    
-    # 2. शुरुआती नोड्स को रजिस्टर करें
-    if args.connect:
-        print("\nConnecting to peer nodes...")
-        for peer in args.connect:
-            if peer.strip() and not peer.endswith(f":{port}"): # खुद से कनेक्ट न करें
-                blockchain.register_node(peer.strip())
-                print(f"  -> Registered: {peer.strip()}")
-        
-        # कनेक्ट होने के बाद सर्वसम्मति से चेन सिंक करें
-        print("\nAttempting Consensus...")
-        replaced = blockchain.resolve_conflicts()
-        if replaced:
-            print("Chain successfully synchronized with the network.")
-            blockchain.balance_manager.recalculate_balances() # चेन बदलने के बाद बैलेंस अपडेट करें
-        else:
-            print("Local chain is authoritative.")
 
+    # 2. शुरुआती नोड्स: चेन लोड होने के बाद बैकग्राउंड में रजिस्टर + सिंक (पोर्ट तुरंत बँधता है)
+    if args.connect:
+        peers = [peer.strip() for peer in args.connect
+                 if peer.strip() and not peer.strip().endswith(f":{port}")] # खुद से कनेक्ट न करें
+        for peer in peers:
+            print(f"  -> Will connect to: {peer}")
+        STARTUP.connect(peers, args.snapshot_sync or snapshot_sync_enabled())
+    print("Chain state loads and syncs in the background; check /ready for progress.")
 
     # 3. Flask App चलाएँ
     print(f"\nStarting API server on port: {port}...")
@@ -0,0 +1,118 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.metrics import REGISTRY
+from wallet.balance_manager import has_sufficient_funds
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स (Global Constants)
+# ----------------------------------------------------
+
+# एक ब्लॉक में अधिकतम ट्रांजैक्शन (कॉइनबेस को छोड़कर)
+MAX_BLOCK_TRANSACTIONS = 2000
+# ब्लॉक के ट्रांजैक्शन्स का अधिकतम JSON आकार (बाइट्स में, कॉइनबेस को छोड़कर)
+MAX_BLOCK_BYTES = 1_000_000
+
+TEMPLATE_REBUILDS = REGISTRY.counter('mycoin_block_template_rebuilds_total',
+                                     'Full block template rebuilds (new tip or mempool replaced)')
+TEMPLATE_TRANSACTIONS = REGISTRY.gauge('mycoin_block_template_transactions',
+                                       'Transactions selected for the next block')
+TEMPLATE_BYTES = REGISTRY.gauge('mycoin_block_template_bytes', 'JSON size of the transactions selected for the next block')
+
+
+def transaction_size(transaction: Dict[str, Any]) -> int:
+    """ ट्रांजैक्शन का आकार, उसी JSON रूप में जिसमें वह ब्लॉक हैश में जाता है """
+    return len(json.dumps(transaction, sort_keys=True))
+
+
+def split_fundable(pool: List[Dict[str, Any]], balance_manager) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    पूल को (फ़ंड वाले, बिना फ़ंड वाले) में बाँटता है: FIFO क्रम में हर sender का कुल खर्च उसके पुष्ट
+    बैलेंस तक। टिप बदलने पर (प्रतिस्पर्धी खर्च वाला ब्लॉक, reorg) बिना फ़ंड वाले कभी ब्लॉक में नहीं जा
+    सकते, इसलिए उन्हें पूल से हटाया जाता है — वरना वे हर टेम्पलेट में दोबारा स्कैन होते।
+    """
+    spend: Dict[str, float] = {}
+    fundable: List[Dict[str, Any]] = []
+    unfundable: List[Dict[str, Any]] = []
+    for transaction in pool:
+        sender = transaction['sender']
+        total = spend.get(sender, 0.0) + transaction['amount']
+        if has_sufficient_funds(balance_manager, sender, total):
+            spend[sender] = total
+            fundable.append(transaction)
+        else:
+            unfundable.append(transaction)
+    return fundable, unfundable
+
+
+# ----------------------------------------------------
+# 1. ब्लॉक टेम्पलेट बिल्डर
+# ----------------------------------------------------
+
+class BlockTemplateBuilder:
+    """
+    अगले ब्लॉक के लिए मेमोरी पूल से ट्रांजैक्शन चुनता है और परिणाम कैश रखता है।
+
+    - प्राथमिकता: पहले आया, पहले चुना गया (FIFO)। इस चेन में फ़ीस नहीं है, इसलिए सबसे पुराने
+      ट्रांजैक्शन को सबसे पहले जगह मिलती है और कोई ट्रांजैक्शन हमेशा के लिए पीछे नहीं छूटता।
+    - सीमाएँ: `max_transactions` और `max_bytes`; जो फ़िट न हो वह पूल में अगले ब्लॉक के लिए रहता है।
+    - बैलेंस: हर sender का कुल खर्च उसके पुष्ट (confirmed) बैलेंस से अधिक नहीं हो सकता। टिप बदलने पर
+      Blockchain बिना फ़ंड वाले ट्रांजैक्शन पूल से हटा देता है (split_fundable)।
+
+    मेमोरी पूल में नए ट्रांजैक्शन केवल अंत में जुड़ते हैं, इसलिए बिल्डर केवल नए हिस्से को
+    स्कैन करता है। नई टिप (नया ब्लॉक / reorg) या पूल लिस्ट बदलने पर ही पूरा टेम्पलेट दोबारा बनता है।
+    """
+    def __init__(self, blockchain, max_transactions: int = MAX_BLOCK_TRANSACTIONS, max_bytes: int = MAX_BLOCK_BYTES):
+        self.blockchain = blockchain
+        self.max_transactions = max_transactions
+        self.max_bytes = max_bytes
+        self._tip: Optional[Dict[str, Any]] = None
+        self._pool: Optional[List[Dict[str, Any]]] = None
+        self._scanned = 0
+        self._selected: List[Dict[str, Any]] = []
+        self._bytes = 0
+        self._spend: Dict[str, float] = {}
+
+    def _reset(self, tip: Optional[Dict[str, Any]], pool: List[Dict[str, Any]]):
+        self._tip = tip
+        self._pool = pool
+        self._scanned = 0
+        self._selected = []
+        self._bytes = 0
+        self._spend = {}
+        TEMPLATE_REBUILDS.inc()
+
+    def _is_full(self) -> bool:
+        return len(self._selected) >= self.max_transactions or self._bytes >= self.max_bytes
+
+    def transactions(self) -> List[Dict[str, Any]]:
+        """ अगले ब्लॉक के लिए चुने गए ट्रांजैक्शन (क्रम में), आवश्यकता होने पर अपडेट करके """
+        chain = self.blockchain.chain
+        pool = self.blockchain.current_transactions
+        tip = chain[-1] if chain else None
+
+        if tip is not self._tip or pool is not self._pool or len(pool) < self._scanned:
+            self._reset(tip, pool)
+
+        balance_manager = self.blockchain.balance_manager
+        while self._scanned < len(pool) and not self._is_full():
+            transaction = pool[self._scanned]
+            self._scanned += 1
+
+            size = transaction_size(transaction)
+            if self._bytes + size > self.max_bytes:
+                # छोटे बाद वाले ट्रांजैक्शन अभी भी फ़िट हो सकते हैं
+                continue
+
+            sender = transaction['sender']
+            total = self._spend.get(sender, 0.0) + transaction['amount']
+            if not has_sufficient_funds(balance_manager, sender, total):
+                continue
+
+            self._spend[sender] = total
+            self._selected.append(transaction)
+            self._bytes += size
+
+        TEMPLATE_TRANSACTIONS.set(len(self._selected))
+        TEMPLATE_BYTES.set(self._bytes)
+        return list(self._selected)
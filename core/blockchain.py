@@ -1,18 +1,32 @@
 import hashlib
 import json
-from time import time
+import os
+import threading
+from time import time, perf_counter
 from urllib.parse import urlparse
-import requests 
 from typing import Set, Dict, Any, List, Optional ,Tuple
 # pycryptodome से SHA256 का उपयोग (इंस्टॉल करना आवश्यक है)
 from Crypto.Hash import SHA256 
 
 # स्थानीय मॉड्यूल से इंपोर्ट करें (Local Module Imports)
-from .cryptos import verify_signature 
-from wallet.balance_manager import BalanceManager, has_sufficient_funds 
-from utils.data_storage import save_blockchain, load_blockchain, load_blockchain_data 
+from .cryptos import verify_signature, verify_signatures_batch, transaction_id 
+from wallet.balance_manager import BalanceManager, has_sufficient_funds
+from wallet.ledger import replay_balances
+from utils.data_storage import save_blockchain, load_blockchain 
 # P2P नेटवर्क मॉड्यूल
-from .p2p_network import broadcast_transaction, broadcast_new_block 
+from .p2p_network import HttpTransport 
+# इन्वेंटरी गॉसिप का seen-set और घोषित बॉडीज़ का कैश
+from .gossip import Gossip
+# ब्लॉक प्रसार ट्रेसिंग (प्रति-ब्लॉक स्पैन: receive, validate, apply, persist, forward)
+from .tracing import BlockTracer
+# नए ब्लॉक / reorg / मेमोरी पूल इवेंट्स (/events स्ट्रीम के लिए)
+from .events import EventBus, block_summary, transaction_summary
+# अगले ब्लॉक के ट्रांजैक्शन चुनने के लिए (आकार/संख्या सीमा के साथ)
+from .block_template import BlockTemplateBuilder, MAX_BLOCK_TRANSACTIONS, MAX_BLOCK_BYTES, transaction_size, split_fundable
+# पाठकों के लिए अपरिवर्तनीय, वर्ज़न वाला स्टेट स्नैपशॉट
+from .chain_view import ChainView, frozen_mapping
+from utils.metrics import REGISTRY
+from utils.profiling import span
 
 
 # ----------------------------------------------------
@@ -23,49 +37,247 @@ BLOCK_GENERATION_INTERVAL = 600
 DIFFICULTY_ADJUSTMENT_INTERVAL = 2016 
 INITIAL_REWARD = 50                 
 HALVING_INTERVAL = 210000             
+# /transactions/batch में एक बार में अधिकतम ट्रांजैक्शन
+MAX_BATCH_TRANSACTIONS = 5000
+# Pruned मोड: इतने नवीनतम ब्लॉक्स की पूरी बॉडी रखी जाती है (PRUNE_DEPTH env, 0 = पूरा आर्काइव)
+# इससे गहरा reorg pruned नोड पर संभव नहीं, इसलिए न्यूनतम सीमा है
+MIN_PRUNE_DEPTH = 100
+# प्रून किए गए ब्लॉक में केवल ये हेडर फ़ील्ड्स (साथ में मूल 'hash' और 'tx_count') रहते हैं
+HEADER_FIELDS = ('index', 'timestamp', 'proof', 'previous_hash', 'miner', 'difficulty')
+
+# ----------------------------------------------------
+# मेट्रिक्स (Metrics) - /metrics एंडपॉइंट पर दिखाए जाते हैं
+# ----------------------------------------------------
+
+POW_SECONDS = REGISTRY.histogram('mycoin_pow_duration_seconds', 'Time spent searching for one proof of work')
+POW_HASHES = REGISTRY.counter('mycoin_pow_hashes_total', 'Hashes tried by proof_of_work')
+POW_HASHRATE = REGISTRY.gauge('mycoin_pow_hashrate', 'Hashes per second of the last proof_of_work search')
+MEMPOOL_TRANSACTIONS = REGISTRY.gauge('mycoin_mempool_transactions', 'Transactions waiting in the memory pool')
+MEMPOOL_BYTES = REGISTRY.gauge('mycoin_mempool_bytes', 'JSON size of the memory pool in bytes')
+MEMPOOL_EVICTIONS = REGISTRY.counter('mycoin_mempool_evictions_total',
+                                     'Pool transactions dropped because the new tip no longer funds them')
+CONSENSUS_ROUNDS = REGISTRY.counter('mycoin_consensus_rounds_total', 'resolve_conflicts outcomes', ('outcome',))
+CONSENSUS_PEER_ERRORS = REGISTRY.counter('mycoin_consensus_peer_errors_total',
+                                         'Peers that could not be fetched or sent an invalid chain', ('reason',))
+
+
+def block_header(block: Dict[str, Any], block_hash: str) -> Dict[str, Any]:
+    """ ब्लॉक का प्रून किया हुआ रूप: ट्रांजैक्शन बॉडी हटाकर केवल हेडर और मूल हैश """
+    header = {field: block[field] for field in HEADER_FIELDS if field in block}
+    header['hash'] = block_hash
+    header['tx_count'] = len(block['transactions'])
+    return header
+
+
+def normalize_node(address: str) -> Optional[str]:
+    """ register_node जैसा नोड पता: 'http://host:port' (प्लेन HTTP), वरना 'host:port' """
+    parsed_url = urlparse(address)
+    # urlparse.netloc केवल 'hostname:port' देता है
+    if parsed_url.netloc and parsed_url.scheme == 'http':
+        # लोकल/प्लेन HTTP नोड्स के लिए स्कीम रखें, वरना P2P कॉल्स 'https://' पर जाएँगी
+        return f'http://{parsed_url.netloc}'
+    if parsed_url.netloc:
+        return parsed_url.netloc
+    if parsed_url.path:
+        # यदि केवल 'example.com' जैसा कुछ दिया गया है
+        return parsed_url.path
+    return None
+
+
+def node_identity(address: str) -> Optional[str]:
+    """ स्कीम के बिना नोड की पहचान ('host:port'), ताकि एक ही पीयर के दो रूप एक गिने जाएँ """
+    node = normalize_node(address)
+    return node[len('http://'):] if node and node.startswith('http://') else node
+
+
+def record_pow(hashes: int, elapsed: float):
+    """ एक PoW खोज के मेट्रिक्स दर्ज करता है """
+    POW_SECONDS.observe(elapsed)
+    POW_HASHES.inc(hashes)
+    if elapsed > 0:
+        POW_HASHRATE.set(hashes / elapsed)
 
 # ----------------------------------------------------
 # 1. ब्लॉकचेन क्लास (The Main Engine)
 # ----------------------------------------------------
 
 class Blockchain:
-    def __init__(self, node_address: str):
+    def __init__(self, node_address: str, transport: Optional[Any] = None, prune_depth: Optional[int] = None,
+                 persist: bool = True, defer_load: bool = False):
+        # एकल लेखक (single writer) का लॉक और पाठकों का व्यू (core/chain_view.py देखें)
+        self.lock = threading.RLock()
+        self._view: Optional[ChainView] = None
+        self._version = 0
+        # डिस्क पर आख़िरी सेव किया गया वर्ज़न (पुराना व्यू नए के ऊपर न लिखा जाए)
+        self._save_lock = threading.Lock()
+        self._saved_version = 0
+        # पीयर्स से बात करने का तरीका (डिफ़ॉल्ट: ब्लॉकिंग HTTP)
+        self.transport = transport or HttpTransport()
+        # देखी गई IDs (दोबारा सत्यापन/प्रसारण नहीं) और पीयर्स की माँग के लिए बॉडीज़
+        self.gossip = Gossip()
+        # हर ब्लॉक के प्रसार स्पैन (core/tracing.py देखें)
+        self.tracer = BlockTracer()
+        # persist=False: डिस्क से न लोड करें, न सेव करें (एक प्रोसेस में कई नोड्स, जैसे सिम्युलेटर)
+        self.persist = persist
+        # इवेंट बस (सब्सक्राइबर्स को नए ब्लॉक और मेमोरी पूल बदलाव भेजने के लिए)
+        self.events = EventBus()
+        # बैलेंस मैनेजर जेनेसिस से पहले बनाएँ ताकि new_block उसे अपडेट कर सके
+        self.balance_manager = BalanceManager(self)
+        # अगले ब्लॉक का कैश्ड टेम्पलेट
+        self.block_template = BlockTemplateBuilder(self)
+        # मेमोरी पूल के ट्रांजैक्शन IDs (डुप्लिकेट की सस्ती जाँच के लिए)
+        self.mempool_ids: Set[str] = set()
+        # टिप बदलने पर हटे (बिना फ़ंड वाले) ट्रांजैक्शन IDs, लॉक के बाहर इवेंट भेजने तक
+        self._evicted_ids: List[str] = []
+
+        # Pruned मोड: pruned_height तक के ब्लॉक्स केवल हेडर हैं, उनका असर balance_snapshot में है
+        if prune_depth is None and 'PRUNE_DEPTH' in os.environ:
+            prune_depth = int(os.environ['PRUNE_DEPTH'])
+        if prune_depth is not None and 0 < prune_depth < MIN_PRUNE_DEPTH:
+            print(f"WARNING: PRUNE_DEPTH {prune_depth} is below the minimum, using {MIN_PRUNE_DEPTH}")
+            prune_depth = MIN_PRUNE_DEPTH
+        self.prune_depth: int = prune_depth or 0
+        self.pruned_height: int = 0
+        self.balance_snapshot: Dict[str, float] = {}
+
+        # Pruned सेटिंग स्पष्ट दी गई थी या नहीं (नहीं तो सेव की गई गहराई अपनाएँ)
+        self._prune_depth_configured = prune_depth is not None
+
+        # लोड होने तक खाली स्टेट (व्यू पहली बार load_state() के अंत में प्रकाशित होता है)
+        self.chain: List[Dict[str, Any]] = []
+        # मेमोरी पूल; हर sender का लंबित (पूल में) खर्च साथ में (current_transactions सेटर देखें)
+        self.current_transactions: List[Dict[str, Any]] = []
+        self.nodes: Set[str] = set()
+        self.node_address: str = node_address
+        self.difficulty: int = 4
+
+        # defer_load=True: डिस्क पढ़ना और बैलेंस रीप्ले बाद में (बैकग्राउंड में) load_state() से
+        if not defer_load:
+            self.load_state()
+
+        # मेमोरी पूल गेज केवल स्क्रेप के समय गिने जाते हैं (हॉट पाथ पर कोई खर्च नहीं)
+        MEMPOOL_TRANSACTIONS.set_function(lambda: len(self.view.transactions) if self.view else 0)
+        MEMPOOL_BYTES.set_function(
+            lambda: sum(len(json.dumps(tx)) for tx in self.view.transactions) if self.view else 0)
+
+    def load_state(self):
+        """
+        डिस्क से चेन लोड करता है (न मिले तो जेनेसिस ब्लॉक बनाता है), बैलेंस रीप्ले करता है
+        और पहला व्यू प्रकाशित करता है। लंबी चेन पर यह धीमा है, इसलिए नोड इसे बैकग्राउंड में चलाते हैं।
+        """
         # 1. डेटा लोड करने का प्रयास करें (Persistence)
-        loaded_data = load_blockchain()
+        loaded_data = load_blockchain() if self.persist else None
 
         if loaded_data:
-            self.chain: List[Dict[str, Any]] = loaded_data['chain']
-            self.difficulty: int = loaded_data['difficulty']
-            self.nodes: Set[str] = loaded_data['nodes']
-            self.current_transactions: List[Dict[str, Any]] = []
-            self.node_address: str = node_address
-            
+            with self.lock:
+                self.chain = loaded_data['chain']
+                self.difficulty = loaded_data['difficulty']
+                # लोड से पहले जोड़े गए पीयर्स भी रखें
+                self.nodes = loaded_data['nodes'] | self.nodes
+                pruned = loaded_data.get('pruned')
+                if pruned:
+                    self.pruned_height = pruned['height']
+                    self.balance_snapshot = pruned['balances']
+                    if not self._prune_depth_configured:
+                        # कोई सेटिंग न दी गई हो तो पहले वाली गहराई पर प्रून करते रहें
+                        self.prune_depth = pruned.get('depth', 0)
+
             print(f"Loaded Chain: {len(self.chain)} blocks, Difficulty: {self.difficulty}")
         else:
             # 2. यदि लोड नहीं होता है, तो जेनेसिस ब्लॉक से शुरू करें
-            self.chain = []              
-            self.current_transactions = []
-            self.nodes = set()           
-            self.node_address = node_address 
-            self.difficulty = 4          
+            self.new_block(proof=100, previous_hash='1', miner_address=self.node_address)
 
-            if not self.chain:
-                self.new_block(proof=100, previous_hash='1', miner_address=node_address)
+        # बैलेंस की गणना यहाँ करें
+        with self.lock:
+            self.balance_manager.recalculate_balances()
+            pruned = self.prune()
+            self.publish_view()
+        if pruned:
+            self.save()
 
-        # बैलेंस मैनेजर को यहाँ शुरू करें
-        self.balance_manager = BalanceManager(self) 
-        self.balance_manager.recalculate_balances() 
+    # ------------------------------------------------
+    # पाठकों के लिए स्टेट स्नैपशॉट (Reader Snapshots)
+    # ------------------------------------------------
+    @property
+    def view(self) -> ChainView:
+        """ नवीनतम प्रकाशित स्टेट (बिना लॉक के पढ़ें; माइनिंग या सर्वसम्मति का इंतज़ार नहीं) """
+        return self._view
+
+    def publish_view(self, chain_changed: bool = True, pool_changed: bool = True):
+        """
+        `self.lock` के अंदर, हर बदलाव के अंत में: नया ChainView बनाकर एक असाइनमेंट में प्रकाशित करता है।
+        जो हिस्सा नहीं बदला वह पिछले व्यू से साझा होता है (copy-on-write)।
+        """
+        old = self._view
+        if old is None:
+            chain_changed = pool_changed = True
+        self._version += 1
+        self._view = ChainView(
+            version=self._version,
+            chain=tuple(self.chain) if chain_changed else old.chain,
+            transactions=tuple(self.current_transactions) if pool_changed else old.transactions,
+            balances=self.balance_manager.balances if chain_changed else old.balances,
+            difficulty=self.difficulty,
+            nodes=frozenset(self.nodes),
+            pruned_height=self.pruned_height,
+            balance_snapshot=frozen_mapping(self.balance_snapshot) if chain_changed else old.balance_snapshot,
+            tip_hash=(self.hash(self.chain[-1]) if self.chain else '') if chain_changed else old.tip_hash,
+        )
+
+    @property
+    def tip_key(self) -> str:
+        """ प्रकाशित चेन की पहचान (रिस्पॉन्स कैश के लिए; पूरा व्यू कॉपी किए बिना) """
+        return self.view.tip_key
+
+    def get_balance(self, address: str) -> float:
+        """ पाठकों के लिए: प्रकाशित व्यू से बैलेंस (लेखक के बीच के बदलाव कभी नहीं दिखते) """
+        return self.view.get_balance(address)
 
 
     # ------------------------------------------------
     # A. नया ब्लॉक बनाना और जोड़ना
     # ------------------------------------------------
-    def new_block(self, proof: int, previous_hash: str, miner_address: str) -> Dict[str, Any]:
+    def new_block(self, proof: int, previous_hash: str, miner_address: str) -> Optional[Dict[str, Any]]:
         """
         एक नया ब्लॉक बनाता है, रिवॉर्ड जोड़ता है, चेन में जोड़ता है, डिस्क पर सेव करता है, 
         और नेटवर्क पर प्रसारित करता है।
+        ब्लॉक में केवल टेम्पलेट के ट्रांजैक्शन जाते हैं (MAX_BLOCK_TRANSACTIONS / MAX_BLOCK_BYTES तक);
+        बाकी मेमोरी पूल में अगले ब्लॉक्स के लिए रहते हैं।
+        PoW लॉक के बाहर होता है; यदि इस बीच टिप बदल गई हो (previous_hash पुराना है) तो None
+        रिटर्न होता है और कॉलर को नई टिप पर दोबारा माइन करना चाहिए।
         """
+        # PoW यहाँ पूरा हो चुका है: ब्लॉक की प्रसार टाइमलाइन यहीं से शुरू होती है
+        created_at = self.tracer.clock()
+        with self.lock:
+            if self.chain and previous_hash != self.hash(self.last_block):
+                return None
+            block, mined_ids = self._append_new_block(proof, previous_hash, miner_address)
+
+        # इवेंट्स: नया ब्लॉक और पूल से निकले ट्रांजैक्शन
+        block_hash = self.hash(block)
+        # जेनेसिस हर नोड का अपना है और कहीं प्रसारित नहीं होता: उसका ट्रेस नहीं
+        trace_id = block_hash if block['index'] > 1 else None
+        if trace_id:
+            self.tracer.begin(trace_id, block['index'], created_at=created_at)
+        self.tracer.record(trace_id, 'apply', created_at)
+        self.gossip.remember(block_hash, block)
+        self.events.publish('block', block_summary(block, block_hash))
+        if mined_ids:
+            self.events.publish('mempool_remove', {'ids': mined_ids, 'reason': 'mined'})
+        self._publish_evictions()
         
+        # 1. डेटा सेव करें
+        with span('persist'), self.tracer.span(trace_id, 'persist'):
+            self.save()
+            
+        # 2. P2P प्रसारण (पीयर लिस्ट प्रकाशित व्यू से)
+        with span('broadcast_block'):
+            self.transport.broadcast_new_block(self, block)
+            
+        return block
+
+    def _append_new_block(self, proof: int, previous_hash: str, miner_address: str) -> Tuple[Dict[str, Any], List[str]]:
+        """ लॉक के अंदर: टेम्पलेट से ब्लॉक बनाकर चेन में जोड़ता है। रिटर्न: (ब्लॉक, पूल से निकले IDs) """
         reward_amount = self.get_mining_reward(len(self.chain) + 1)
         
         # Coinbase Transaction
@@ -76,7 +288,8 @@ class Blockchain:
             'signature': 'GENESIS_SIG'
         }
         
-        transactions_to_include = [coinbase_tx] + self.current_transactions
+        selected = self.block_template.transactions()
+        transactions_to_include = [coinbase_tx] + selected
 
         block = {
             'index': len(self.chain) + 1,
@@ -88,73 +301,267 @@ class Blockchain:
             'difficulty': self.difficulty, 
         }
 
-        self.current_transactions = []
+        included = {id(tx) for tx in selected}
+        self.current_transactions = [tx for tx in self.current_transactions if id(tx) not in included]
+        mined_ids = [transaction_id(tx) for tx in selected]
+        self.mempool_ids.difference_update(mined_ids)
         self.chain.append(block)
-        
-        # 1. डेटा सेव करें
-        save_blockchain(self.chain, self.difficulty, self.nodes)
-        
-        # 2. कठिनाई समायोजित करें
+        self.balance_manager.apply_block(block)
+        self.prune()
+        self._evict_unfundable()
+
+        # कठिनाई समायोजित करें
         if block['index'] % DIFFICULTY_ADJUSTMENT_INTERVAL == 0:
             self.adjust_difficulty()
-            
-        # 3. P2P प्रसारण (यह फ़ंक्शन अब Gunicorn वर्कर को बायपास करने के लिए `load_blockchain_data` का उपयोग करता है)
-        broadcast_new_block(self, block)
-            
-        return block
+
+        self.publish_view()
+        return block, mined_ids
+
+    def _evict_unfundable(self):
+        """ लॉक के अंदर, टिप बदलने के बाद: पूल से वे ट्रांजैक्शन हटाएँ जिनका अब फ़ंड नहीं """
+        fundable, unfundable = split_fundable(self.current_transactions, self.balance_manager)
+        if not unfundable:
+            return
+        self.current_transactions = fundable
+        evicted_ids = [transaction_id(tx) for tx in unfundable]
+        self.mempool_ids.difference_update(evicted_ids)
+        self._evicted_ids.extend(evicted_ids)
+        MEMPOOL_EVICTIONS.inc(len(evicted_ids))
+
+    def _publish_evictions(self):
+        """ लॉक के बाहर: हटाए गए ट्रांजैक्शन का mempool_remove इवेंट """
+        with self.lock:
+            evicted_ids, self._evicted_ids = self._evicted_ids, []
+        if evicted_ids:
+            print(f"INFO: Evicted {len(evicted_ids)} unfundable transactions from the memory pool")
+            self.events.publish('mempool_remove', {'ids': evicted_ids, 'reason': 'unfundable'})
 
     # ------------------------------------------------
     # B. ट्रांजैक्शन जोड़ना (सिग्नेचर, बैलेंस चेक और प्रसारण के साथ)
     # ------------------------------------------------
-    def new_transaction(self, sender: str, recipient: str, amount: float, signature: str) -> Tuple[Optional[int], str]:
-        """ मेमोरी पूल में एक नया ट्रांजैक्शन जोड़ता है और नेटवर्क पर प्रसारित करता है। """
-        
+    @property
+    def current_transactions(self) -> List[Dict[str, Any]]:
+        return self._pool
+
+    @current_transactions.setter
+    def current_transactions(self, transactions: List[Dict[str, Any]]):
+        # पूल बदला (माइन, पुष्टि, reorg, eviction): हर sender का लंबित खर्च दोबारा गिनें
+        self._pool = transactions
+        self._pool_spend: Dict[str, float] = {}
+        for transaction in transactions:
+            sender = transaction['sender']
+            self._pool_spend[sender] = self._pool_spend.get(sender, 0.0) + transaction['amount']
+
+    def _add_to_pool(self, transaction: Dict[str, Any], tx_id: str):
+        """ लॉक के अंदर: पूल के अंत में जोड़ें (बिल्डर केवल नया हिस्सा स्कैन करता है) """
+        self._pool.append(transaction)
+        sender = transaction['sender']
+        self._pool_spend[sender] = self._pool_spend.get(sender, 0.0) + transaction['amount']
+        self.mempool_ids.add(tx_id)
+
+    def _pool_error(self, tx_id: str, sender: str, amount: float) -> Optional[str]:
+        """
+        स्टेट पर निर्भर जाँचें (डुप्लिकेट, बैलेंस)। बैलेंस = पुष्ट बैलेंस में से पूल में पहले से लंबित
+        खर्च घटाकर, ताकि /transactions/new और /transactions/batch दोनों पूल को ओवरस्पेंड न करने दें।
+        """
+        if tx_id in self.mempool_ids:
+            return "Error: Duplicate transaction."
+        if not has_sufficient_funds(self.balance_manager, sender, self._pool_spend.get(sender, 0.0) + amount):
+            return "Error: Insufficient funds. Transaction rejected."
+        return None
+
+    def precheck_transaction(self, sender: str, recipient: str, amount: float, signature: str) -> Optional[str]:
+        """
+        हस्ताक्षर जाँच से पहले की सस्ती जाँचें (COINBASE, राशि, डुप्लिकेट, बैलेंस)।
+        रिटर्न: त्रुटि संदेश, या None यदि ट्रांजैक्शन आगे जाँचने लायक है।
+        """
         if sender == "SYSTEM_COINBASE":
-            return False, "Error: Cannot manually create a SYSTEM_COINBASE transaction."
+            return "Error: Cannot manually create a SYSTEM_COINBASE transaction."
+        if not isinstance(amount, (int, float)) or isinstance(amount, bool) or amount <= 0:
+            return "Error: Amount must be a positive number."
+
+        tx_id = transaction_id({'sender': sender, 'recipient': recipient, 'amount': amount, 'signature': signature})
+        if self.gossip.skip_seen('tx', tx_id):
+            return "Error: Duplicate transaction."
+        return self._pool_error(tx_id, sender, amount)
+
+    def new_transaction(self, sender: str, recipient: str, amount: float, signature: str,
+                        prechecked: bool = False) -> Tuple[Optional[int], str]:
+        """
+        मेमोरी पूल में एक नया ट्रांजैक्शन जोड़ता है और नेटवर्क पर प्रसारित करता है।
+        prechecked=True: कॉलर (HTTP रूट, कतार से पहले) precheck_transaction चला चुका है।
+        """
         
-        # 1. सुरक्षा जाँच
-        is_valid_sig = verify_signature(sender, signature, sender, recipient, amount)
+        # 1. सस्ती जाँचें पहले (डुप्लिकेट, बैलेंस)
+        if not prechecked:
+            error = self.precheck_transaction(sender, recipient, amount, signature)
+            if error:
+                return False, error
+        
+        # 2. सुरक्षा जाँच (महँगी, लॉक के बाहर)
+        with span('verify_signature'):
+            is_valid_sig = verify_signature(sender, signature, sender, recipient, amount)
         if not is_valid_sig:
+            # गलत हस्ताक्षर कभी सही नहीं होगा: दोबारा आने पर जाँचें नहीं
+            self.gossip.seen.add(transaction_id({'sender': sender, 'recipient': recipient, 'amount': amount,
+                                                 'signature': signature}))
             return False, "Error: Invalid digital signature. Transaction rejected."
-        
-        # 2. बैलेंस जाँच 
-        if not has_sufficient_funds(self.balance_manager, sender, amount):
-            return False, "Error: Insufficient funds. Transaction rejected."
 
-        # 3. ट्रांजैक्शन को पूल में जोड़ें
+        # 3. ट्रांजैक्शन को पूल में जोड़ें (हस्ताक्षर जाँच के दौरान स्टेट बदल सकती है, इसलिए दोबारा जाँचें)
         transaction = {
             'sender': sender,
             'recipient': recipient,
             'amount': amount,
             'signature': signature 
         }
+        tx_id = transaction_id(transaction)
         
-        self.current_transactions.append(transaction)
+        with self.lock:
+            # हस्ताक्षर जाँच के दौरान पूल/टिप बदल सकती है: केवल स्टेट वाली जाँचें दोबारा
+            error = self._pool_error(tx_id, sender, amount)
+            if error:
+                return False, error
+            self._add_to_pool(transaction, tx_id)
+            self.publish_view(chain_changed=False)
+            next_index = self.last_block['index'] + 1
+        self.gossip.remember(tx_id, transaction)
+        self.events.publish('mempool_add', transaction_summary(tx_id, transaction))
         
         # 4. P2P प्रसारण
-        broadcast_transaction(self, transaction)
+        with span('broadcast_transaction'):
+            self.transport.broadcast_transaction(self, transaction)
         
-        return self.last_block['index'] + 1, "Transaction added to pool"
+        return next_index, "Transaction added to pool"
+
+    def new_transactions_batch(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        कई ट्रांजैक्शन को एक साथ मेमोरी पूल में जोड़ता है और हर ट्रांजैक्शन का परिणाम रिटर्न करता है।
+
+        1. सस्ती जाँचें पहले (फ़ील्ड्स, राशि, COINBASE, डुप्लिकेट)
+        2. सभी हस्ताक्षर एक साथ जाँचें (हर sender की की केवल एक बार इंपोर्ट)
+        3. मेमोरी पूल (बैच के पहले स्वीकृत सहित) में हर sender का कुल खर्च गिनकर बैलेंस जाँच
+        4. सभी स्वीकृत ट्रांजैक्शन को एक ही गॉसिप संदेश में प्रसारित करें
+        """
+        results: List[Dict[str, Any]] = []
+        candidates: List[Tuple[int, Dict[str, Any]]] = []
+        with self.lock:
+            seen_ids = set(self.mempool_ids)
+
+        # 1. सस्ती जाँचें
+        for position, values in enumerate(transactions):
+            result = {'index': position, 'accepted': False}
+            results.append(result)
+
+            if not isinstance(values, dict) or not all(k in values for k in ('sender', 'recipient', 'amount', 'signature')):
+                result['message'] = "Error: Missing required values: sender, recipient, amount, signature"
+                continue
+            if values['sender'] == "SYSTEM_COINBASE":
+                result['message'] = "Error: Cannot manually create a SYSTEM_COINBASE transaction."
+                continue
+            if not isinstance(values['amount'], (int, float)) or isinstance(values['amount'], bool) or values['amount'] <= 0:
+                result['message'] = "Error: Amount must be a positive number."
+                continue
+
+            transaction = {
+                'sender': values['sender'],
+                'recipient': values['recipient'],
+                'amount': values['amount'],
+                'signature': values['signature']
+            }
+            tx_id = transaction_id(transaction)
+            result['id'] = tx_id
+            if tx_id in seen_ids or self.gossip.skip_seen('tx', tx_id):
+                result['message'] = "Error: Duplicate transaction."
+                continue
+            seen_ids.add(tx_id)
+            candidates.append((position, transaction))
+
+        # 2. हस्ताक्षर जाँच
+        with span('verify_signature'):
+            signatures_ok = verify_signatures_batch([tx for _, tx in candidates])
+
+        # 3. बैलेंस जाँच (लॉक के अंदर, ताकि इस बीच आए ट्रांजैक्शन/ब्लॉक्स भी गिने जाएँ)।
+        # स्वीकृत ट्रांजैक्शन तुरंत पूल में जाता है, इसलिए बैच के अगले ट्रांजैक्शन उसका खर्च भी गिनते हैं।
+        accepted: List[Dict[str, Any]] = []
+        with self.lock:
+            for (position, transaction), is_valid_sig in zip(candidates, signatures_ok):
+                result = results[position]
+                if not is_valid_sig:
+                    self.gossip.seen.add(result['id'])
+                    result['message'] = "Error: Invalid digital signature. Transaction rejected."
+                    continue
+                error = self._pool_error(result['id'], transaction['sender'], transaction['amount'])
+                if error:
+                    result['message'] = error
+                    continue
+
+                self._add_to_pool(transaction, result['id'])
+                accepted.append(transaction)
+                result['accepted'] = True
+                result['message'] = "Transaction added to pool"
+
+            if accepted:
+                self.publish_view(chain_changed=False)
+
+        for position, transaction in candidates:
+            if results[position]['accepted']:
+                self.gossip.remember(results[position]['id'], transaction)
+                self.events.publish('mempool_add', transaction_summary(results[position]['id'], transaction))
+
+        # 4. P2P प्रसारण (एक संदेश प्रति पीयर)
+        with span('broadcast_transaction'):
+            self.transport.broadcast_transactions(self, accepted)
+
+        return results
 
     # ------------------------------------------------
     # C. हैशिंग और PoW लॉजिक
     # ------------------------------------------------
     @staticmethod
     def hash(block: Dict[str, Any]) -> str:
-        """किसी ब्लॉक का SHA-256 हैश बनाता है"""
-        block_copy = block.copy()
-        if 'transactions' in block_copy:
-            block_copy['transactions'] = sorted(block_copy['transactions'], key=lambda x: json.dumps(x, sort_keys=True))
-        
-        block_string = json.dumps(block_copy, sort_keys=True).encode()
-        return SHA256.new(block_string).hexdigest()
+        """किसी ब्लॉक का SHA-256 हैश बनाता है (प्रून किए गए हेडर का मूल हैश उसी में रखा होता है)"""
+        if 'transactions' not in block and 'hash' in block:
+            return block['hash']
+        with span('hash'):
+            block_copy = block.copy()
+            if 'transactions' in block_copy:
+                block_copy['transactions'] = sorted(block_copy['transactions'], key=lambda x: json.dumps(x, sort_keys=True))
+            
+            block_string = json.dumps(block_copy, sort_keys=True).encode()
+            return SHA256.new(block_string).hexdigest()
+
+    def mining_target(self) -> Tuple[Dict[str, Any], int]:
+        """ अगले ब्लॉक के लिए (टिप ब्लॉक, कठिनाई), दोनों एक ही प्रकाशित व्यू से """
+        view = self.view
+        return view.last_block, view.difficulty
+
+    # साझा-स्टेट मोड में BlockchainProxy इन्हें छोटी IPC कॉल्स से देता है (पूरा व्यू पिकल किए बिना)
+    def peer_nodes(self) -> Set[str]:
+        return self.view.nodes
+
+    def chain_length(self) -> int:
+        return self.view.length
+
+    def chain_slice(self, start: int, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        return list(self.view.chain[start:stop])
 
-    def proof_of_work(self, last_block: Dict[str, Any]) -> int:
+    def proof_of_work(self, last_block: Dict[str, Any], difficulty: Optional[int] = None) -> int:
+        start = perf_counter()
         last_hash = self.hash(last_block)
+        if difficulty is None:
+            difficulty = self.view.difficulty
+        with span('pow_loop'):
+            proof = self.search_proof(last_hash, difficulty)
+        
+        record_pow(proof + 1, perf_counter() - start)
+        return proof
+
+    @staticmethod
+    def search_proof(last_hash: str, difficulty: int) -> int:
+        """ PoW लूप: पहला प्रूफ खोजता है जिसका हैश `difficulty` शून्यों से शुरू हो (प्रोसेस पूल में भी चल सकता है) """
         proof = 0
-        while not self.valid_proof(last_hash, proof, self.difficulty):
+        while not Blockchain.valid_proof(last_hash, proof, difficulty):
             proof += 1
-        
         return proof
 
     @staticmethod
@@ -197,6 +604,10 @@ class Blockchain:
     # E. चेन की वैधता जाँच
     # ------------------------------------------------
     def is_valid_chain(self, chain: List[Dict[str, Any]]) -> Tuple[bool, str]:
+        with span('validate_chain'):
+            return self._is_valid_chain(chain)
+
+    def _is_valid_chain(self, chain: List[Dict[str, Any]]) -> Tuple[bool, str]:
         last_block = chain[0]
         current_index = 1
 
@@ -218,74 +629,364 @@ class Blockchain:
 
         return True, "Chain is Valid"
 
+    # ------------------------------------------------
+    # F. पीयर से आया एक ब्लॉक (/blocks/new)
+    # ------------------------------------------------
+    def classify_block(self, block: Dict[str, Any]) -> str:
+        """
+        पीयर के ब्लॉक की सस्ती जाँच, ताकि महँगा काम (हस्ताक्षर / पूरी सर्वसम्मति) केवल ज़रूरत पर हो:
+            'invalid'     -> फ़ील्ड्स ग़ायब/गलत
+            'known'       -> यह ब्लॉक हमारे पास पहले से है
+            'stale'       -> हमारी चेन इस ऊँचाई तक पहले से लंबी है (दूसरी शाखा का पुराना ब्लॉक)
+            'extends_tip' -> सीधे हमारी टिप पर जुड़ता है (केवल यही ब्लॉक जाँचना है)
+            'ahead'       -> हम पीछे हैं या किसी फ़ोर्क पर हैं (सर्वसम्मति चाहिए)
+        बिना लॉक के, प्रकाशित व्यू पर चलता है।
+        """
+        return self._classify_block(block, self.view.chain)
+
+    def _classify_block(self, block: Dict[str, Any], chain) -> str:
+        if not isinstance(block, dict) or not all(k in block for k in ('index', 'previous_hash', 'proof', 'transactions')):
+            return 'invalid'
+        index = block['index']
+        if not isinstance(index, int) or isinstance(index, bool) or index < 1 or not isinstance(block['transactions'], list):
+            return 'invalid'
+
+        if index <= len(chain):
+            return 'known' if self.hash(chain[index - 1]) == self.hash(block) else 'stale'
+        if index == len(chain) + 1 and block['previous_hash'] == self.hash(chain[-1]):
+            return 'extends_tip'
+        return 'ahead'
+
+    def add_block(self, block: Dict[str, Any], trace: Optional[Dict[str, Any]] = None,
+                  received_at: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        हमारी टिप पर सीधे जुड़ने वाले पीयर ब्लॉक को पूरी सर्वसम्मति के बिना स्वीकार करता है।
+        जाँच का क्रम: PoW और कॉइनबेस (सस्ती) -> सीमाएँ और बैलेंस -> हस्ताक्षर (महँगी)।
+        सारी जाँचें लॉक के बाहर होती हैं; लॉक के अंदर केवल टिप और बैलेंस दोबारा जाँचे जाते हैं।
+        स्वीकृत ब्लॉक आगे के पीयर्स को घोषित होता है (एक बार; seen-set दोहराव रोकता है)।
+        trace = पीयर का ट्रेस संदर्भ, received_at = HTTP अनुरोध आने का समय (core/tracing.py)।
+        """
+        view = self.view
+        if self._classify_block(block, view.chain) != 'extends_tip':
+            return False, "Block does not extend our tip"
+
+        block_hash = self.hash(block)
+        if self.gossip.skip_seen('block', block_hash):
+            self.tracer.receive(block_hash, block['index'], trace, received_at, result='duplicate')
+            return False, "Block already seen"
+        self.tracer.receive(block_hash, block['index'], trace, received_at)
+        with self.tracer.span(block_hash, 'validate') as attrs:
+            error, pending_spend = self._verify_block(block, view)
+            attrs['result'] = error or 'ok'
+        if error:
+            # माता-पिता तय है, इसलिए यह नतीजा स्थायी है: यही ब्लॉक दोबारा न जाँचें
+            self.gossip.seen.add(block_hash)
+            return False, error
+        block_ids = {transaction_id(tx) for tx in block['transactions'][1:]}
+
+        # स्वीकार करें (जाँच के दौरान टिप बदल सकती है)
+        with self.tracer.span(block_hash, 'apply') as attrs, self.lock:
+            if self._classify_block(block, self.chain) != 'extends_tip':
+                attrs['result'] = 'tip_changed'
+                return False, "Block does not extend our tip"
+            for sender, total in pending_spend.items():
+                if not has_sufficient_funds(self.balance_manager, sender, total):
+                    attrs['result'] = 'insufficient_funds'
+                    return False, "Insufficient funds in block transaction"
+
+            self.chain.append(block)
+            self.balance_manager.apply_block(block)
+            self.prune()
+
+            confirmed_ids = block_ids & self.mempool_ids
+            if confirmed_ids:
+                self.current_transactions = [tx for tx in self.current_transactions if transaction_id(tx) not in confirmed_ids]
+                self.mempool_ids.difference_update(confirmed_ids)
+            self._evict_unfundable()
+            if block['index'] % DIFFICULTY_ADJUSTMENT_INTERVAL == 0:
+                self.adjust_difficulty()
+            self.publish_view()
+
+        self.gossip.remember(block_hash, block)
+        self.events.publish('block', block_summary(block, block_hash))
+        if confirmed_ids:
+            self.events.publish('mempool_remove', {'ids': sorted(confirmed_ids), 'reason': 'confirmed'})
+        self._publish_evictions()
+
+        with span('persist'), self.tracer.span(block_hash, 'persist'):
+            self.save()
+        with span('broadcast_block'):
+            self.transport.broadcast_new_block(self, block)
+        return True, "Block accepted"
+
+    def _verify_block(self, block: Dict[str, Any], view: ChainView) -> Tuple[Optional[str], Dict[str, float]]:
+        """ टिप पर जुड़ने वाले ब्लॉक की पूरी जाँच। रिटर्न: (त्रुटि या None, sender -> कुल खर्च) """
+        last_block = view.last_block
+        if not self.valid_proof(block['previous_hash'], block['proof'], last_block.get('difficulty', 4)):
+            return "Invalid proof of work", {}
+
+        transactions = block['transactions']
+        if not transactions or len(transactions) > MAX_BLOCK_TRANSACTIONS + 1:
+            return "Invalid transaction count", {}
+        coinbase = transactions[0]
+        if coinbase.get('sender') != "SYSTEM_COINBASE" or coinbase.get('amount') != self.get_mining_reward(block['index']):
+            return "Invalid coinbase transaction", {}
+
+        pending_spend: Dict[str, float] = {}
+        total_bytes = 0
+        for tx in transactions[1:]:
+            if not isinstance(tx, dict) or not all(k in tx for k in ('sender', 'recipient', 'amount', 'signature')):
+                return "Malformed transaction", {}
+            if tx['sender'] == "SYSTEM_COINBASE" or not isinstance(tx['amount'], (int, float)) or tx['amount'] <= 0:
+                return "Invalid transaction", {}
+            total_bytes += transaction_size(tx)
+            pending_spend[tx['sender']] = pending_spend.get(tx['sender'], 0.0) + tx['amount']
+        if total_bytes > MAX_BLOCK_BYTES:
+            return "Block too large", {}
+        if not all(view.get_balance(sender) >= total for sender, total in pending_spend.items()):
+            return "Insufficient funds in block transaction", {}
+
+        with span('verify_signature'):
+            if not all(verify_signatures_batch(transactions[1:])):
+                return "Invalid transaction signature", {}
+        return None, pending_spend
+
+    # ------------------------------------------------
+    # F.2 इन्वेंटरी गॉसिप (/inv)
+    # ------------------------------------------------
+    def want_inventory(self, inventory: Dict[str, Any]) -> Dict[str, List[str]]:
+        """ पीयर की घोषित IDs में से वे जिनकी बॉडी हमें चाहिए (core/gossip.py देखें) """
+        return self.gossip.wanted(inventory)
+
     # ------------------------------------------------
     # G. विकेन्द्रीकृत सर्वसम्मति (Consensus / Conflict Resolution)
     # ------------------------------------------------
     def register_node(self, address: str):
-        parsed_url = urlparse(address)
-        # urlparse.netloc केवल 'hostname:port' देता है
-        if parsed_url.netloc:
-            self.nodes.add(parsed_url.netloc)
-        elif parsed_url.path:
-            # यदि केवल 'example.com' जैसा कुछ दिया गया है
-            self.nodes.add(parsed_url.path)
+        with self.lock:
+            self._register_node(address)
+            self.publish_view(chain_changed=False, pool_changed=False)
+
+    def _register_node(self, address: str):
+        node = normalize_node(address)
+        if node:
+            self.nodes.add(node)
             
-    def resolve_conflicts(self) -> bool:
+    def resolve_conflicts(self, block: Optional[Dict[str, Any]] = None, trace: Optional[Dict[str, Any]] = None,
+                          received_at: Optional[float] = None) -> bool:
         """
         सर्वसम्मति एल्गोरिथम: सबसे लंबी और वैध चेन को स्वीकार करता है।
+        block/trace/received_at: जिस पीयर ब्लॉक (/blocks/new) ने सर्वसम्मति शुरू की, उसका ट्रेस।
         """
-        neighbours = self.nodes
+        trace_id = self.trace_received(block, trace, received_at)
+        # पीयर्स से चेन प्राप्त करें (ट्रांसपोर्ट के ज़रिए)
+        peer_chains = []
+        for node in self.view.nodes:
+            with span('consensus_fetch'), self.tracer.span(trace_id, 'download', peer=node) as attrs:
+                data = self.transport.fetch_chain(node)
+                attrs['result'] = 'ok' if data is not None else 'unreachable'
+            peer_chains.append(data)
+
+        return self.adopt_longest_chain(peer_chains, trace_id)
+
+    def trace_received(self, block: Optional[Dict[str, Any]], trace: Optional[Dict[str, Any]],
+                       received_at: Optional[float]) -> Optional[str]:
+        """ सर्वसम्मति शुरू करने वाले ब्लॉक का 'receive' स्पैन। रिटर्न: trace_id (ब्लॉक हैश) या None """
+        if not isinstance(block, dict) or 'index' not in block:
+            return None
+        block_hash = self.hash(block)
+        self.tracer.receive(block_hash, block['index'], trace, received_at, via='consensus')
+        return block_hash
+
+    def adopt_longest_chain(self, peer_chains: List[Optional[Dict[str, Any]]], trace_id: Optional[str] = None) -> bool:
+        """
+        पीयर्स के /chain जवाबों में से सबसे लंबी वैध चेन चुनकर अपनाता है।
+        None = वह पीयर उपलब्ध नहीं था।
+        सत्यापन लॉक के बाहर (प्रकाशित व्यू के विरुद्ध) होता है; लॉक केवल अदला-बदली के लिए।
+        trace_id: जिस ब्लॉक के ट्रेस में validate/apply/persist स्पैन दर्ज हों (resolve_conflicts देखें)।
+        """
+        view = self.view
         new_chain: Optional[List[Dict[str, Any]]] = None
-        max_length = len(self.chain)
-        
-        for node in neighbours:
-            # Render URLs के लिए 'https' का उपयोग करें
-            url = f'https://{node}/chain' if 'http' not in node and 'https' not in node else f'{node}/chain'
-            
-            try:
-                response = requests.get(url, timeout=5) 
-            except requests.exceptions.RequestException:
+        max_length = len(view.chain)
+        validate_start = self.tracer.clock()
+
+        for data in peer_chains:
+            if data is None:
+                CONSENSUS_PEER_ERRORS.inc(1, ('unreachable',))
                 continue
 
-            if response.status_code == 200:
-                data = response.json()
-                length = data['length']
-                chain = data['chain']
+            length = data['length']
+            chain = data['chain']
 
-                if length > max_length:
-                    is_valid, _ = self.is_valid_chain(chain)
-                    if is_valid:
-                        max_length = length
-                        new_chain = chain
+            if length > max_length:
+                chain = self._splice_pruned_prefix(chain, data.get('pruned_height', 0), view)
+                if chain is None:
+                    CONSENSUS_PEER_ERRORS.inc(1, ('pruned_mismatch',))
+                    continue
+                is_valid, _ = self.is_valid_chain(chain)
+                if is_valid:
+                    max_length = length
+                    new_chain = chain
+                else:
+                    CONSENSUS_PEER_ERRORS.inc(1, ('invalid_chain',))
+        self.tracer.record(trace_id, 'validate', validate_start, via='consensus',
+                           result='ok' if new_chain else 'no_longer_peer_chain')
 
         if new_chain:
-            # 1. वर्तमान ट्रांजैक्शन पूल को सहेजें
-            old_transactions = self.current_transactions
-            
-            # 2. चेन बदलें
-            self.chain = new_chain
-            self.balance_manager.recalculate_balances() 
-            
-            # 3. मेमोरी पूल क्लीनअप
-            new_chain_txs = set()
-            for block in self.chain:
-                for tx in block['transactions']:
-                    if tx['sender'] != "SYSTEM_COINBASE":
-                        new_chain_txs.add(json.dumps(tx, sort_keys=True))
-                        
-            self.current_transactions = []
-            for tx in old_transactions:
-                tx_string = json.dumps(tx, sort_keys=True)
-                if tx_string not in new_chain_txs:
-                    self.current_transactions.append(tx)
-            
-            # 4. डेटा को डिस्क पर सेव करें
-            save_blockchain(self.chain, self.difficulty, self.nodes)
-            
-            return True 
+            with self.tracer.span(trace_id, 'apply', via='consensus') as attrs, self.lock:
+                # सत्यापन के दौरान हमारी चेन इतनी ही लंबी हो गई हो तो अदला-बदली न करें
+                adopted = len(new_chain) > len(self.chain)
+                if adopted:
+                    confirmed_ids, old_chain, adopted_chain = self._swap_chain(new_chain)
+                else:
+                    attrs['result'] = 'tip_changed'
+            if adopted:
+                self._after_swap(old_chain, adopted_chain, confirmed_ids, trace_id)
+                CONSENSUS_ROUNDS.inc(1, ('replaced',))
+                # नई टिप पीयर्स को घोषित करें (जिनके पास है वे माँगेंगे नहीं)
+                tip = adopted_chain[-1]
+                self.gossip.remember(self.hash(tip), tip)
+                with span('broadcast_block'):
+                    self.transport.broadcast_new_block(self, tip)
+                return True 
 
+        CONSENSUS_ROUNDS.inc(1, ('authoritative',))
         return False
+
+    def replace_chain(self, new_chain: List[Dict[str, Any]]):
+        """
+        पहले से सत्यापित (validated) चेन को अपनाता है: बैलेंस दोबारा गिनता है,
+        मेमोरी पूल से वे ट्रांजैक्शन हटाता है जो नई चेन में आ चुके हैं, और डिस्क पर सेव करता है।
+        """
+        with self.lock:
+            confirmed_ids, old_chain, adopted_chain = self._swap_chain(new_chain)
+        self._after_swap(old_chain, adopted_chain, confirmed_ids)
+
+    def _swap_chain(self, new_chain: List[Dict[str, Any]]) -> Tuple[List[str], Tuple[Dict[str, Any], ...], Tuple[Dict[str, Any], ...]]:
+        """
+        लॉक के अंदर: चेन बदलकर नया व्यू प्रकाशित करता है।
+        रिटर्न: (पूल से निकले IDs, पुराने व्यू की चेन, नए व्यू की चेन)
+        """
+        old_view = self._view
+        # 1. वर्तमान ट्रांजैक्शन पूल को सहेजें
+        old_transactions = self.current_transactions
+        
+        # 2. चेन बदलें
+        self.chain = new_chain
+        self.balance_manager.recalculate_balances() 
+        self.prune()
         
+        # 3. मेमोरी पूल क्लीनअप
+        new_chain_txs = set()
+        for block in self.chain:
+            for tx in block.get('transactions', []):
+                if tx['sender'] != "SYSTEM_COINBASE":
+                    new_chain_txs.add(json.dumps(tx, sort_keys=True))
+                    
+        remaining = []
+        confirmed_ids = []
+        for tx in old_transactions:
+            tx_string = json.dumps(tx, sort_keys=True)
+            if tx_string not in new_chain_txs:
+                remaining.append(tx)
+            else:
+                confirmed_ids.append(transaction_id(tx))
+        self.current_transactions = remaining
+        self.mempool_ids.difference_update(confirmed_ids)
+        self._evict_unfundable()
+        self.publish_view()
+        return confirmed_ids, old_view.chain, self._view.chain
+
+    def _after_swap(self, old_chain: Tuple[Dict[str, Any], ...], new_chain: Tuple[Dict[str, Any], ...],
+                    confirmed_ids: List[str], trace_id: Optional[str] = None):
+        """ लॉक के बाहर: चेन बदलने के इवेंट्स और डिस्क पर सेव """
+        self._publish_chain_change(old_chain, new_chain)
+        if confirmed_ids:
+            self.events.publish('mempool_remove', {'ids': confirmed_ids, 'reason': 'confirmed'})
+        self._publish_evictions()
+        
+        # 4. डेटा को डिस्क पर सेव करें
+        with span('persist'), self.tracer.span(trace_id, 'persist', via='consensus'):
+            self.save()
+
+    def _splice_pruned_prefix(self, chain: List[Dict[str, Any]], peer_pruned_height: int,
+                              view: Optional[ChainView] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        प्रून किए गए हेडर्स के मूल हैश की जाँच नहीं हो सकती, इसलिए ऐसी चेन केवल तभी स्वीकार्य है
+        जब उसका प्रून किया हुआ हिस्सा (हमारा या पीयर का) हमारी अपनी चेन से हूबहू मेल खाए।
+        उस हिस्से के लिए हमारे अपने ब्लॉक्स रखे जाते हैं। None = यह चेन हमारे लिए उपयोगी नहीं।
+        """
+        view = view or self.view
+        prefix = max(view.pruned_height, peer_pruned_height)
+        if prefix == 0:
+            return chain
+        if prefix > len(view.chain) or prefix > len(chain):
+            # पीयर ने वे ब्लॉक्स प्रून कर दिए हैं जो हमारे पास नहीं हैं
+            return None
+        for ours, theirs in zip(view.chain[:prefix], chain[:prefix]):
+            if self.hash(ours) != self.hash(theirs):
+                # reorg प्रून बिंदु से नीचे तक जाता है
+                return None
+        return list(view.chain[:prefix]) + chain[prefix:]
+
+    def prune(self) -> int:
+        """
+        prune_depth से पुराने ब्लॉक्स की ट्रांजैक्शन बॉडी हटाकर केवल हेडर रखता है और
+        उनका असर बैलेंस स्नैपशॉट में जोड़ता है। रिटर्न: कितने ब्लॉक्स प्रून हुए।
+        """
+        if not self.prune_depth:
+            return 0
+        target = len(self.chain) - self.prune_depth
+        if self.pruned_height >= target:
+            return 0
+        blocks = [block for block in self.chain[self.pruned_height:target] if 'transactions' in block]
+        # लेजर की तरह पूर्णांक इकाइयों में (float जोड़ से नोड्स के स्नैपशॉट अलग न हों)
+        self.balance_snapshot = replay_balances(blocks, self.balance_snapshot)
+        for height in range(self.pruned_height, target):
+            block = self.chain[height]
+            if 'transactions' in block:
+                self.chain[height] = block_header(block, self.hash(block))
+        self.pruned_height = target
+        return len(blocks)
+
+    def _publish_chain_change(self, old_chain: List[Dict[str, Any]], new_chain: List[Dict[str, Any]]):
+        """
+        पुरानी और नई चेन का साझा हिस्सा (fork height) खोजकर इवेंट भेजता है:
+        यदि पुराने ब्लॉक हटे हैं तो 'reorg', फिर fork के ऊपर के हर नए ब्लॉक के लिए 'block'।
+        """
+        fork_height = 0
+        for old_block, new_block in zip(old_chain, new_chain):
+            # हैश से तुलना करें: एक ही ब्लॉक का पूरा और प्रून किया हुआ रूप बराबर माना जाए
+            if old_block is not new_block and self.hash(old_block) != self.hash(new_block):
+                break
+            fork_height += 1
+
+        if fork_height < len(old_chain):
+            self.events.publish('reorg', {
+                'fork_height': fork_height,
+                'old_height': len(old_chain),
+                'new_height': len(new_chain),
+                'new_tip': self.hash(new_chain[-1]),
+            })
+        for block in new_chain[fork_height:]:
+            self.events.publish('block', block_summary(block, self.hash(block)))
+
+    def save(self):
+        """
+        नवीनतम प्रकाशित व्यू (चेन, कठिनाई और नोड लिस्ट) को डिस्क पर सेव करता है।
+        लेखक लॉक के बाहर चलता है; दो सेव एक साथ हों तो पुराना वर्ज़न नए के ऊपर नहीं लिखा जाता।
+        """
+        if not self.persist:
+            return
+        with self._save_lock:
+            view = self.view
+            if view.version <= self._saved_version:
+                return
+            pruned = None
+            if view.pruned_height:
+                pruned = {'height': view.pruned_height, 'depth': self.prune_depth, 'balances': dict(view.balance_snapshot)}
+            save_blockchain(list(view.chain), view.difficulty, set(view.nodes), pruned)
+            self._saved_version = view.version
+
     @property
     def last_block(self) -> Dict[str, Any]:
         return self.chain[-1]
@@ -0,0 +1,61 @@
+"""
+चेन स्टेट का अपरिवर्तनीय (immutable) और वर्ज़न वाला स्नैपशॉट।
+
+समवर्तिता मॉडल (Concurrency Model):
+    1. एकल लेखक (single writer): चेन, मेमोरी पूल, बैलेंस या नोड लिस्ट बदलने वाला हर काम
+       `Blockchain.lock` लेकर होता है। महँगा काम (PoW, हस्ताक्षर जाँच, पीयर्स से फ़ेच,
+       पीयर चेन का सत्यापन, प्रसारण, डिस्क पर सेव) लॉक के बाहर होता है।
+    2. पाठक (readers) कभी लॉक नहीं लेते: वे `Blockchain.view` से एक ChainView लेते हैं।
+       हर बदलाव के अंत में लेखक नया ChainView बनाकर एक ही असाइनमेंट में प्रकाशित करता है,
+       इसलिए पाठक को या तो पूरी पुरानी स्टेट दिखती है या पूरी नई — बीच की कभी नहीं।
+    3. कॉपी-ऑन-राइट: जो हिस्सा नहीं बदला (जैसे नए ट्रांजैक्शन पर चेन और बैलेंस) वह पिछले
+       व्यू से साझा होता है। ब्लॉक्स चेन में जुड़ने के बाद कभी बदले नहीं जाते (प्रून करने पर
+       सूची में उनकी जगह नया हेडर रखा जाता है), इसलिए टपल में ब्लॉक्स भी साझा रहते हैं।
+"""
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, NamedTuple, Tuple
+
+
+class ChainView(NamedTuple):
+    """ एक वर्ज़न पर पूरी चेन स्टेट (पढ़ने के लिए; इसे या इसके ब्लॉक्स को कभी न बदलें) """
+    version: int
+    chain: Tuple[Dict[str, Any], ...]
+    transactions: Tuple[Dict[str, Any], ...]
+    balances: Mapping[str, float]
+    difficulty: int
+    nodes: FrozenSet[str]
+    pruned_height: int
+    balance_snapshot: Mapping[str, float]
+    # आख़िरी ब्लॉक का हैश (केवल चेन बदलने पर दोबारा गणना; रिस्पॉन्स कैश की key)
+    tip_hash: str
+
+    @property
+    def length(self) -> int:
+        return len(self.chain)
+
+    @property
+    def last_block(self) -> Dict[str, Any]:
+        return self.chain[-1]
+
+    @property
+    def tip_key(self) -> str:
+        """ चेन की पहचान: टिप बदलने या प्रून/बैकफ़िल से ऊँचाई बदलने पर बदलती है (मेमोरी पूल से नहीं) """
+        return f'{self.tip_hash}:{self.pruned_height}'
+
+    def get_balance(self, address: str) -> float:
+        return self.balances.get(address, 0.0)
+
+    def __reduce__(self):
+        # MappingProxyType पिकल नहीं होता (स्टेट-ओनर प्रोसेस से IPC के लिए साधारण dict भेजें)
+        fields = self._replace(balances=dict(self.balances), balance_snapshot=dict(self.balance_snapshot))
+        return _restore_view, (tuple(fields),)
+
+
+def _restore_view(fields: Tuple[Any, ...]) -> ChainView:
+    view = ChainView(*fields)
+    return view._replace(balances=frozen_mapping(view.balances), balance_snapshot=frozen_mapping(view.balance_snapshot))
+
+
+def frozen_mapping(values: Dict[str, float]) -> Mapping[str, float]:
+    """ डिक्शनरी की कॉपी का केवल-पढ़ने वाला रूप """
+    return MappingProxyType(dict(values))
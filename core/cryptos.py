@@ -27,7 +27,7 @@ def generate_wallet():
     address = base64.b64encode(public_key_der).decode('utf-8')
     
     return {
-        'private_key': private_key_pem.decode('utf-8'),
+        'private_key': private_key_pem,
         'public_address': address
     }
 
@@ -55,22 +55,28 @@ def sign_transaction(private_key_pem, sender, recipient, amount):
     try:
         # PEM फॉर्मेट से प्राइवेट की को इंपोर्ट करें
         key = ECC.import_key(private_key_pem)
-        
-        # ट्रांजैक्शन का हैश बनाएँ
-        h = hash_transaction(sender, recipient, amount)
-        
-        # हस्ताक्षर बनाएँ
-        signer = DSS.new(key, 'fips-186-3')
-        signature_bytes = signer.sign(h)
-        
-        # हस्ताक्षर को बेस64 में एन्कोड करके स्ट्रिंग के रूप में रिटर्न करें
-        return base64.b64encode(signature_bytes).decode('utf-8')
+        return sign_transaction_with_key(key, sender, recipient, amount)
         
     except Exception as e:
         # हस्ताक्षर विफल होने पर None रिटर्न करें
         print(f"Signing Error: {e}")
         return None
 
+def sign_transaction_with_key(key, sender, recipient, amount):
+    """
+    पहले से इंपोर्ट की गई ECC की से हस्ताक्षर करता है।
+    बल्क साइनिंग में हर ट्रांजैक्शन पर ECC.import_key का खर्च बचाने के लिए।
+    """
+    # ट्रांजैक्शन का हैश बनाएँ
+    h = hash_transaction(sender, recipient, amount)
+    
+    # हस्ताक्षर बनाएँ
+    signer = DSS.new(key, 'fips-186-3')
+    signature_bytes = signer.sign(h)
+    
+    # हस्ताक्षर को बेस64 में एन्कोड करके स्ट्रिंग के रूप में रिटर्न करें
+    return base64.b64encode(signature_bytes).decode('utf-8')
+
 def verify_signature(public_address, signature_b64, sender, recipient, amount):
     """
     जाँच करता है कि ट्रांजैक्शन पर दिया गया हस्ताक्षर वैध (Valid) है या नहीं।
@@ -101,6 +107,29 @@ def verify_signature(public_address, signature_b64, sender, recipient, amount):
     except Exception as e:
         # अन्य त्रुटियाँ (जैसे अमान्य पता/कुंजी)
         return False
+
+def verify_signatures_batch(transactions):
+    """
+    कई ट्रांजैक्शन के हस्ताक्षर एक साथ जाँचता है और हर एक के लिए True/False की लिस्ट रिटर्न करता है।
+    एक ही भेजने वाले (sender) की पब्लिक की केवल एक बार इंपोर्ट होती है, जो एक-एक करके
+    verify_signature() बुलाने की तुलना में काफ़ी सस्ता है।
+    """
+    keys = {}
+    results = []
+    for tx in transactions:
+        try:
+            sender = tx['sender']
+            key = keys.get(sender)
+            if key is None:
+                key = keys[sender] = ECC.import_key(base64.b64decode(sender))
+
+            h = hash_transaction(sender, tx['recipient'], tx['amount'])
+            DSS.new(key, 'fips-186-3').verify(h, base64.b64decode(tx['signature']))
+            results.append(True)
+        except Exception:
+            # अमान्य हस्ताक्षर (ValueError) या अमान्य पता/कुंजी
+            results.append(False)
+    return results
         
 # ----------------------------------------------------
 # 3. सहायक कार्य (Helper Functions)
@@ -114,6 +143,19 @@ def address_from_public_key(public_key_pem):
     public_key_der = key.public_key().export_key(format='DER')
     return base64.b64encode(public_key_der).decode('utf-8')
 
+def transaction_id(transaction):
+    """
+    ट्रांजैक्शन की अद्वितीय ID (हस्ताक्षर सहित सभी फ़ील्ड्स का SHA-256)।
+    डुप्लिकेट पहचानने के लिए उपयोग होती है।
+    """
+    tx_data = {
+        'sender': transaction['sender'],
+        'recipient': transaction['recipient'],
+        'amount': transaction['amount'],
+        'signature': transaction['signature'],
+    }
+    return SHA256.new(json.dumps(tx_data, sort_keys=True).encode()).hexdigest()
+
 # ----------------------------------------------------
 # उपयोग का उदाहरण
 # ----------------------------------------------------
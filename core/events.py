@@ -0,0 +1,109 @@
+import itertools
+import json
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+# फ़ैन-आउट बफ़र में कितने पिछले इवेंट रखे जाएँ (धीमे सब्सक्राइबर इतना पीछे रह सकते हैं)
+EVENT_BUFFER_SIZE = 4096
+
+# (sequence, event type, payload)
+Event = Tuple[int, str, Dict[str, Any]]
+
+
+# ----------------------------------------------------
+# 1. इवेंट बस (Fan-out Ring Buffer)
+# ----------------------------------------------------
+
+class EventBus:
+    """
+    नए ब्लॉक, reorg और मेमोरी पूल बदलावों के लिए एक सीमित (bounded) रिंग बफ़र।
+
+    publish() केवल एक छोटा लॉक लेकर बफ़र में जोड़ता है और कभी किसी सब्सक्राइबर का
+    इंतज़ार नहीं करता, इसलिए ब्लॉक स्वीकार करने का पाथ धीमे क्लाइंट्स से प्रभावित नहीं होता।
+    हर सब्सक्राइबर अपना कर्सर (आख़िरी देखा गया sequence) ख़ुद रखता है; जो बहुत पीछे रह जाए
+    उसे `lost=True` मिलता है और उसे दोबारा सिंक (resync) करना चाहिए।
+    """
+    def __init__(self, capacity: int = EVENT_BUFFER_SIZE):
+        self._events: Deque[Event] = deque(maxlen=capacity)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def publish(self, event_type: str, payload: Dict[str, Any]):
+        with self._cond:
+            self._seq += 1
+            self._events.append((self._seq, event_type, payload))
+            self._cond.notify_all()
+        # async रनटाइम के लिए: listener केवल इवेंट लूप को जगाता है (non-blocking)
+        for listener in list(self._listeners):
+            listener()
+
+    def add_listener(self, listener: Callable[[], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def read(self, cursor: int, timeout: float = 0.0) -> Tuple[List[Event], int, bool]:
+        """
+        `cursor` के बाद के सभी इवेंट रिटर्न करता है; कोई नया इवेंट न हो तो `timeout` तक रुकता है।
+        रिटर्न: (events, नया cursor, lost) — lost=True मतलब कुछ इवेंट बफ़र से निकल चुके थे।
+        """
+        with self._cond:
+            if self._seq <= cursor and timeout > 0:
+                self._cond.wait(timeout)
+
+            if cursor > self._seq:
+                # कर्सर किसी पिछले प्रोसेस जीवनकाल का है
+                return [], self._seq, True
+
+            new_count = self._seq - cursor
+            if new_count == 0:
+                return [], cursor, False
+
+            # बफ़र क्रम में है, इसलिए केवल अंत के `new_count` इवेंट नए हैं
+            lost = new_count > len(self._events)
+            events = list(itertools.islice(self._events, max(0, len(self._events) - new_count), None))
+            return events, self._seq, lost
+
+
+# ----------------------------------------------------
+# 2. कॉम्पैक्ट पेलोड (Compact Payloads)
+# ----------------------------------------------------
+
+def block_summary(block: Dict[str, Any], block_hash: str) -> Dict[str, Any]:
+    """ पूरे ब्लॉक की जगह केवल हेडर और ट्रांजैक्शन संख्या """
+    return {
+        'height': block['index'],
+        'hash': block_hash,
+        'previous_hash': block['previous_hash'],
+        'timestamp': block['timestamp'],
+        'miner': block.get('miner'),
+        # प्रून किए गए हेडर में ट्रांजैक्शन की जगह केवल उनकी संख्या होती है
+        'tx_count': len(block['transactions']) if 'transactions' in block else block.get('tx_count', 0),
+    }
+
+
+def transaction_summary(tx_id: str, transaction: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': tx_id,
+        'sender': transaction['sender'],
+        'recipient': transaction['recipient'],
+        'amount': transaction['amount'],
+    }
+
+
+def format_sse(event: Event) -> str:
+    """ Server-Sent Events वायर फ़ॉर्मेट """
+    seq, event_type, payload = event
+    return f"id: {seq}\nevent: {event_type}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
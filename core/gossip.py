@@ -0,0 +1,216 @@
+"""
+इन्वेंटरी-आधारित गॉसिप (Inventory Gossip) और सीमित "देखा हुआ" सेट (Seen-Set)।
+
+पहले हर नोड हर स्वीकृत ट्रांजैक्शन/ब्लॉक की पूरी बॉडी सभी पीयर्स को भेजता था, और पीयर्स वही
+आगे भेजते थे। अब:
+    1. नोड केवल IDs की घोषणा करता है: POST /inv {'inventory': {'tx': [...], 'block': [...]}}
+    2. पीयर जवाब में केवल वे IDs माँगता है जो उसने अब तक नहीं देखे: {'request': {...}}
+    3. घोषणा करने वाला नोड केवल माँगी गई बॉडीज़ भेजता है (/transactions/batch, /blocks/new)
+इसलिए हर बॉडी हर नोड तक लगभग एक ही बार पहुँचती है; दोहराव केवल छोटी ID सूचियों में होता है।
+
+Seen-Set: समय-खिड़की वाला घूमता (rotating) ब्लूम फ़िल्टर। जो ID एक बार स्वीकार या स्थायी रूप
+से अस्वीकार हो चुकी है वह कम से कम `SEEN_WINDOW_SECONDS` तक याद रहती है: न दोबारा माँगी जाती है,
+न दोबारा सत्यापित होती है, न आगे भेजी जाती है। मेमोरी स्थिर है (दो पीढ़ियाँ, हर एक
+`SEEN_CAPACITY` IDs के लिए), चाहे नेटवर्क पर कितने भी ट्रांजैक्शन आएँ। ब्लूम की गलत-सकारात्मकता
+(false positive) से कोई ID कभी-कभार "देखी हुई" मानी जा सकती है; ब्लॉक के लिए अगला ब्लॉक
+सर्वसम्मति से कमी पूरी कर देता है, और दर `SEEN_ERROR_RATE` से सीमित है।
+
+GOSSIP_MODE=flood से पुराना व्यवहार (पूरी बॉडी सीधे भेजना) वापस आता है, जैसे उन पीयर्स के लिए
+जिनमें /inv नहीं है।
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.metrics import REGISTRY
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स (ENV से बदली जा सकती हैं)
+# ----------------------------------------------------
+
+# 'inv' (घोषणा/माँग) या 'flood' (पूरी बॉडी हर पीयर को)
+GOSSIP_MODE = os.environ.get('GOSSIP_MODE', 'inv')
+# एक ID कम से कम इतने सेकंड याद रहती है (अधिकतम दोगुना)
+SEEN_WINDOW_SECONDS = float(os.environ.get('SEEN_WINDOW_SECONDS', 600))
+# हर पीढ़ी में इतनी IDs के बाद खिड़की से पहले ही घुमाएँ (ताकि गलत-सकारात्मक दर न बढ़े)
+SEEN_CAPACITY = int(os.environ.get('SEEN_CAPACITY', 200_000))
+SEEN_ERROR_RATE = 1e-4
+# माँगी गई ID इतने सेकंड तक दूसरे पीयर से दोबारा नहीं माँगी जाती (बॉडी रास्ते में है)
+INV_REQUEST_TIMEOUT_SECONDS = 10.0
+# एक /inv संदेश में अधिकतम IDs
+MAX_INV_ITEMS = 50_000
+# घोषित बॉडीज़ का कैश (पीयर की माँग पर भेजने के लिए)
+RELAY_CACHE_ITEMS = 50_000
+# रिले किए गए /transactions/batch का अधिकतम आकार: पीयर की प्रति-क्लाइंट बर्स्ट (डिफ़ॉल्ट ADMISSION_TX_BURST
+# = 500) से बड़ा बैच वहाँ 413 पाता है (जब हम उसके रजिस्टर्ड पीयर न हों), इसलिए बड़े रिले टुकड़ों में जाते हैं।
+# पीयर की सेटिंग मायने रखती है, अपनी नहीं, इसलिए यह अलग ENV है।
+RELAY_BATCH_TRANSACTIONS = int(os.environ.get('RELAY_BATCH_TRANSACTIONS', 500))
+# पीयर 429 दे तो उसका Retry-After मानकर टुकड़ा दोबारा भेजें (सीमित बार, सीमित इंतज़ार), वरना बर्स्ट में body गिर जाती
+RELAY_RETRIES = int(os.environ.get('RELAY_RETRIES', 3))
+RELAY_MAX_WAIT = float(os.environ.get('RELAY_MAX_WAIT', 5))
+
+INV_KINDS = ('tx', 'block')
+
+INVENTORY_ITEMS = REGISTRY.counter('mycoin_gossip_inventory_total',
+                                   'Inventory ids received from peers', ('kind', 'result'))
+DUPLICATES_SKIPPED = REGISTRY.counter('mycoin_gossip_duplicates_skipped_total',
+                                      'Items dropped by the seen-set before verification', ('kind',))
+
+
+def relay_batches(transactions: List[Dict[str, Any]],
+                  size: int = RELAY_BATCH_TRANSACTIONS) -> List[List[Dict[str, Any]]]:
+    """ /transactions/batch रिले के टुकड़े, हर एक अधिकतम `size` ट्रांजैक्शन """
+    size = max(1, size)
+    return [transactions[start:start + size] for start in range(0, len(transactions), size)]
+
+
+def relay_wait(status: int, retry_after: Optional[str], attempt: int) -> Optional[float]:
+    """ 429 पर दोबारा भेजने से पहले कितने सेकंड रुकें; None = दोबारा न भेजें """
+    if status != 429 or attempt >= RELAY_RETRIES:
+        return None
+    try:
+        wait = float(retry_after) if retry_after else 1.0
+    except ValueError:
+        wait = 1.0
+    return min(max(wait, 0.0), RELAY_MAX_WAIT)
+
+
+# ----------------------------------------------------
+# 1. समय-खिड़की वाला ब्लूम फ़िल्टर
+# ----------------------------------------------------
+
+class SeenFilter:
+    """
+    दो पीढ़ियों (current, previous) वाला ब्लूम फ़िल्टर। खिड़की बीतने या current भरने पर
+    previous फेंक दिया जाता है और current उसकी जगह लेता है। `clock` सिम्युलेटर में वर्चुअल समय देता है।
+    """
+    def __init__(self, capacity: int = SEEN_CAPACITY, window: float = SEEN_WINDOW_SECONDS,
+                 error_rate: float = SEEN_ERROR_RATE, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.window = window
+        self.clock = clock
+        # मानक ब्लूम आकार: m = -n ln(p) / (ln 2)^2, k = (m / n) ln 2
+        self.bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._current = bytearray((self.bits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._count = 0
+        self._rotated_at = clock()
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str) -> List[int]:
+        # एक blake2b से दो 64-bit हैश, बाकी double hashing से
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: List[int]) -> bool:
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def _rotate_if_due(self):
+        # self._lock के अंदर
+        if self._count >= self.capacity or self.clock() - self._rotated_at >= self.window:
+            self._previous = self._current
+            self._current = bytearray(len(self._previous))
+            self._count = 0
+            self._rotated_at = self.clock()
+
+    def __contains__(self, item: str) -> bool:
+        positions = self._positions(item)
+        with self._lock:
+            self._rotate_if_due()
+            return self._test(self._current, positions) or self._test(self._previous, positions)
+
+    def add(self, item: str) -> bool:
+        """ ID जोड़ता है। रिटर्न: True यदि यह पहले नहीं देखी गई थी। """
+        positions = self._positions(item)
+        with self._lock:
+            self._rotate_if_due()
+            if self._test(self._current, positions) or self._test(self._previous, positions):
+                return False
+            for position in positions:
+                self._current[position >> 3] |= 1 << (position & 7)
+            self._count += 1
+            return True
+
+
+# ----------------------------------------------------
+# 2. प्रति-नोड गॉसिप स्टेट
+# ----------------------------------------------------
+
+class Gossip:
+    """
+    Blockchain का गॉसिप हिस्सा:
+        seen      -> स्वीकृत या स्थायी रूप से अस्वीकृत IDs (दोबारा सत्यापन/प्रसारण नहीं)
+        requested -> जिन IDs की बॉडी किसी पीयर से माँगी जा चुकी है
+        relay     -> हमारी घोषित बॉडीज़, ताकि पीयर की माँग पर भेज सकें
+    """
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.seen = SeenFilter(clock=clock)
+        self.requested = SeenFilter(capacity=MAX_INV_ITEMS, window=INV_REQUEST_TIMEOUT_SECONDS, clock=clock)
+        self._relay: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def remember(self, item_id: str, body: Dict[str, Any]):
+        """ स्वीकृत आइटम: देखा हुआ मानें और घोषणा के लिए बॉडी रखें """
+        self.seen.add(item_id)
+        now = self.clock()
+        with self._lock:
+            self._relay[item_id] = (now, body)
+            self._relay.move_to_end(item_id)
+            while self._relay and (len(self._relay) > RELAY_CACHE_ITEMS
+                                   or now - next(iter(self._relay.values()))[0] > SEEN_WINDOW_SECONDS):
+                self._relay.popitem(last=False)
+
+    def body(self, item_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._relay.get(item_id)
+        return entry[1] if entry is not None else None
+
+    def skip_seen(self, kind: str, item_id: str) -> bool:
+        """ पहले से देखी गई ID पर True (कॉलर सत्यापन छोड़ दे) """
+        if item_id in self.seen:
+            DUPLICATES_SKIPPED.inc(1, (kind,))
+            return True
+        return False
+
+    def wanted(self, inventory: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        पीयर की घोषणा ({'tx': [...], 'block': [...]}) में से वे IDs जो न देखी गईं, न पहले से
+        माँगी गईं। लौटाई गई IDs "माँगी गई" दर्ज होती हैं।
+        """
+        request: Dict[str, List[str]] = {}
+        budget = MAX_INV_ITEMS
+        for kind in INV_KINDS:
+            ids = inventory.get(kind)
+            if not isinstance(ids, list):
+                continue
+            ids = [item_id for item_id in ids[:budget] if isinstance(item_id, str)]
+            budget -= len(ids)
+            unknown = [item_id for item_id in dict.fromkeys(ids)
+                       if item_id not in self.seen and self.requested.add(item_id)]
+            if len(ids) > len(unknown):
+                INVENTORY_ITEMS.inc(len(ids) - len(unknown), (kind, 'known'))
+            if unknown:
+                INVENTORY_ITEMS.inc(len(unknown), (kind, 'requested'))
+                request[kind] = unknown
+        return request
+
+    def bodies(self, request: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """ पीयर ने जो माँगा उसकी बॉडीज़ (जो अब रिले कैश में नहीं हैं वे छूट जाती हैं) """
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        for kind in INV_KINDS:
+            ids = request.get(kind) if isinstance(request, dict) else None
+            if isinstance(ids, list):
+                items = [body for body in (self.body(item_id) for item_id in ids if isinstance(item_id, str))
+                         if body is not None]
+                if items:
+                    found[kind] = items
+        return found
@@ -1,9 +1,12 @@
 import requests
 import json
-from typing import TYPE_CHECKING, Dict, Any, Set
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Set
 
-# Gunicorn वर्कर अनुकूलता के लिए data_storage से इंपोर्ट करें
-from utils.data_storage import load_blockchain_data 
+from utils.metrics import REGISTRY
+from .cryptos import transaction_id
+from .gossip import GOSSIP_MODE, relay_batches, relay_wait
 
 # Circular dependency से बचने के लिए
 if TYPE_CHECKING:
@@ -13,58 +16,236 @@ else:
     Blockchain = Any
 
 
+# प्रति-पीयर प्रसारण मेट्रिक्स (kind = 'transaction' या 'block')
+BROADCAST_SECONDS = REGISTRY.histogram('mycoin_p2p_broadcast_duration_seconds',
+                                       'Latency of a broadcast POST to one peer', ('peer', 'kind'))
+BROADCAST_FAILURES = REGISTRY.counter('mycoin_p2p_broadcast_failures_total',
+                                      'Failed broadcasts to one peer', ('peer', 'kind'))
+
+# इन्वेंटरी घोषणाएँ बैकग्राउंड में (रिले करने वाला /blocks/new हैंडलर अगले पीयर का इंतज़ार न करे)
+GOSSIP_WORKERS = 8
+_ANNOUNCER = ThreadPoolExecutor(max_workers=GOSSIP_WORKERS, thread_name_prefix='gossip')
+
+
 def broadcast_transaction(blockchain: 'Blockchain', transaction: Dict[str, Any]):
     """ एक नए ट्रांजैक्शन को नेटवर्क में प्रसारित करता है। """
     
-    # ट्रांजैक्शन प्रसारण के लिए भी नोड लिस्ट रीलोड करें 
-    try:
-        _, _, fresh_nodes = load_blockchain_data()
-        nodes_to_broadcast = fresh_nodes
-    except Exception:
-        nodes_to_broadcast = blockchain.nodes
-
-    for node in nodes_to_broadcast:
+    for node in blockchain.view.nodes:
         # P2P URLs को सही करें
         url = f'https://{node}/transactions/new' if 'http' not in node and 'https' not in node else f'{node}/transactions/new'
         
+        start = time.perf_counter()
         try:
             requests.post(url, json=transaction, timeout=2) 
+            BROADCAST_SECONDS.observe(time.perf_counter() - start, (node, 'transaction'))
         except requests.exceptions.RequestException:
             # प्रसारण विफल रहा, अगले नोड पर जाएँ
+            BROADCAST_FAILURES.inc(1, (node, 'transaction'))
             continue
 
 
+def broadcast_transactions(blockchain: 'Blockchain', transactions: List[Dict[str, Any]]):
+    """
+    कई स्वीकृत ट्रांजैक्शन को हर पीयर पर /transactions/batch से भेजता है — RELAY_BATCH_TRANSACTIONS
+    के टुकड़ों में, बैकग्राउंड में (429 के Retry-After इंतज़ार से रिक्वेस्ट न रुके)।
+    """
+    if not transactions:
+        return
+
+    for node in blockchain.view.nodes:
+        _ANNOUNCER.submit(_relay_to_peer, node, transactions)
+
+
+def _relay_to_peer(node: str, transactions: List[Dict[str, Any]]):
+    url = f'https://{node}/transactions/batch' if 'http' not in node and 'https' not in node else f'{node}/transactions/batch'
+
+    start = time.perf_counter()
+    try:
+        _post_relay(url, transactions)
+        BROADCAST_SECONDS.observe(time.perf_counter() - start, (node, 'transaction_batch'))
+    except requests.exceptions.RequestException:
+        BROADCAST_FAILURES.inc(1, (node, 'transaction_batch'))
+
+
 def broadcast_new_block(blockchain: 'Blockchain', block: Dict[str, Any]):
     """ 
     नए ब्लॉक को नेटवर्क में सभी नोड्स तक प्रसारित (broadcast) करता है।
+    पीयर लिस्ट प्रकाशित व्यू से (साझा स्टेट मोड में सभी वर्कर्स की लिस्ट ओनर प्रोसेस में एक ही है)।
     """
-    
-    # 🚨 महत्वपूर्ण सुधार: नोड लिस्ट को डिस्क से रीलोड करें 
     successful_transmissions = 0
-    
-    try:
-        _, _, fresh_nodes = load_blockchain_data()
-        nodes_to_broadcast: Set[str] = fresh_nodes
-        
-    except Exception as e:
-        print(f"ERROR: Could not load fresh nodes for broadcast: {e}")
-        nodes_to_broadcast = blockchain.nodes
-        
-    # डिस्क से रीलोड की गई नोड लिस्ट पर प्रसारण करें
-    for node in nodes_to_broadcast:
+
+    # हर पीयर एक 'forward' ट्रेस स्पैन
+    block_hash = blockchain.hash(block)
+    for node in blockchain.view.nodes:
         # P2P URLs को सही करें
         url = f'https://{node}/blocks/new' if 'http' not in node and 'https' not in node else f'{node}/blocks/new'
 
-        try:
-            response = requests.post(url, json={'block': block}, timeout=3) 
-            
-            if response.status_code == 200 or response.status_code == 201:
-                successful_transmissions += 1
-            else:
-                print(f"WARN: Could not broadcast block to {node}. Status: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            # print(f"ERROR: Failed to broadcast block to {node}. Error: {e}")
-            pass # विफल नोड्स के लिए लॉग को शांत रखें
+        start = time.perf_counter()
+        with blockchain.tracer.span(block_hash, 'forward', peer=node, mode='flood') as attrs:
+            try:
+                payload = {'block': block, 'trace': blockchain.tracer.outgoing(block_hash)}
+                response = requests.post(url, json=payload, timeout=3)
+                BROADCAST_SECONDS.observe(time.perf_counter() - start, (node, 'block'))
+                attrs['result'] = response.status_code
+
+                if response.status_code == 200 or response.status_code == 201:
+                    successful_transmissions += 1
+                else:
+                    BROADCAST_FAILURES.inc(1, (node, 'block'))
+                    print(f"WARN: Could not broadcast block to {node}. Status: {response.status_code}")
+            except requests.exceptions.RequestException as e:
+                # print(f"ERROR: Failed to broadcast block to {node}. Error: {e}")
+                BROADCAST_FAILURES.inc(1, (node, 'block'))
+                attrs['result'] = 'failed' # विफल नोड्स के लिए लॉग को शांत रखें
 
     print(f"P2P: Broadcasting new block {block['index']} to {successful_transmissions} nodes.")
     return successful_transmissions
+
+
+def _peer_url(node: str, path: str) -> str:
+    # P2P URLs को सही करें
+    return f'https://{node}{path}' if 'http' not in node and 'https' not in node else f'{node}{path}'
+
+
+def _post_relay(url: str, transactions: List[Dict[str, Any]]):
+    """ ट्रांजैक्शन बॉडीज़ को पीयर के /transactions/batch पर टुकड़ों में भेजें; 429 पर Retry-After मानें """
+    for batch in relay_batches(transactions):
+        attempt = 0
+        while True:
+            response = requests.post(url, json={'transactions': batch}, timeout=5)
+            wait = relay_wait(response.status_code, response.headers.get('Retry-After'), attempt)
+            if wait is None:
+                break
+            time.sleep(wait)
+            attempt += 1
+
+
+def _announce_to_peer(blockchain: 'Blockchain', node: str, inventory: Dict[str, List[str]]) -> bool:
+    """
+    एक पीयर को IDs घोषित करता है और वह जो माँगे केवल वही बॉडीज़ भेजता है।
+    हर घोषित ब्लॉक का एक 'forward' ट्रेस स्पैन: result = sent | declined (पीयर के पास था) | failed
+    """
+    start = time.perf_counter()
+    began = blockchain.tracer.clock()
+    delivered: Set[str] = set()
+    ok = False
+    try:
+        response = requests.post(_peer_url(node, '/inv'), json={'inventory': inventory}, timeout=2)
+        if response.status_code != 200:
+            BROADCAST_FAILURES.inc(1, (node, 'inv'))
+            return False
+        bodies = blockchain.gossip.bodies(response.json().get('request') or {})
+        for block in bodies.get('block', []):
+            block_hash = blockchain.hash(block)
+            requests.post(_peer_url(node, '/blocks/new'),
+                          json={'block': block, 'trace': blockchain.tracer.outgoing(block_hash)}, timeout=3)
+            delivered.add(block_hash)
+        if bodies.get('tx'):
+            _post_relay(_peer_url(node, '/transactions/batch'), bodies['tx'])
+        ok = True
+    except (requests.exceptions.RequestException, ValueError):
+        BROADCAST_FAILURES.inc(1, (node, 'inv'))
+        return False
+    finally:
+        for block_hash in inventory.get('block', []):
+            result = 'sent' if block_hash in delivered else ('declined' if ok else 'failed')
+            blockchain.tracer.record(block_hash, 'forward', began, peer=node, mode='inv', result=result)
+    BROADCAST_SECONDS.observe(time.perf_counter() - start, (node, 'inv'))
+    return True
+
+
+def announce_inventory(blockchain: 'Blockchain', inventory: Dict[str, List[str]]) -> int:
+    """
+    IDs ({'tx': [...], 'block': [...]}) सभी पीयर्स को घोषित करता है (core/gossip.py देखें)।
+    हर पीयर समानांतर और बैकग्राउंड में; रिटर्न: कितने पीयर्स को घोषणा भेजी गई।
+    """
+    nodes_to_announce = blockchain.view.nodes
+    for node in nodes_to_announce:
+        _ANNOUNCER.submit(_announce_to_peer, blockchain, node, inventory)
+    return len(nodes_to_announce)
+
+
+def fetch_chain(node: str) -> Optional[Dict[str, Any]]:
+    """
+    पीयर से उसकी पूरी चेन (/chain) प्राप्त करता है। विफल होने पर None रिटर्न करता है।
+    """
+    # Render URLs के लिए 'https' का उपयोग करें
+    url = f'https://{node}/chain' if 'http' not in node and 'https' not in node else f'{node}/chain'
+
+    try:
+        response = requests.get(url, timeout=5)
+        if response.status_code != 200:
+            return None
+        return response.json()
+    except requests.exceptions.RequestException:
+        return None
+
+
+def fetch_snapshot(node: str) -> Optional[Dict[str, Any]]:
+    """
+    पीयर से बैलेंस-स्टेट स्नैपशॉट (/snapshot) प्राप्त करता है। विफल होने पर None रिटर्न करता है।
+    """
+    url = f'https://{node}/snapshot' if 'http' not in node and 'https' not in node else f'{node}/snapshot'
+
+    try:
+        # स्नैपशॉट में सभी हेडर्स होते हैं, इसलिए लंबा टाइमआउट
+        response = requests.get(url, timeout=30)
+        if response.status_code != 200:
+            return None
+        return response.json()
+    except requests.exceptions.RequestException:
+        return None
+
+
+def fetch_snapshot_commitment(node: str, height: int) -> Optional[Dict[str, Any]]:
+    """ किसी ऊँचाई पर पीयर का स्नैपशॉट कमिटमेंट (दूसरे पीयर के स्नैपशॉट की पुष्टि के लिए) """
+    url = f'https://{node}/snapshot/commitment' if 'http' not in node and 'https' not in node else f'{node}/snapshot/commitment'
+
+    try:
+        response = requests.get(url, params={'height': height}, timeout=10)
+        if response.status_code != 200:
+            return None
+        return response.json()
+    except requests.exceptions.RequestException:
+        return None
+
+
+# ----------------------------------------------------
+# पीयर ट्रांसपोर्ट (Peer Transport)
+# ----------------------------------------------------
+
+class HttpTransport:
+    """
+    Blockchain और नेटवर्क के बीच की परत। डिफ़ॉल्ट रूप से ऊपर के ब्लॉकिंग `requests` फ़ंक्शन्स।
+    async रनटाइम (api/async_node.py) या सिम्युलेटर इसकी जगह अपना ट्रांसपोर्ट दे सकते हैं।
+    mode='inv' (डिफ़ॉल्ट): केवल IDs घोषित होती हैं; 'flood': पूरी बॉडी हर पीयर को।
+    """
+    def __init__(self, mode: str = GOSSIP_MODE):
+        self.mode = mode
+
+    def broadcast_transaction(self, blockchain: 'Blockchain', transaction: Dict[str, Any]):
+        if self.mode == 'flood':
+            return broadcast_transaction(blockchain, transaction)
+        return announce_inventory(blockchain, {'tx': [transaction_id(transaction)]})
+
+    def broadcast_transactions(self, blockchain: 'Blockchain', transactions: List[Dict[str, Any]]):
+        if self.mode == 'flood':
+            return broadcast_transactions(blockchain, transactions)
+        if transactions:
+            return announce_inventory(blockchain, {'tx': [transaction_id(tx) for tx in transactions]})
+
+    def broadcast_new_block(self, blockchain: 'Blockchain', block: Dict[str, Any]):
+        if self.mode == 'flood':
+            return broadcast_new_block(blockchain, block)
+        sent = announce_inventory(blockchain, {'block': [blockchain.hash(block)]})
+        print(f"P2P: Announcing new block {block['index']} to {sent} nodes.")
+        return sent
+
+    def fetch_chain(self, node: str) -> Optional[Dict[str, Any]]:
+        return fetch_chain(node)
+
+    def fetch_snapshot(self, node: str) -> Optional[Dict[str, Any]]:
+        return fetch_snapshot(node)
+
+    def fetch_snapshot_commitment(self, node: str, height: int) -> Optional[Dict[str, Any]]:
+        return fetch_snapshot_commitment(node, height)
@@ -0,0 +1,283 @@
+"""
+स्नैपशॉट सिंक (Snapshot Sync): नया नोड पूरी हिस्ट्री दोबारा चलाए बिना तुरंत सेवा शुरू कर सके।
+
+पीयर /snapshot पर देता है:
+    - ऊँचाई H तक के सभी ब्लॉक हेडर (ट्रांजैक्शन बॉडी के बिना, मूल हैश के साथ)
+    - H के बाद के हाल के पूरे ब्लॉक्स
+    - ब्लॉक H के बाद का बैलेंस स्टेट और उसका कमिटमेंट (SHA-256)
+
+नया नोड हेडर्स के PoW/लिंकेज जाँचता है, कमिटमेंट दोबारा गिनता है और उसे SNAPSHOT_COMMITMENT या
+कम से कम एक अन्य पीयर से मिलाता है (दोनों न हों तो स्नैपशॉट अस्वीकार, जब तक
+SNAPSHOT_ALLOW_UNVERIFIED=1 न हो), फिर चेन को pruned रूप में अपनाकर तुरंत शुरू हो जाता है।
+इसके बाद पूरी हिस्ट्री बैकग्राउंड में भरी जाती है और स्नैपशॉट को उससे दोबारा सत्यापित किया जाता है।
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .blockchain import Blockchain, block_header, node_identity
+from .chain_view import ChainView
+from wallet.ledger import replay_balances, to_units
+from utils.metrics import REGISTRY
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+# स्नैपशॉट के बाद कितने नवीनतम ब्लॉक्स पूरी बॉडी के साथ भेजे जाएँ (इनके भीतर reorg संभव है)
+SNAPSHOT_RECENT_BLOCKS = 100
+
+SNAPSHOT_SYNCS = REGISTRY.counter('mycoin_snapshot_sync_total', 'Snapshot sync attempts by outcome', ('outcome',))
+BACKFILLS = REGISTRY.counter('mycoin_snapshot_backfill_total', 'Background history backfills by outcome', ('outcome',))
+
+
+class SnapshotError(Exception):
+    """ स्नैपशॉट अमान्य है या उसे अपनाया नहीं जा सकता """
+
+
+# ----------------------------------------------------
+# 1. स्नैपशॉट बनाना (सर्वर साइड)
+# ----------------------------------------------------
+
+def snapshot_commitment(height: int, block_hash: str, balances: Dict[str, float]) -> str:
+    """ (ऊँचाई, उस ब्लॉक का हैश, बैलेंस) का कैनोनिकल SHA-256 कमिटमेंट """
+    payload = json.dumps({'height': height, 'block_hash': block_hash, 'balances': balances},
+                         sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def balances_at(view: ChainView, height: int) -> Dict[str, float]:
+    """ ब्लॉक `height` तक (सहित) का बैलेंस, प्रून स्नैपशॉट से शुरू करके (एक ही व्यू से, बिना लॉक) """
+    if height < view.pruned_height:
+        raise SnapshotError(f'Balances below pruned height {view.pruned_height} are not available')
+    # लेजर की पूर्णांक इकाइयों में रीप्ले; float केवल लौटाते समय
+    return replay_balances(view.chain[view.pruned_height:height], view.balance_snapshot)
+
+
+_cache_lock = threading.Lock()
+_cache: Dict[Tuple[int, str], Dict[str, Any]] = {}
+
+
+def build_snapshot(blockchain: Blockchain, recent_blocks: int = SNAPSHOT_RECENT_BLOCKS) -> Dict[str, Any]:
+    """
+    मौजूदा टिप के लिए स्नैपशॉट बनाता है। एक ही टिप के लिए परिणाम कैश रहता है,
+    इसलिए कई नए नोड्स एक साथ बूटस्ट्रैप करें तो बैलेंस केवल एक बार गिने जाते हैं।
+    """
+    view = blockchain.view
+    chain = view.chain
+    tip_key = (len(chain), blockchain.hash(chain[-1]))
+    with _cache_lock:
+        cached = _cache.get(tip_key)
+    if cached is not None:
+        return cached
+
+    height = max(view.pruned_height, len(chain) - recent_blocks, 1)
+    balances = balances_at(view, height)
+    block_hash = blockchain.hash(chain[height - 1])
+    headers = [block if 'transactions' not in block else block_header(block, blockchain.hash(block))
+               for block in chain[:height]]
+
+    snapshot = {
+        'height': height,
+        'block_hash': block_hash,
+        'headers': headers,
+        'blocks': list(chain[height:]),
+        'balances': balances,
+        'commitment': snapshot_commitment(height, block_hash, balances),
+        'difficulty': view.difficulty,
+        'length': len(chain),
+    }
+    with _cache_lock:
+        _cache.clear()
+        _cache[tip_key] = snapshot
+    return snapshot
+
+
+def commitment_at(blockchain: Blockchain, height: int) -> Optional[Dict[str, Any]]:
+    """ दूसरे पीयर के स्नैपशॉट की पुष्टि के लिए: किसी ऊँचाई पर हमारा कमिटमेंट """
+    view = blockchain.view
+    if height < 1 or height > len(view.chain) or height < view.pruned_height:
+        return None
+    block_hash = blockchain.hash(view.chain[height - 1])
+    balances = balances_at(view, height)
+    return {'height': height, 'block_hash': block_hash,
+            'commitment': snapshot_commitment(height, block_hash, balances)}
+
+
+# ----------------------------------------------------
+# 2. स्नैपशॉट सत्यापन और अपनाना (क्लाइंट साइड)
+# ----------------------------------------------------
+
+def verify_snapshot(blockchain: Blockchain, snapshot: Dict[str, Any], source: str) -> List[Dict[str, Any]]:
+    """
+    स्नैपशॉट जाँचता है और अपनाने लायक चेन (हेडर्स + हाल के ब्लॉक्स) रिटर्न करता है।
+    विफल होने पर SnapshotError।
+    """
+    height = snapshot['height']
+    headers = snapshot['headers']
+    chain = headers + snapshot['blocks']
+    balances = snapshot['balances']
+
+    if len(headers) != height or any('transactions' in header for header in headers):
+        raise SnapshotError('Header list does not match snapshot height')
+
+    # 1. हेडर्स + ब्लॉक्स: लिंकेज और PoW (हर प्रूफ पिछले ब्लॉक के हैश से बंधा है)
+    is_valid, reason = blockchain.is_valid_chain(chain)
+    if not is_valid:
+        raise SnapshotError(f'Invalid header chain: {reason}')
+    if Blockchain.hash(headers[-1]) != snapshot['block_hash']:
+        raise SnapshotError('Snapshot block hash does not match the header chain')
+
+    # 2. कमिटमेंट: पेलोड से दोबारा गिनें
+    commitment = snapshot_commitment(height, snapshot['block_hash'], balances)
+    if commitment != snapshot['commitment']:
+        raise SnapshotError('Balance state does not match its commitment')
+
+    # 3. कुल बैलेंस जारी किए गए कॉइनबेस से अधिक नहीं हो सकता
+    issued = sum(Blockchain.get_mining_reward(index) for index in range(1, height + 1))
+    if sum(balances.values()) > issued + 1e-6:
+        raise SnapshotError('Snapshot balances exceed the issued supply')
+
+    # 4. विश्वसनीय कमिटमेंट: ऑपरेटर द्वारा दिया गया, या बाकी पीयर्स से मिलान।
+    # ऊपर की जाँच पेलोड की उसी से तुलना है; स्वतंत्र पुष्टि के बिना झूठे बैलेंस पकड़े नहीं जाते।
+    trusted = os.environ.get('SNAPSHOT_COMMITMENT')
+    if trusted and trusted != commitment:
+        raise SnapshotError('Snapshot commitment does not match SNAPSHOT_COMMITMENT')
+    # source कच्चा --connect URL है; नोड लिस्ट register_node से सामान्यीकृत, इसलिए पहचान से तुलना
+    source_identity = node_identity(source)
+    agreeing = set()
+    for node in blockchain.view.nodes:
+        identity = node_identity(node)
+        if identity == source_identity or identity in agreeing:
+            continue
+        other = blockchain.transport.fetch_snapshot_commitment(node, height)
+        if other is None or other['block_hash'] != snapshot['block_hash']:
+            continue
+        if other['commitment'] != commitment:
+            raise SnapshotError(f'Peer {node} disagrees with the snapshot commitment')
+        agreeing.add(identity)
+
+    if not trusted and not agreeing:
+        if not allow_unverified():
+            raise SnapshotError('No SNAPSHOT_COMMITMENT and no other peer confirmed the commitment '
+                                '(set SNAPSHOT_ALLOW_UNVERIFIED=1 to accept it anyway)')
+        print(f"WARN: Snapshot from {source} is UNVERIFIED: no SNAPSHOT_COMMITMENT and no other peer confirmed "
+              f"its balances; only the background history backfill (not on pruned nodes) can check it")
+        SNAPSHOT_SYNCS.inc(1, ('unverified',))
+
+    return chain
+
+
+def apply_snapshot(blockchain: Blockchain, snapshot: Dict[str, Any], chain: List[Dict[str, Any]]):
+    """ सत्यापित स्नैपशॉट अपनाता है: ऊँचाई H तक की चेन हेडर्स हैं और उनका असर बैलेंस स्नैपशॉट में है """
+    with blockchain.lock:
+        blockchain.pruned_height = snapshot['height']
+        blockchain.balance_snapshot = dict(snapshot['balances'])
+        blockchain.difficulty = snapshot['difficulty']
+        blockchain.replace_chain(chain)
+
+
+def snapshot_sync(blockchain: Blockchain, node: str, backfill: bool = True) -> bool:
+    """
+    `node` से स्नैपशॉट लेकर बूटस्ट्रैप करता है। False = स्नैपशॉट उपयोगी नहीं था
+    (तब कॉलर सामान्य resolve_conflicts कर सकता है)।
+    """
+    snapshot = blockchain.transport.fetch_snapshot(node)
+    if snapshot is None:
+        SNAPSHOT_SYNCS.inc(1, ('unreachable',))
+        return False
+    if snapshot['length'] <= len(blockchain.chain):
+        SNAPSHOT_SYNCS.inc(1, ('not_longer',))
+        return False
+
+    try:
+        chain = verify_snapshot(blockchain, snapshot, node)
+    except (SnapshotError, KeyError, TypeError) as e:
+        print(f"WARN: Rejected snapshot from {node}: {e}")
+        SNAPSHOT_SYNCS.inc(1, ('rejected',))
+        return False
+
+    apply_snapshot(blockchain, snapshot, chain)
+    SNAPSHOT_SYNCS.inc(1, ('applied',))
+    print(f"Snapshot sync: adopted {len(chain)} blocks (state at height {snapshot['height']}) from {node}")
+
+    # pruned नोड को पुरानी हिस्ट्री की ज़रूरत नहीं
+    if backfill and not blockchain.prune_depth:
+        threading.Thread(target=backfill_history, args=(blockchain, node, snapshot),
+                         name='snapshot-backfill', daemon=True).start()
+    return True
+
+
+# ----------------------------------------------------
+# 3. बैकग्राउंड हिस्ट्री बैकफ़िल
+# ----------------------------------------------------
+
+def backfill_history(blockchain: Blockchain, node: str, snapshot: Dict[str, Any]) -> bool:
+    """
+    पीयर से पूरी चेन लाकर हेडर्स की जगह पूरे ब्लॉक्स भरता है और स्नैपशॉट बैलेंस को
+    पूरी हिस्ट्री के रीप्ले से मिलाता है। मेल न खाने पर पूरी, सत्यापित चेन अपनाई जाती है।
+    """
+    height = snapshot['height']
+    data = blockchain.transport.fetch_chain(node)
+    if data is None or data.get('pruned_height', 0) or len(data['chain']) < height:
+        print(f"WARN: Backfill from {node} failed: full history not available")
+        BACKFILLS.inc(1, ('unavailable',))
+        return False
+
+    history = data['chain'][:height]
+    # हर पूरे ब्लॉक का असली हैश उसके हेडर में दर्ज हैश के बराबर होना चाहिए
+    for block, header in zip(history, snapshot['headers']):
+        if 'transactions' not in block or Blockchain.hash(block) != header['hash']:
+            print(f"WARN: Backfill from {node} failed: block {header['index']} does not match its header")
+            BACKFILLS.inc(1, ('mismatch',))
+            return False
+
+    replayed = replay_balances(history)
+    expected = snapshot['balances']
+    # पूर्णांक इकाइयों में सटीक तुलना
+    consistent = replayed.keys() == expected.keys() and all(
+        to_units(replayed[address]) == to_units(expected[address]) for address in expected)
+
+    if not consistent:
+        # स्नैपशॉट गलत था: पूरी हिस्ट्री वाली चेन को सामान्य सत्यापन से अपनाएँ
+        print(f"ERROR: Snapshot from {node} does not match replayed history, adopting full chain instead")
+        BACKFILLS.inc(1, ('inconsistent',))
+        is_valid, _ = blockchain.is_valid_chain(data['chain'])
+        if is_valid:
+            with blockchain.lock:
+                blockchain.pruned_height = 0
+                blockchain.balance_snapshot = {}
+                blockchain.replace_chain(data['chain'])
+        return False
+
+    with blockchain.lock:
+        # बीच में प्रून बिंदु से नीचे कुछ नहीं बदल सकता (वैसा reorg स्वीकार नहीं होता), फिर भी जाँचें
+        if blockchain.pruned_height != height:
+            BACKFILLS.inc(1, ('stale',))
+            return False
+
+        blockchain.chain = history + blockchain.chain[height:]
+        blockchain.pruned_height = 0
+        blockchain.balance_snapshot = {}
+        blockchain.publish_view()
+    blockchain.save()
+    BACKFILLS.inc(1, ('completed',))
+    print(f"Snapshot backfill: restored {height} historical blocks from {node}")
+    return True
+
+
+# ----------------------------------------------------
+# 4. शुरुआती सिंक (सभी रनटाइम्स के लिए)
+# ----------------------------------------------------
+
+def snapshot_sync_enabled() -> bool:
+    """ SNAPSHOT_SYNC=1 ENV से स्नैपशॉट सिंक चालू होता है (--snapshot-sync के बराबर) """
+    return os.environ.get('SNAPSHOT_SYNC', '').lower() in ('1', 'true', 'yes')
+
+
+def allow_unverified() -> bool:
+    """ SNAPSHOT_ALLOW_UNVERIFIED=1: बिना स्वतंत्र पुष्टि वाला स्नैपशॉट चेतावनी के साथ अपनाएँ """
+    return os.environ.get('SNAPSHOT_ALLOW_UNVERIFIED', '').lower() in ('1', 'true', 'yes')
+
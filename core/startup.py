@@ -0,0 +1,163 @@
+"""
+नोड का नॉन-ब्लॉकिंग स्टार्टअप (Non-blocking Startup)।
+
+HTTP सर्वर तुरंत पोर्ट बाँधता है; भारी काम एक बैकग्राउंड थ्रेड में होता है:
+    1. loading: डिस्क से चेन पढ़ना + बैलेंस रीप्ले (Blockchain.load_state)
+    2. syncing: दिए गए पीयर्स को रजिस्टर करना, स्नैपशॉट सिंक (यदि चालू हो) और सर्वसम्मति
+    3. ready
+
+लोड पूरा होने तक API चेन पर निर्भर अनुरोधों को 503 देता है। /health (प्रोसेस ज़िंदा है) और
+/ready (लोड + शुरुआती सिंक पूरा) प्रगति `NodeStartup.status()` से दिखाते हैं।
+पीयर तक न पहुँच पाना नोड को नहीं रोकता: सिंक की गलती दर्ज होती है और नोड लोकल चेन से ready होता है।
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.blockchain import Blockchain
+from core.snapshot import snapshot_sync
+from utils.metrics import REGISTRY
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+PHASE_STARTING = 'starting'
+PHASE_LOADING = 'loading'
+PHASE_SYNCING = 'syncing'
+PHASE_READY = 'ready'
+PHASE_FAILED = 'failed'
+
+STARTUP_SECONDS = REGISTRY.gauge('mycoin_startup_duration_seconds',
+                                 'Time spent in each startup stage', ('stage',))
+
+
+class NodeStartup:
+    """ Blockchain को बैकग्राउंड में लोड और सिंक करता है, और उसकी प्रगति बताता है """
+    def __init__(self, blockchain: Blockchain):
+        self.blockchain = blockchain
+        self.phase = PHASE_STARTING
+        self.started_at = time.time()
+        self.loaded_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.error: Optional[str] = None
+        # सिंक की प्रगति
+        self.sync: Dict[str, Any] = {'peers': [], 'stage': None, 'current_peer': None,
+                                     'replaced': False, 'error': None}
+        # (peer, use_snapshot) जो अभी सिंक होने बाकी हैं
+        self._pending: List[Tuple[str, bool]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    @property
+    def ready(self) -> bool:
+        return self.phase == PHASE_READY
+
+    def start(self, peers: Sequence[str] = (), use_snapshot: bool = False) -> 'NodeStartup':
+        """ बैकग्राउंड लोड शुरू करता है (तुरंत लौटता है)। peers लोड के बाद सिंक होते हैं। """
+        self.connect(peers, use_snapshot)
+        with self._lock:
+            self._spawn()
+        return self
+
+    def connect(self, peers: Sequence[str], use_snapshot: bool = False):
+        """
+        और पीयर्स जोड़ता है (जैसे blockchain_app के --connect)। लोड के बाद बुलाया जाए तो नया
+        सिंक शुरू होता है और तब तक नोड ready नहीं रहता।
+        """
+        with self._lock:
+            # पहले से जोड़े गए पीयर्स दोबारा सिंक न करें
+            peers = list(dict.fromkeys(peer.strip() for peer in peers
+                                       if peer and peer.strip() and peer.strip() not in self.sync['peers']))
+            if not peers:
+                return
+            self._pending.extend((peer, use_snapshot) for peer in peers)
+            self.sync['peers'].extend(peers)
+            if self.loaded and self.phase != PHASE_FAILED:
+                self.phase = PHASE_SYNCING
+                self.ready_at = None
+                self._spawn()
+
+    def _spawn(self):
+        # self._lock के अंदर
+        if self._thread is None and self.phase != PHASE_FAILED:
+            self._thread = threading.Thread(target=self._run, name='node-startup', daemon=True)
+            self._thread.start()
+
+    def status(self) -> Dict[str, Any]:
+        """ /health और /ready के लिए JSON """
+        now = time.time()
+        view = self.blockchain.view if self.loaded else None
+        return {
+            'phase': self.phase,
+            'loaded': self.loaded,
+            'ready': self.ready,
+            'uptime_s': round(now - self.started_at, 3),
+            'load_s': round(self.loaded_at - self.started_at, 3) if self.loaded_at else None,
+            'ready_s': round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+            'chain_length': view.length if view else None,
+            'error': self.error,
+            'sync': dict(self.sync, peers=list(self.sync['peers'])),
+        }
+
+    # ------------------------------------------------
+    # बैकग्राउंड थ्रेड
+    # ------------------------------------------------
+    def _run(self):
+        if not self.loaded:
+            self.phase = PHASE_LOADING
+            try:
+                self.blockchain.load_state()
+            except Exception as e:
+                print(f"ERROR: Failed to load chain state: {e}")
+                with self._lock:
+                    self.error = f'{type(e).__name__}: {e}'
+                    self.phase = PHASE_FAILED
+                    self._thread = None
+                return
+            self.loaded_at = time.time()
+            STARTUP_SECONDS.set(self.loaded_at - self.started_at, ('load',))
+            print(f"INFO: Chain state loaded in {self.loaded_at - self.started_at:.2f}s")
+
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self.phase = PHASE_READY
+                    self.ready_at = time.time()
+                    self.sync['stage'] = self.sync['current_peer'] = None
+                    self._thread = None
+                    STARTUP_SECONDS.set(self.ready_at - self.loaded_at, ('sync',))
+                    return
+                batch, self._pending = self._pending, []
+                self.phase = PHASE_SYNCING
+            self._sync(batch)
+
+    def _sync(self, batch: List[Tuple[str, bool]]):
+        """ पीयर्स रजिस्टर करें, फिर पहला सत्यापित स्नैपशॉट (यदि माँगा), फिर एक बार सर्वसम्मति """
+        try:
+            for peer, _ in batch:
+                self.blockchain.register_node(peer)
+
+            self.sync['stage'] = 'snapshot'
+            for peer, use_snapshot in batch:
+                if use_snapshot:
+                    self.sync['current_peer'] = peer
+                    if snapshot_sync(self.blockchain, peer):
+                        self.sync['replaced'] = True
+                        break
+
+            self.sync['stage'] = 'consensus'
+            self.sync['current_peer'] = None
+            if self.blockchain.resolve_conflicts():
+                self.sync['replaced'] = True
+                print("Chain successfully synchronized with the network.")
+            else:
+                print("Local chain is authoritative.")
+        except Exception as e:
+            # पीयर की गड़बड़ी से नोड न रुके: लोकल चेन के साथ आगे बढ़ें
+            print(f"WARN: Startup sync failed: {e}")
+            self.sync['error'] = f'{type(e).__name__}: {e}'
@@ -0,0 +1,425 @@
+import os
+import time
+from uuid import uuid4
+from multiprocessing import Process
+from multiprocessing.managers import BaseManager, BaseProxy
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from .blockchain import Blockchain, record_pow
+from .chain_view import ChainView
+from .snapshot import build_snapshot, commitment_at, snapshot_sync_enabled
+from .startup import NodeStartup
+from .work_manager import WorkManager
+from utils.metrics import REGISTRY
+from utils.profiling import span
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स (Global Constants)
+# ----------------------------------------------------
+
+# Gunicorn वर्कर्स और स्टेट ओनर प्रोसेस के बीच लोकल IPC चैनल का पता
+STATE_ADDRESS_ENV = 'CHAIN_STATE_ADDRESS'
+STATE_AUTHKEY_ENV = 'CHAIN_STATE_AUTHKEY'
+DEFAULT_STATE_ADDRESS = '127.0.0.1:5999'
+CONNECT_RETRY_SECONDS = 10
+
+
+def parse_state_address(address: str) -> Union[Tuple[str, int], str]:
+    """
+    'host:port' को TCP टपल में बदलता है; बाकी सब कुछ Unix socket पाथ माना जाता है।
+    """
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return host or '127.0.0.1', int(port)
+    return address
+
+
+# ----------------------------------------------------
+# 1. स्टेट ओनर (Owner Process में चलने वाला ऑब्जेक्ट)
+# ----------------------------------------------------
+
+class ChainStateOwner:
+    """
+    एकमात्र आधिकारिक (authoritative) Blockchain को रखता है।
+    सभी HTTP वर्कर्स इसी ऑब्जेक्ट से IPC के ज़रिए बात करते हैं, ताकि चेन,
+    मेमोरी पूल और बैलेंस हर वर्कर में अलग-अलग न हों।
+    """
+    def __init__(self, blockchain: Blockchain, startup: NodeStartup):
+        self.blockchain = blockchain
+        self.startup = startup
+        # रिमोट माइनर्स का काम भी यहीं (हर वर्कर को वही work_id और नॉन्स रेंज दिखें)
+        self.work = WorkManager(blockchain)
+
+    # --- पढ़ने वाले मेथड्स (Read) ---
+    def get_view(self) -> ChainView:
+        return self.blockchain.view
+
+    def get_chain(self) -> List[Dict[str, Any]]:
+        return list(self.blockchain.view.chain)
+
+    def get_last_block(self) -> Dict[str, Any]:
+        return self.blockchain.view.last_block
+
+    def get_difficulty(self) -> int:
+        return self.blockchain.view.difficulty
+
+    def get_mining_target(self) -> Tuple[Dict[str, Any], int]:
+        return self.blockchain.mining_target()
+
+    def get_nodes(self) -> Set[str]:
+        return set(self.blockchain.view.nodes)
+
+    def get_chain_length(self) -> int:
+        return self.blockchain.chain_length()
+
+    def get_chain_slice(self, start: int, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.blockchain.chain_slice(start, stop)
+
+    def get_node_address(self) -> str:
+        return self.blockchain.node_address
+
+    def get_pruned_height(self) -> int:
+        return self.blockchain.view.pruned_height
+
+    def get_tip_key(self) -> str:
+        return self.blockchain.tip_key
+
+    def startup_status(self) -> Dict[str, Any]:
+        return self.startup.status()
+
+    def get_balance(self, address: str) -> float:
+        return self.blockchain.get_balance(address)
+
+    # --- लिखने वाले मेथड्स (Write) ---
+    def new_block(self, proof: int, previous_hash: str, miner_address: str) -> Optional[Dict[str, Any]]:
+        return self.blockchain.new_block(proof, previous_hash, miner_address)
+
+    def new_transaction(self, sender: str, recipient: str, amount: float, signature: str, prechecked: bool = False):
+        return self.blockchain.new_transaction(sender, recipient, amount, signature, prechecked)
+
+    def new_transactions_batch(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.blockchain.new_transactions_batch(transactions)
+
+    def precheck_transaction(self, sender: str, recipient: str, amount: float, signature: str) -> Optional[str]:
+        return self.blockchain.precheck_transaction(sender, recipient, amount, signature)
+
+    def classify_block(self, block: Dict[str, Any]) -> str:
+        return self.blockchain.classify_block(block)
+
+    def add_block(self, block: Dict[str, Any], trace: Optional[Dict[str, Any]] = None,
+                  received_at: Optional[float] = None) -> Tuple[bool, str]:
+        return self.blockchain.add_block(block, trace, received_at)
+
+    def want_inventory(self, inventory: Dict[str, Any]) -> Dict[str, List[str]]:
+        return self.blockchain.want_inventory(inventory)
+
+    def get_work(self, miner: str, reward_address: str) -> Optional[Dict[str, Any]]:
+        return self.work.get_work(miner, reward_address)
+
+    def submit_work(self, work_id: str, nonce: Any) -> Dict[str, Any]:
+        return self.work.submit(work_id, nonce)
+
+    def work_status(self, work_id: str) -> Dict[str, Any]:
+        return self.work.status(work_id)
+
+    def work_miners(self) -> Dict[str, Any]:
+        return self.work.miners()
+
+    def register_node(self, address: str):
+        self.blockchain.register_node(address)
+
+    def resolve_conflicts(self, block: Optional[Dict[str, Any]] = None, trace: Optional[Dict[str, Any]] = None,
+                          received_at: Optional[float] = None) -> bool:
+        return self.blockchain.resolve_conflicts(block, trace, received_at)
+
+    def recent_traces(self, trace_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        return self.blockchain.tracer.recent(trace_id, limit)
+
+    def recalculate_balances(self) -> Dict[str, float]:
+        with self.blockchain.lock:
+            balances = self.blockchain.balance_manager.recalculate_balances()
+            self.blockchain.publish_view()
+        return dict(balances)
+
+    def save(self):
+        self.blockchain.save()
+
+    def read_events(self, cursor: int, timeout: float) -> Tuple[List[Any], int, bool]:
+        # हर प्रॉक्सी कनेक्शन का अपना सर्वर थ्रेड होता है, इसलिए यहाँ रुकना दूसरों को नहीं रोकता
+        return self.blockchain.events.read(cursor, timeout)
+
+    def get_events_seq(self) -> int:
+        return self.blockchain.events.seq
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        return build_snapshot(self.blockchain)
+
+    def get_snapshot_commitment(self, height: int) -> Optional[Dict[str, Any]]:
+        return commitment_at(self.blockchain, height)
+
+    def metrics_text(self) -> str:
+        # persistence, consensus आदि के मेट्रिक्स इसी प्रोसेस में दर्ज होते हैं (PoW के वर्कर में)
+        return REGISTRY.render()
+
+
+# ----------------------------------------------------
+# 2. वर्कर साइड प्रॉक्सी (Blockchain जैसा इंटरफ़ेस)
+# ----------------------------------------------------
+
+class _RemoteBalanceManager:
+    """ प्रॉक्सी के लिए BalanceManager जैसा छोटा इंटरफ़ेस """
+    def __init__(self, proxy: 'BlockchainProxy'):
+        self._proxy = proxy
+
+    def get_balance(self, address: str) -> float:
+        return self._proxy._callmethod('get_balance', (address,))
+
+    def recalculate_balances(self) -> Dict[str, float]:
+        return self._proxy._callmethod('recalculate_balances')
+
+
+class _RemoteEvents:
+    """ प्रॉक्सी के लिए EventBus जैसा इंटरफ़ेस (केवल पढ़ने के लिए) """
+    def __init__(self, proxy: 'BlockchainProxy'):
+        self._proxy = proxy
+
+    @property
+    def seq(self) -> int:
+        return self._proxy._callmethod('get_events_seq')
+
+    def read(self, cursor: int, timeout: float = 0.0) -> Tuple[List[Any], int, bool]:
+        return self._proxy._callmethod('read_events', (cursor, timeout))
+
+
+class _RemoteWork:
+    """ प्रॉक्सी के लिए WorkManager जैसा इंटरफ़ेस """
+    def __init__(self, proxy: 'BlockchainProxy'):
+        self._proxy = proxy
+
+    def get_work(self, miner: str, reward_address: str) -> Optional[Dict[str, Any]]:
+        return self._proxy._callmethod('get_work', (miner, reward_address))
+
+    def submit(self, work_id: str, nonce: Any) -> Dict[str, Any]:
+        return self._proxy._callmethod('submit_work', (work_id, nonce))
+
+    def status(self, work_id: str) -> Dict[str, Any]:
+        return self._proxy._callmethod('work_status', (work_id,))
+
+    def miners(self) -> Dict[str, Any]:
+        return self._proxy._callmethod('work_miners')
+
+
+class _RemoteTracer:
+    """ प्रॉक्सी के लिए BlockTracer जैसा (केवल पढ़ने वाला) इंटरफ़ेस """
+    def __init__(self, proxy: 'BlockchainProxy'):
+        self._proxy = proxy
+
+    def recent(self, trace_id: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        return self._proxy._callmethod('recent_traces', (trace_id, limit))
+
+
+class BlockchainProxy(BaseProxy):
+    """
+    HTTP वर्कर में Blockchain की जगह इस्तेमाल होता है।
+    हर एट्रिब्यूट/मेथड कॉल स्टेट ओनर प्रोसेस तक भेजी जाती है।
+    """
+    _exposed_ = (
+        'get_view', 'get_chain', 'get_chain_length', 'get_chain_slice', 'get_last_block', 'get_difficulty', 'get_nodes', 'get_node_address', 'get_pruned_height',
+        'get_tip_key', 'get_balance', 'get_mining_target', 'new_block', 'new_transaction', 'new_transactions_batch',
+        'register_node', 'resolve_conflicts', 'recalculate_balances', 'save', 'metrics_text', 'read_events',
+        'get_events_seq', 'get_snapshot', 'get_snapshot_commitment', 'precheck_transaction', 'classify_block',
+        'add_block', 'startup_status', 'want_inventory', 'get_work', 'submit_work', 'work_status', 'work_miners',
+        'recent_traces',
+    )
+
+    # Blockchain के स्टैटिक मेथड्स को लोकली ही चलाएँ (IPC की ज़रूरत नहीं)
+    hash = staticmethod(Blockchain.hash)
+    valid_proof = staticmethod(Blockchain.valid_proof)
+    get_mining_reward = staticmethod(Blockchain.get_mining_reward)
+
+    @property
+    def view(self) -> ChainView:
+        return self._callmethod('get_view')
+
+    @property
+    def chain(self) -> List[Dict[str, Any]]:
+        return self._callmethod('get_chain')
+
+    @property
+    def last_block(self) -> Dict[str, Any]:
+        return self._callmethod('get_last_block')
+
+    @property
+    def difficulty(self) -> int:
+        return self._callmethod('get_difficulty')
+
+    @property
+    def nodes(self) -> Set[str]:
+        return self._callmethod('get_nodes')
+
+    @property
+    def node_address(self) -> str:
+        return self._callmethod('get_node_address')
+
+    @property
+    def pruned_height(self) -> int:
+        return self._callmethod('get_pruned_height')
+
+    @property
+    def tip_key(self) -> str:
+        return self._callmethod('get_tip_key')
+
+    @property
+    def balance_manager(self) -> _RemoteBalanceManager:
+        return _RemoteBalanceManager(self)
+
+    @property
+    def events(self) -> _RemoteEvents:
+        return _RemoteEvents(self)
+
+    @property
+    def work(self) -> _RemoteWork:
+        return _RemoteWork(self)
+
+    @property
+    def tracer(self) -> _RemoteTracer:
+        return _RemoteTracer(self)
+
+    def mining_target(self) -> Tuple[Dict[str, Any], int]:
+        return self._callmethod('get_mining_target')
+
+    def peer_nodes(self) -> Set[str]:
+        return self._callmethod('get_nodes')
+
+    def chain_length(self) -> int:
+        return self._callmethod('get_chain_length')
+
+    def chain_slice(self, start: int, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._callmethod('get_chain_slice', (start, stop))
+
+    def proof_of_work(self, last_block: Dict[str, Any], difficulty: Optional[int] = None) -> int:
+        """
+        नॉन्स खोज इसी वर्कर प्रोसेस में: ओनर में चलती तो उसका GIL पूरी खोज तक पकड़ा रहता और
+        बाकी वर्कर्स की हर IPC कॉल (/chain, /balance, /transactions/new) रुकी रहती।
+        """
+        if difficulty is None:
+            difficulty = self.difficulty
+        start = time.perf_counter()
+        with span('pow_loop'):
+            proof = Blockchain.search_proof(Blockchain.hash(last_block), difficulty)
+        record_pow(proof + 1, time.perf_counter() - start)
+        return proof
+
+    def new_block(self, proof: int, previous_hash: str, miner_address: str) -> Optional[Dict[str, Any]]:
+        return self._callmethod('new_block', (proof, previous_hash, miner_address))
+
+    def get_balance(self, address: str) -> float:
+        return self._callmethod('get_balance', (address,))
+
+    def new_transaction(self, sender: str, recipient: str, amount: float, signature: str, prechecked: bool = False):
+        return self._callmethod('new_transaction', (sender, recipient, amount, signature, prechecked))
+
+    def new_transactions_batch(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self._callmethod('new_transactions_batch', (transactions,))
+
+    def precheck_transaction(self, sender: str, recipient: str, amount: float, signature: str) -> Optional[str]:
+        return self._callmethod('precheck_transaction', (sender, recipient, amount, signature))
+
+    def classify_block(self, block: Dict[str, Any]) -> str:
+        return self._callmethod('classify_block', (block,))
+
+    def add_block(self, block: Dict[str, Any], trace: Optional[Dict[str, Any]] = None,
+                  received_at: Optional[float] = None) -> Tuple[bool, str]:
+        return self._callmethod('add_block', (block, trace, received_at))
+
+    def want_inventory(self, inventory: Dict[str, Any]) -> Dict[str, List[str]]:
+        return self._callmethod('want_inventory', (inventory,))
+
+    def register_node(self, address: str):
+        return self._callmethod('register_node', (address,))
+
+    def resolve_conflicts(self, block: Optional[Dict[str, Any]] = None, trace: Optional[Dict[str, Any]] = None,
+                          received_at: Optional[float] = None) -> bool:
+        return self._callmethod('resolve_conflicts', (block, trace, received_at))
+
+    def save(self):
+        return self._callmethod('save')
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        return self._callmethod('get_snapshot')
+
+    def get_snapshot_commitment(self, height: int) -> Optional[Dict[str, Any]]:
+        return self._callmethod('get_snapshot_commitment', (height,))
+
+    def metrics_text(self) -> str:
+        return self._callmethod('metrics_text')
+
+    def startup_status(self) -> Dict[str, Any]:
+        return self._callmethod('startup_status')
+
+
+class ChainStateManager(BaseManager):
+    pass
+
+
+# ----------------------------------------------------
+# 3. ओनर प्रोसेस शुरू करना और उससे जुड़ना
+# ----------------------------------------------------
+
+def run_state_owner(address: str, authkey: str, node_address: Optional[str] = None,
+                    connect_node_url: Optional[str] = None):
+    """
+    स्टेट ओनर प्रोसेस का एंट्री पॉइंट: IPC सर्वर तुरंत चलाता है; Blockchain का लोड और
+    पीयर सिंक बैकग्राउंड में होता है (वर्कर्स तब तक /ready पर 503 देते हैं)।
+    """
+    blockchain = Blockchain(node_address=node_address or str(uuid4()).replace('-', ''), defer_load=True)
+
+    if connect_node_url:
+        print(f"INFO: State owner will connect to network peer: {connect_node_url}")
+    startup = NodeStartup(blockchain).start([connect_node_url] if connect_node_url else [],
+                                            snapshot_sync_enabled())
+
+    owner = ChainStateOwner(blockchain, startup)
+    ChainStateManager.register('get_state', callable=lambda: owner, proxytype=BlockchainProxy)
+
+    manager = ChainStateManager(address=parse_state_address(address), authkey=authkey.encode())
+    server = manager.get_server()
+    print(f"INFO: Chain state owner serving on {address}")
+    server.serve_forever()
+
+
+def start_state_owner(address: str, authkey: str, **kwargs) -> Process:
+    """ स्टेट ओनर को एक अलग (daemon) प्रोसेस में शुरू करता है। Gunicorn मास्टर से बुलाया जाता है। """
+    process = Process(target=run_state_owner, args=(address, authkey), kwargs=kwargs,
+                      name='chain-state-owner', daemon=True)
+    process.start()
+    return process
+
+
+def connect_state_owner(address: str, authkey: str) -> BlockchainProxy:
+    """
+    वर्कर प्रोसेस से स्टेट ओनर तक कनेक्ट करता है और Blockchain प्रॉक्सी रिटर्न करता है।
+    ओनर अभी शुरू हो रहा हो सकता है, इसलिए कुछ सेकंड तक पुनः प्रयास करता है।
+    """
+    ChainStateManager.register('get_state', proxytype=BlockchainProxy)
+    manager = ChainStateManager(address=parse_state_address(address), authkey=authkey.encode())
+
+    deadline = time.monotonic() + CONNECT_RETRY_SECONDS
+    while True:
+        try:
+            manager.connect()
+            break
+        except (ConnectionRefusedError, FileNotFoundError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+    return manager.get_state()
+
+
+def connect_from_env() -> Optional[BlockchainProxy]:
+    """ यदि ENV में स्टेट ओनर का पता सेट है तो उससे कनेक्ट करें, अन्यथा None """
+    address = os.environ.get(STATE_ADDRESS_ENV)
+    if not address:
+        return None
+    return connect_state_owner(address, os.environ.get(STATE_AUTHKEY_ENV, ''))
@@ -0,0 +1,189 @@
+"""
+ब्लॉक प्रसार ट्रेसिंग (Block Propagation Tracing)।
+
+ब्लॉक देर से पहुँचे तो समय कहाँ गया: PoW के बाद चेन में जोड़ना, save_blockchain, प्रसारण लूप,
+पीयर का resolve_conflicts डाउनलोड या सत्यापन? इसके लिए हर ब्लॉक का एक ट्रेस होता है:
+    trace_id = ब्लॉक हैश (हर नोड पर वही, इसलिए बिना संदर्भ के आया ब्लॉक भी उसी ट्रेस में जुड़ता है)
+    संदर्भ (trace context) बॉडी के साथ /blocks/new में जाता है: {'block': {...}, 'trace': {...}}
+        origin, created_at -> ब्लॉक बनाने वाला नोड और वहाँ PoW पूरा होने का समय
+        hop                -> origin से दूरी (origin = 0)
+        from, sent_at      -> भेजने वाला नोड और भेजने का समय (नेटवर्क में बिताया समय)
+संदर्भ ब्लॉक के बाहर है, इसलिए ब्लॉक हैश और PoW नहीं बदलते; पुराने पीयर्स इसे अनदेखा करते हैं।
+
+हर नोड अपने स्पैन दर्ज करता है: receive, validate, apply, persist, forward (प्रति पीयर), और
+सर्वसम्मति से आए ब्लॉक के लिए download (प्रति पीयर)। समय दीवार-घड़ी (time.time) है, ताकि एक ही
+होस्ट के कई नोड्स के स्पैन बिना समायोजन के एक टाइमलाइन में मिलें (अलग होस्ट्स पर NTP चाहिए)।
+
+स्पैन मेमोरी में रहते हैं (हाल के MAX_RECENT_SPANS, GET /admin/traces) और TRACE_DIR सेट हो तो
+<TRACE_DIR>/<node>.<pid>.jsonl में भी लिखे जाते हैं। एक होस्ट के सभी नोड्स को एक ही TRACE_DIR
+दें; benchmarks/trace_collector.py सारी फ़ाइलें पढ़कर हर ब्लॉक की प्रसार टाइमलाइन बनाता है।
+"""
+import json
+import os
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from utils.metrics import REGISTRY
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स (ENV से बदली जा सकती हैं)
+# ----------------------------------------------------
+
+# स्पैन फ़ाइलों की डायरेक्टरी (सेट न हो तो केवल मेमोरी में)
+TRACE_DIR = os.environ.get('TRACE_DIR')
+# ट्रेस में इस नोड का नाम (डिफ़ॉल्ट: <host>:<PORT>, ताकि एक होस्ट के नोड्स अलग दिखें)
+TRACE_NODE_NAME = os.environ.get('TRACE_NODE_NAME')
+# मेमोरी में रखे गए हाल के स्पैन
+MAX_RECENT_SPANS = 20_000
+# इतने हाल के ब्लॉक्स का संदर्भ याद रहता है (आगे भेजते समय जोड़ने के लिए)
+MAX_TRACKED_BLOCKS = 2_000
+# पीयर से आए संदर्भ के स्ट्रिंग फ़ील्ड्स की अधिकतम लंबाई
+MAX_CONTEXT_FIELD = 128
+
+SPANS_RECORDED = REGISTRY.counter('mycoin_trace_spans_total', 'Block propagation spans recorded', ('span',))
+PROPAGATION_SECONDS = REGISTRY.histogram('mycoin_block_propagation_seconds',
+                                         'Delay from block creation on the origin node to local apply')
+
+
+def default_node_name(port: Any = None) -> str:
+    return TRACE_NODE_NAME or f"{socket.gethostname()}:{port or os.environ.get('PORT', 5000)}"
+
+
+def _text(value: Any) -> Optional[str]:
+    return str(value)[:MAX_CONTEXT_FIELD] if value is not None else None
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+# ----------------------------------------------------
+# 1. प्रति-नोड ट्रेसर
+# ----------------------------------------------------
+
+class BlockTracer:
+    """
+    Blockchain का ट्रेसिंग हिस्सा। हर स्पैन एक JSON पंक्ति है:
+        {'trace_id', 'index', 'node', 'span', 'start', 'end', 'duration_ms', 'hop', 'origin', 'created_at', ...}
+    अतिरिक्त फ़ील्ड्स: peer, result, mode (forward/download) और from, sent_at (receive)।
+    """
+    def __init__(self, node: Optional[str] = None, directory: Optional[str] = TRACE_DIR,
+                 clock: Callable[[], float] = time.time):
+        self.node = node or default_node_name()
+        self.directory = directory
+        self.clock = clock
+        self._contexts: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=MAX_RECENT_SPANS)
+        self._lock = threading.Lock()
+        self._file = None
+
+    # ------------------------------------------------
+    # संदर्भ (Context)
+    # ------------------------------------------------
+    def begin(self, block_hash: str, index: Any, context: Optional[Dict[str, Any]] = None,
+              created_at: Optional[float] = None) -> Dict[str, Any]:
+        """
+        ब्लॉक का संदर्भ दर्ज करता है। context = पीयर से आया संदर्भ; न हो तो यह नोड origin है
+        (created_at = PoW पूरा होने का समय)। पहले से दर्ज ब्लॉक का संदर्भ नहीं बदलता।
+        """
+        with self._lock:
+            existing = self._contexts.get(block_hash)
+            if existing is not None:
+                return existing
+            if isinstance(context, dict):
+                hop = context.get('hop')
+                entry = {
+                    'index': index,
+                    'origin': _text(context.get('origin')),
+                    'created_at': _number(context.get('created_at')),
+                    'hop': hop + 1 if isinstance(hop, int) and not isinstance(hop, bool) else None,
+                }
+            elif created_at is not None:
+                entry = {'index': index, 'origin': self.node, 'created_at': created_at, 'hop': 0}
+            else:
+                # पीयर ने संदर्भ नहीं भेजा (पुराना नोड या सर्वसम्मति से आया ब्लॉक)
+                entry = {'index': index, 'origin': None, 'created_at': None, 'hop': None}
+            self._contexts[block_hash] = entry
+            while len(self._contexts) > MAX_TRACKED_BLOCKS:
+                self._contexts.popitem(last=False)
+            return entry
+
+    def outgoing(self, block_hash: str) -> Optional[Dict[str, Any]]:
+        """ /blocks/new के साथ भेजा जाने वाला संदर्भ (अज्ञात ब्लॉक पर None) """
+        with self._lock:
+            entry = self._contexts.get(block_hash)
+        if entry is None:
+            return None
+        return {'trace_id': block_hash, 'origin': entry['origin'], 'created_at': entry['created_at'],
+                'hop': entry['hop'], 'from': self.node, 'sent_at': self.clock()}
+
+    # ------------------------------------------------
+    # स्पैन (Spans)
+    # ------------------------------------------------
+    def record(self, block_hash: Optional[str], name: str, start: float, end: Optional[float] = None, **attrs):
+        if block_hash is None:
+            return
+        end = self.clock() if end is None else end
+        with self._lock:
+            entry = self._contexts.get(block_hash) or {}
+        item = {
+            'trace_id': block_hash, 'index': entry.get('index'), 'node': self.node, 'span': name,
+            'start': start, 'end': end, 'duration_ms': round((end - start) * 1000, 3),
+            'hop': entry.get('hop'), 'origin': entry.get('origin'), 'created_at': entry.get('created_at'),
+        }
+        item.update(attrs)
+        SPANS_RECORDED.inc(1, (name,))
+        # origin से यहाँ लागू होने तक का समय (एक होस्ट पर, या मिली हुई घड़ियों पर ही सार्थक)
+        if name == 'apply' and entry.get('hop') and entry.get('created_at') and attrs.get('result', 'ok') == 'ok':
+            PROPAGATION_SECONDS.observe(max(0.0, end - entry['created_at']))
+        self._write(item)
+
+    @contextmanager
+    def span(self, block_hash: Optional[str], name: str, **attrs) -> Iterator[Dict[str, Any]]:
+        """ कोड ब्लॉक को स्पैन में लपेटता है; लौटाए गए dict में result आदि जोड़े जा सकते हैं """
+        start = self.clock()
+        try:
+            yield attrs
+        finally:
+            self.record(block_hash, name, start, **attrs)
+
+    def receive(self, block_hash: str, index: Any, context: Optional[Dict[str, Any]],
+                received_at: Optional[float], **attrs):
+        """ पीयर से ब्लॉक आया: संदर्भ दर्ज करें और HTTP अनुरोध आने से अब तक का 'receive' स्पैन """
+        self.begin(block_hash, index, context)
+        if isinstance(context, dict):
+            attrs.setdefault('from', _text(context.get('from')))
+            attrs.setdefault('sent_at', _number(context.get('sent_at')))
+        self.record(block_hash, 'receive', received_at or self.clock(), **attrs)
+
+    def _write(self, item: Dict[str, Any]):
+        with self._lock:
+            self._recent.append(item)
+            if not self.directory:
+                return
+            try:
+                if self._file is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', self.node)
+                    path = os.path.join(self.directory, f'{safe_name}.{os.getpid()}.jsonl')
+                    self._file = open(path, 'a', buffering=1, encoding='utf-8')
+                self._file.write(json.dumps(item, separators=(',', ':')) + '\n')
+            except OSError as e:
+                # ट्रेसिंग की गड़बड़ी नोड को न रोके: फ़ाइल लिखना बंद, मेमोरी में जारी
+                print(f"WARN: Disabling trace file output: {e}")
+                self.directory = None
+
+    def recent(self, trace_id: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """ हाल के स्पैन (नए अंत में); trace_id देने पर केवल उस ब्लॉक के """
+        with self._lock:
+            items = list(self._recent)
+        if trace_id:
+            items = [item for item in items if item['trace_id'] == trace_id]
+        return items[-limit:] if limit > 0 else []
@@ -0,0 +1,271 @@
+"""
+रिमोट माइनर्स के लिए get-work / submit-work (Pool-style Work Distribution)।
+
+नोड की PoW केवल `f'{previous_hash}{proof}'` पर होती है, इसलिए माइनर को पूरा ब्लॉक नहीं चाहिए:
+    1. GET /work -> {work_id, previous_hash, index, difficulty, share_difficulty, nonce_start, nonce_end}
+       हर माइनर को अपनी नॉन्स रेंज मिलती है (रेंज कभी दोहराई नहीं जाती), इसलिए कोई दो माइनर
+       एक ही हैश नहीं गिनते।
+    2. POST /work/submit {work_id, nonce}: `share_difficulty` (ब्लॉक से आसान) वाला हर प्रूफ एक
+       "share" है; इससे हर माइनर की share दर और अनुमानित हैशरेट पता चलती है। जो share पूरी
+       `difficulty` भी पूरी करे उससे नोड `new_block` द्वारा ब्लॉक बनाता है (ट्रांजैक्शन नोड के
+       टेम्पलेट से, रिवॉर्ड माइनर के `reward_address` को)।
+    3. टिप बदलते ही (हमारा ब्लॉक, पीयर का ब्लॉक या reorg) सारा बाकी काम अमान्य हो जाता है;
+       उस पर आया share 'stale' लौटता है। माइनर GET /work/status से सस्ते में जाँच सकता है।
+
+रेफ़रेंस माइनर: wallet/miner_client.py
+"""
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+
+from .blockchain import Blockchain
+from .chain_view import ChainView
+from utils.metrics import REGISTRY
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स (ENV से बदली जा सकती हैं)
+# ----------------------------------------------------
+
+# हर get-work पर दी जाने वाली नॉन्स रेंज का आकार
+WORK_NONCE_RANGE = int(os.environ.get('WORK_NONCE_RANGE', 2 ** 22))
+# share कठिनाई = ब्लॉक कठिनाई - यह (हर स्तर 16 गुना आसान), न्यूनतम 1
+SHARE_DIFFICULTY_OFFSET = int(os.environ.get('SHARE_DIFFICULTY_OFFSET', 1))
+# रिमोट रेंज यहाँ से शुरू होती हैं (नोड का अपना /mine 0 से खोजता है)
+WORK_NONCE_BASE = 2 ** 32
+# share दर इतने सेकंड की खिड़की पर
+SHARE_RATE_WINDOW_SECONDS = 600
+# एक टिप पर अधिकतम बाकी काम और याद रखे गए माइनर्स (पुराने पहले हटते हैं)
+MAX_OUTSTANDING_WORK = 10_000
+MAX_TRACKED_MINERS = 10_000
+
+WORK_ASSIGNED = REGISTRY.counter('mycoin_work_assigned_total', 'Work units handed to remote miners')
+WORK_SHARES = REGISTRY.counter('mycoin_work_shares_total', 'Shares submitted by remote miners', ('result',))
+WORK_INVALIDATED = REGISTRY.counter('mycoin_work_invalidated_total',
+                                    'Outstanding work units dropped because the chain tip changed')
+WORK_OUTSTANDING = REGISTRY.gauge('mycoin_work_outstanding', 'Work units valid for the current tip')
+
+
+class Work:
+    """ एक माइनर को दिया गया काम (एक टिप, एक नॉन्स रेंज) """
+    __slots__ = ('work_id', 'miner', 'reward_address', 'previous_hash', 'index', 'difficulty', 'share_difficulty',
+                 'nonce_start', 'nonce_end', 'issued_at', 'nonces')
+
+    def __init__(self, work_id: str, miner: str, reward_address: str, view: ChainView, share_difficulty: int,
+                 nonce_start: int, nonce_end: int):
+        self.work_id = work_id
+        self.miner = miner
+        self.reward_address = reward_address
+        self.previous_hash = view.tip_hash
+        self.index = view.length + 1
+        self.difficulty = view.difficulty
+        self.share_difficulty = share_difficulty
+        self.nonce_start = nonce_start
+        self.nonce_end = nonce_end
+        self.issued_at = time.time()
+        # इस काम पर आए shares (दोहराव पकड़ने के लिए)
+        self.nonces = set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'work_id': self.work_id,
+            'previous_hash': self.previous_hash,
+            'index': self.index,
+            'difficulty': self.difficulty,
+            'share_difficulty': self.share_difficulty,
+            'nonce_start': self.nonce_start,
+            'nonce_end': self.nonce_end,
+        }
+
+
+class MinerStats:
+    """ एक माइनर के आँकड़े (share दर खिड़की पर) """
+    __slots__ = ('assigned', 'shares', 'blocks', 'stale', 'invalid', 'duplicate', 'first_seen', 'last_share_at',
+                 'share_difficulty', '_share_times')
+
+    def __init__(self):
+        self.assigned = self.shares = self.blocks = self.stale = self.invalid = self.duplicate = 0
+        self.first_seen = time.time()
+        self.last_share_at: Optional[float] = None
+        self.share_difficulty = 1
+        self._share_times: Deque[float] = deque()
+
+    def record_share(self, now: float):
+        self.shares += 1
+        self.last_share_at = now
+        self._share_times.append(now)
+        while self._share_times and now - self._share_times[0] > SHARE_RATE_WINDOW_SECONDS:
+            self._share_times.popleft()
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        while self._share_times and now - self._share_times[0] > SHARE_RATE_WINDOW_SECONDS:
+            self._share_times.popleft()
+        elapsed = min(SHARE_RATE_WINDOW_SECONDS, max(now - self.first_seen, 1e-9))
+        share_rate = len(self._share_times) / elapsed
+        return {
+            'assigned': self.assigned,
+            'shares': self.shares,
+            'blocks': self.blocks,
+            'stale': self.stale,
+            'invalid': self.invalid,
+            'duplicate': self.duplicate,
+            'share_rate': share_rate,
+            # हर share औसतन 16^share_difficulty हैश
+            'estimated_hashrate': share_rate * 16 ** self.share_difficulty,
+            'last_share_at': self.last_share_at,
+        }
+
+
+# ----------------------------------------------------
+# 1. वर्क मैनेजर
+# ----------------------------------------------------
+
+class WorkManager:
+    def __init__(self, blockchain: Blockchain, nonce_range: int = WORK_NONCE_RANGE,
+                 share_offset: int = SHARE_DIFFICULTY_OFFSET):
+        self.blockchain = blockchain
+        self.nonce_range = nonce_range
+        self.share_offset = share_offset
+        self._work: 'OrderedDict[str, Work]' = OrderedDict()
+        # हाल में अमान्य हुआ काम -> माइनर (stale shares सही माइनर के नाम दर्ज हों)
+        self._expired: 'OrderedDict[str, str]' = OrderedDict()
+        self._miners: 'OrderedDict[str, MinerStats]' = OrderedDict()
+        # जिस व्यू (टिप) के लिए बाकी काम मान्य है
+        self._view: Optional[ChainView] = None
+        self._next_nonce = WORK_NONCE_BASE
+        self._lock = threading.Lock()
+        # हर प्रकाशित इवेंट पर टिप जाँचें: नया ब्लॉक/reorg होते ही बाकी काम अमान्य
+        blockchain.events.add_listener(self._on_event)
+        WORK_OUTSTANDING.set_function(lambda: len(self._work))
+
+    def _on_event(self):
+        view = self.blockchain.view
+        if view is not None:
+            with self._lock:
+                self._sync_tip(view)
+
+    def _sync_tip(self, view: ChainView) -> ChainView:
+        """ self._lock के अंदर: नया व्यू हो तो अपनाएँ, टिप बदली हो तो सारा काम अमान्य। रिटर्न: नवीनतम व्यू """
+        current = self._view
+        if current is None or view.version > current.version:
+            if current is None or view.tip_hash != current.tip_hash:
+                if self._work:
+                    WORK_INVALIDATED.inc(len(self._work))
+                for work_id, work in self._work.items():
+                    self._expired[work_id] = work.miner
+                while len(self._expired) > MAX_OUTSTANDING_WORK:
+                    self._expired.popitem(last=False)
+                self._work.clear()
+                self._next_nonce = WORK_NONCE_BASE
+            self._view = view
+        return self._view
+
+    def _stats(self, miner: str) -> MinerStats:
+        stats = self._miners.get(miner)
+        if stats is None:
+            stats = self._miners[miner] = MinerStats()
+            while len(self._miners) > MAX_TRACKED_MINERS:
+                self._miners.popitem(last=False)
+        self._miners.move_to_end(miner)
+        return stats
+
+    # ------------------------------------------------
+    # API
+    # ------------------------------------------------
+    def get_work(self, miner: str, reward_address: str) -> Optional[Dict[str, Any]]:
+        """ नवीनतम टिप पर नई नॉन्स रेंज। None = चेन अभी लोड नहीं हुई। """
+        view = self.blockchain.view
+        if view is None:
+            return None
+        with self._lock:
+            view = self._sync_tip(view)
+            share_difficulty = max(1, view.difficulty - self.share_offset)
+            start = self._next_nonce
+            self._next_nonce += self.nonce_range
+            work = Work(secrets.token_hex(8), miner, reward_address, view, share_difficulty, start,
+                        start + self.nonce_range)
+            self._work[work.work_id] = work
+            while len(self._work) > MAX_OUTSTANDING_WORK:
+                self._work.popitem(last=False)
+            stats = self._stats(miner)
+            stats.assigned += 1
+            stats.share_difficulty = share_difficulty
+        WORK_ASSIGNED.inc()
+        return work.to_dict()
+
+    def submit(self, work_id: str, nonce: Any) -> Dict[str, Any]:
+        """
+        एक share जाँचता है। result: 'block' | 'share' | 'stale' (काम अब मान्य नहीं) |
+        'invalid' (रेंज से बाहर या प्रूफ गलत) | 'duplicate'
+        """
+        view = self.blockchain.view
+        with self._lock:
+            if view is not None:
+                self._sync_tip(view)
+            work = self._work.get(work_id)
+            if work is None:
+                miner = self._expired.get(work_id)
+                if miner is not None and miner in self._miners:
+                    self._miners[miner].stale += 1
+                WORK_SHARES.inc(1, ('stale',))
+                return {'result': 'stale', 'message': 'Unknown or expired work; the chain tip has changed'}
+
+            stats = self._stats(work.miner)
+            if not isinstance(nonce, int) or isinstance(nonce, bool) or not work.nonce_start <= nonce < work.nonce_end:
+                stats.invalid += 1
+                WORK_SHARES.inc(1, ('invalid',))
+                return {'result': 'invalid', 'message': 'Nonce outside the assigned range'}
+            if nonce in work.nonces:
+                stats.duplicate += 1
+                WORK_SHARES.inc(1, ('duplicate',))
+                return {'result': 'duplicate', 'message': 'Share already submitted'}
+            if not Blockchain.valid_proof(work.previous_hash, nonce, work.share_difficulty):
+                stats.invalid += 1
+                WORK_SHARES.inc(1, ('invalid',))
+                return {'result': 'invalid', 'message': 'Proof does not meet the share difficulty'}
+
+            work.nonces.add(nonce)
+            stats.record_share(time.time())
+            is_block = Blockchain.valid_proof(work.previous_hash, nonce, work.difficulty)
+
+        if not is_block:
+            WORK_SHARES.inc(1, ('share',))
+            return {'result': 'share', 'message': 'Share accepted'}
+
+        # लॉक के बाहर: new_block का 'block' इवेंट _on_event से सारा काम अमान्य करता है
+        block = self.blockchain.new_block(proof=nonce, previous_hash=work.previous_hash,
+                                          miner_address=work.reward_address)
+        if block is None:
+            with self._lock:
+                stats.stale += 1
+            WORK_SHARES.inc(1, ('stale',))
+            return {'result': 'stale', 'message': 'The chain tip changed before the block could be added'}
+
+        with self._lock:
+            stats.blocks += 1
+        WORK_SHARES.inc(1, ('block',))
+        return {'result': 'block', 'message': 'Block found and added to the chain',
+                'index': block['index'], 'hash': Blockchain.hash(block), 'reward': block['transactions'][0]['amount']}
+
+    def status(self, work_id: str) -> Dict[str, Any]:
+        """ माइनर के लिए सस्ती जाँच: क्या यह काम अभी भी वर्तमान टिप पर है """
+        view = self.blockchain.view
+        with self._lock:
+            if view is not None:
+                view = self._sync_tip(view)
+            valid = work_id in self._work
+        return {'work_id': work_id, 'valid': valid, 'tip': view.tip_hash if view else None}
+
+    def miners(self) -> Dict[str, Any]:
+        """ हर माइनर के आँकड़े (share दर, अनुमानित हैशरेट, stale/invalid गिनती) """
+        now = time.time()
+        with self._lock:
+            miners = {miner: stats.to_dict(now) for miner, stats in self._miners.items()}
+            outstanding = len(self._work)
+        return {
+            'miners': miners,
+            'outstanding_work': outstanding,
+            'estimated_hashrate': sum(stats['estimated_hashrate'] for stats in miners.values()),
+        }
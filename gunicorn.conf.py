@@ -0,0 +1,42 @@
+# gunicorn.conf.py: MyCoin नोड को कई Gunicorn वर्कर्स पर चलाने के लिए कॉन्फ़िगरेशन।
+#
+# उपयोग:  gunicorn -c gunicorn.conf.py api.node_api:app
+#
+# मास्टर प्रोसेस शुरू होते ही एक अलग "स्टेट ओनर" प्रोसेस शुरू करता है, जिसके पास
+# एकमात्र Blockchain (चेन, मेमोरी पूल, बैलेंस) होता है। सभी HTTP वर्कर्स लोकल IPC
+# (multiprocessing manager) से उसी स्टेट को पढ़ते/बदलते हैं, इसलिए वर्कर 1 में जोड़ा गया
+# ट्रांजैक्शन वर्कर 2 के /mine में भी दिखाई देता है।
+import os
+import secrets
+
+from core.state_server import (
+    DEFAULT_STATE_ADDRESS, STATE_ADDRESS_ENV, STATE_AUTHKEY_ENV, start_state_owner,
+)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+# /mine और /nodes/resolve लंबे चल सकते हैं
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+_state_owner = None
+
+
+def on_starting(server):
+    """ वर्कर्स के fork होने से पहले स्टेट ओनर शुरू करें और उसका पता ENV में डालें """
+    global _state_owner
+    address = os.environ.setdefault(STATE_ADDRESS_ENV, DEFAULT_STATE_ADDRESS)
+    authkey = os.environ.setdefault(STATE_AUTHKEY_ENV, secrets.token_hex(16))
+
+    _state_owner = start_state_owner(
+        address,
+        authkey,
+        node_address=os.environ.get('NODE_ADDRESS'),
+        connect_node_url=os.environ.get('CONNECT_NODE'),
+    )
+    server.log.info(f"Chain state owner started (pid {_state_owner.pid}) on {address}")
+
+
+def on_exit(server):
+    if _state_owner is not None and _state_owner.is_alive():
+        _state_owner.terminate()
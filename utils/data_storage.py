@@ -1,11 +1,20 @@
 import json
 import os
+import time
 from typing import Optional, Dict, Any, List, Set, Tuple # <--- यह लाइन जोड़ें
+
+from utils.metrics import REGISTRY
+
 # डेटा फ़ाइल का नाम
 DATA_FILE = 'blockchain.json'
 # डेटा को प्रोजेक्ट रूट में 'data/' फ़ोल्डर में सेव करें
 DATA_PATH = os.path.join('data', DATA_FILE)
 
+# Persistence मेट्रिक्स
+SAVE_SECONDS = REGISTRY.histogram('mycoin_save_blockchain_duration_seconds', 'Time spent in save_blockchain')
+SAVE_BYTES = REGISTRY.counter('mycoin_save_blockchain_bytes_total', 'Bytes written by save_blockchain')
+SAVE_LAST_BYTES = REGISTRY.gauge('mycoin_save_blockchain_last_bytes', 'Size of the last saved data file')
+
 def ensure_data_directory():
     """ सुनिश्चित करता है कि डेटा फ़ोल्डर मौजूद है """
     data_dir = os.path.dirname(DATA_PATH)
@@ -13,9 +22,11 @@ def ensure_data_directory():
         os.makedirs(data_dir)
         # print(f"Created data directory: {data_dir}")
 
-def save_blockchain(chain_data: List[Dict[str, Any]], current_difficulty: int, current_nodes: Set[str]):
+def save_blockchain(chain_data: List[Dict[str, Any]], current_difficulty: int, current_nodes: Set[str],
+                    pruned: Optional[Dict[str, Any]] = None):
     """
     ब्लॉकचेन चेन, कठिनाई, और नोड लिस्ट को डिस्क पर JSON फ़ाइल में सेव करता है।
+    pruned नोड पर `pruned` में प्रून की गई ऊँचाई और उस बिंदु का बैलेंस स्नैपशॉट होता है।
     """
     ensure_data_directory()
     
@@ -25,10 +36,17 @@ def save_blockchain(chain_data: List[Dict[str, Any]], current_difficulty: int, c
         # नोड सेट को लिस्ट में बदलें क्योंकि JSON सेट को सेव नहीं कर सकता
         'nodes': list(current_nodes), 
     }
+    if pruned:
+        data_to_save['pruned'] = pruned
     
+    start = time.perf_counter()
     try:
         with open(DATA_PATH, 'w') as f:
             json.dump(data_to_save, f, indent=4)
+            bytes_written = f.tell()
+        SAVE_SECONDS.observe(time.perf_counter() - start)
+        SAVE_BYTES.inc(bytes_written)
+        SAVE_LAST_BYTES.set(bytes_written)
         # print(f"\n✅ Blockchain data successfully saved to {DATA_PATH}")
     except Exception as e:
         print(f"\n❌ Error saving blockchain data: {e}")
@@ -0,0 +1,230 @@
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+# लेटेंसी हिस्टोग्राम के लिए डिफ़ॉल्ट बकेट (सेकंड में)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+# ----------------------------------------------------
+# 1. प्रति-थ्रेड शार्ड्स (Per-thread Shards)
+# ----------------------------------------------------
+
+class _ThreadShards:
+    """
+    हर थ्रेड को अपना अलग शार्ड (dict) देता है, ताकि inc()/observe() बिना लॉक के हो सकें।
+    लॉक केवल तब लगता है जब कोई थ्रेड पहली बार शार्ड बनाता है, या स्क्रेप के समय
+    बंद हो चुके थ्रेड्स के शार्ड्स को `_retired` में मिलाया जाता है।
+    """
+    def __init__(self, merge: Callable[[dict, dict], None]):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._merge = merge
+
+    def get(self) -> dict:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def collect(self) -> dict:
+        """ सभी शार्ड्स को मिलाकर एक नया dict रिटर्न करता है """
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    # Werkzeug हर अनुरोध के लिए नया थ्रेड बनाता है; मरे हुए थ्रेड्स के शार्ड्स को समेट दें
+                    self._merge(self._retired, shard)
+            self._shards = alive
+
+            total: dict = {}
+            self._merge(total, self._retired)
+            for _, shard in alive:
+                self._merge(total, shard)
+        return total
+
+
+def _label_text(labelnames: Sequence[str], values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    body = ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return '{' + body + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# ----------------------------------------------------
+# 2. मेट्रिक प्रकार (Counter, Gauge, Histogram)
+# ----------------------------------------------------
+
+class Counter:
+    """ केवल बढ़ने वाला काउंटर """
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._shards = _ThreadShards(self._merge)
+
+    @staticmethod
+    def _merge(into: dict, shard: dict):
+        for key, value in list(shard.items()):
+            into[key] = into.get(key, 0) + value
+
+    def inc(self, amount: float = 1, labels: LabelValues = ()):
+        shard = self._shards.get()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f'{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}'
+                for labels, value in sorted(self._shards.collect().items())]
+
+
+class Gauge:
+    """
+    एक मान जो ऊपर-नीचे हो सकता है। set() एक साधारण dict असाइनमेंट है;
+    set_function() से मान केवल स्क्रेप के समय गणना किया जाता है।
+    """
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, labels: LabelValues = ()):
+        self._values[labels] = value
+
+    def set_function(self, function: Callable[[], float]):
+        self._function = function
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return [f'{self.name} {_format_value(self._function())}']
+            except Exception:
+                return []
+        return [f'{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}'
+                for labels, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """ बकेट वाला हिस्टोग्राम; हर लेबल सेट के लिए [bucket counts..., sum, count] रखता है """
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _ThreadShards(self._merge)
+
+    @staticmethod
+    def _merge(into: dict, shard: dict):
+        for key, values in list(shard.items()):
+            target = into.get(key)
+            if target is None:
+                into[key] = list(values)
+            else:
+                for i, value in enumerate(values):
+                    target[i] += value
+
+    def observe(self, value: float, labels: LabelValues = ()):
+        shard = self._shards.get()
+        row = shard.get(labels)
+        if row is None:
+            # len(buckets) बकेट + sum + count
+            row = shard[labels] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                row[i] += 1
+                break
+        row[-2] += value
+        row[-1] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, row in sorted(self._shards.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_label_text(self.labelnames, labels, ("le", _format_value(bound)))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_label_text(self.labelnames, labels, ("le", "+Inf"))} {row[-1]}')
+            lines.append(f'{self.name}_sum{_label_text(self.labelnames, labels)} {_format_value(row[-2])}')
+            lines.append(f'{self.name}_count{_label_text(self.labelnames, labels)} {row[-1]}')
+        return lines
+
+
+# ----------------------------------------------------
+# 3. रजिस्ट्री और Prometheus टेक्स्ट फ़ॉर्मेट
+# ----------------------------------------------------
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # मॉड्यूल दोबारा इंपोर्ट होने पर पहले वाला मेट्रिक ही इस्तेमाल करें
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (0.0.4) में सभी मेट्रिक्स।
+        जिन मेट्रिक्स का अभी तक कोई सैंपल नहीं है, उन्हें छोड़ दिया जाता है।
+        """
+        lines = []
+        for metric in list(self._metrics.values()):
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+# प्रोसेस-व्यापी डिफ़ॉल्ट रजिस्ट्री
+REGISTRY = Registry()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
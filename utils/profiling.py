@@ -0,0 +1,201 @@
+import collections
+import itertools
+import sys
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+# कितनी पिछली प्रोफ़ाइल्स मेमोरी में रखी जाएँ
+MAX_STORED_PROFILES = 20
+# सैंपलिंग प्रोफ़ाइलर का अंतराल (सेकंड)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MAX_STACK_DEPTH = 64
+
+# कितनी रिकॉर्डिंग अभी चल रही हैं। 0 होने पर span() तुरंत no-op रिटर्न करता है,
+# इसलिए बंद होने पर हॉट पाथ्स पर खर्च केवल एक ग्लोबल वेरिएबल की जाँच है।
+_active_recordings = 0
+_local = threading.local()
+_ids = itertools.count(1)
+_profiles: Deque[Dict[str, Any]] = collections.deque(maxlen=MAX_STORED_PROFILES)
+_lock = threading.Lock()
+
+
+# ----------------------------------------------------
+# 1. नामित टाइमिंग स्पैन (Named Timing Spans)
+# ----------------------------------------------------
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'start', 'depth')
+
+    def __init__(self, recorder: 'ProfileRecorder', name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.recorder.depth
+        self.recorder.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.recorder.depth -= 1
+        self.recorder.record(self.name, self.start, end, self.depth)
+        return False
+
+
+def span(name: str):
+    """
+    किसी आंतरिक चरण (PoW, हैशिंग, हस्ताक्षर जाँच...) को नामित स्पैन में लपेटता है।
+    केवल तभी रिकॉर्ड होता है जब इस थ्रेड का मौजूदा अनुरोध प्रोफ़ाइल किया जा रहा हो।
+    """
+    if not _active_recordings:
+        return _NULL_SPAN
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name)
+
+
+# ----------------------------------------------------
+# 2. सैंपलिंग प्रोफ़ाइलर (Stack Sampler)
+# ----------------------------------------------------
+
+class _StackSampler(threading.Thread):
+    """
+    एक थ्रेड के कॉल स्टैक को हर `interval` सेकंड पर सैंपल करता है।
+    परिणाम "collapsed stack" फ़ॉर्मेट में होते हैं (flamegraph.pl / speedscope के लिए)।
+    """
+    def __init__(self, target_thread_id: int, interval: float):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.stacks: Dict[str, int] = collections.Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# ----------------------------------------------------
+# 3. एक अनुरोध की रिकॉर्डिंग
+# ----------------------------------------------------
+
+class ProfileRecorder:
+    """ एक अनुरोध (या किसी भी कोड ब्लॉक) के सभी स्पैन और वैकल्पिक स्टैक सैंपल इकट्ठा करता है """
+    def __init__(self, label: str, sample: bool = False, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.label = label
+        self.depth = 0
+        self.spans: List[Dict[str, Any]] = []
+        self.sample = sample
+        self.interval = interval
+        self._sampler: Optional[_StackSampler] = None
+        self._start = 0.0
+        self.result: Optional[Dict[str, Any]] = None
+
+    def record(self, name: str, start: float, end: float, depth: int):
+        self.spans.append({
+            'name': name,
+            'start_ms': (start - self._start) * 1000,
+            'duration_ms': (end - start) * 1000,
+            'depth': depth,
+        })
+
+    def __enter__(self):
+        global _active_recordings
+        self._start = time.perf_counter()
+        _local.recorder = self
+        with _lock:
+            _active_recordings += 1
+        if self.sample:
+            self._sampler = _StackSampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
+
+    def finish(self) -> Dict[str, Any]:
+        """ रिकॉर्डिंग बंद करता है, परिणाम स्टोर करता है और उसे रिटर्न करता है """
+        global _active_recordings
+        if getattr(_local, 'recorder', None) is not self:
+            return self.result
+        total_ms = (time.perf_counter() - self._start) * 1000
+        _local.recorder = None
+        with _lock:
+            _active_recordings -= 1
+        if self._sampler is not None:
+            self._sampler.stop()
+
+        self.result = {
+            'id': next(_ids),
+            'label': self.label,
+            'timestamp': time.time(),
+            'total_ms': total_ms,
+            'breakdown': self.breakdown(),
+            'spans': self.spans,
+        }
+        if self._sampler is not None:
+            self.result['sample_interval_ms'] = self.interval * 1000
+            self.result['samples'] = self._sampler.samples
+            self.result['stacks'] = dict(self._sampler.stacks.most_common())
+        _profiles.append(self.result)
+        return self.result
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """ हर स्पैन नाम का कुल समय और कॉल संख्या """
+        summary: Dict[str, Dict[str, float]] = {}
+        for item in self.spans:
+            entry = summary.setdefault(item['name'], {'count': 0, 'total_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += item['duration_ms']
+        return dict(sorted(summary.items(), key=lambda kv: kv[1]['total_ms'], reverse=True))
+
+
+def current_recorder() -> Optional[ProfileRecorder]:
+    return getattr(_local, 'recorder', None)
+
+
+def recent_profiles() -> List[Dict[str, Any]]:
+    """ पिछली प्रोफ़ाइल्स का सारांश (स्पैन/स्टैक के बिना) """
+    return [{k: v for k, v in p.items() if k not in ('spans', 'stacks')} for p in list(_profiles)]
+
+
+def get_profile(profile_id: int) -> Optional[Dict[str, Any]]:
+    for profile in list(_profiles):
+        if profile['id'] == profile_id:
+            return profile
+    return None
@@ -1,4 +1,13 @@
 import json
+import time
+
+from utils.metrics import REGISTRY
+from utils.profiling import span
+from wallet.ledger import Ledger, LedgerSnapshot, to_units
+
+# बैलेंस रीप्ले का समय
+RECALCULATE_SECONDS = REGISTRY.histogram('mycoin_balance_recalculate_duration_seconds',
+                                         'Time spent replaying the chain in recalculate_balances')
 
 # ----------------------------------------------------
 # 1. बैलेंस मैनेजर क्लास
@@ -10,45 +19,43 @@ class BalanceManager:
     """
     def __init__(self, blockchain_instance):
         self.blockchain = blockchain_instance
-        self.balances = {}  # {address: amount} के रूप में बैलेंस स्टोर करें
+        # पते घने int id में और बैलेंस int64 फ़िक्स्ड-पॉइंट इकाइयों में (wallet/ledger.py)
+        self.ledger = Ledger()
+
+    @property
+    def balances(self) -> LedgerSnapshot:
+        """ {address: amount} का केवल-पढ़ने वाला स्नैपशॉट (ChainView.balances) """
+        return self.ledger.snapshot()
 
     def _update_balances_from_block(self, block):
         """
         एक ब्लॉक के सभी ट्रांजैक्शन को प्रोसेस करके बैलेंस अपडेट करता है।
         """
-        for tx in block['transactions']:
-            sender = tx['sender']
-            recipient = tx['recipient']
-            amount = tx['amount']
-            
-            # सुनिश्चित करें कि बैलेंस डिक्शनरी में पता मौजूद है
-            if sender not in self.balances:
-                self.balances[sender] = 0.0
-            if recipient not in self.balances:
-                self.balances[recipient] = 0.0
+        self.ledger.apply_block(block)
 
-            # 1. भेजने वाले का बैलेंस घटाएँ (Coinbase को छोड़कर)
-            if sender != "SYSTEM_COINBASE":
-                self.balances[sender] -= amount
-                # सुनिश्चित करें कि बैलेंस ऋणात्मक (negative) न हो जाए (यह केवल सुरक्षा के लिए है, 
-                # new_transaction में जाँच होनी चाहिए)
-                if self.balances[sender] < 0:
-                    self.balances[sender] = 0.0 # यहाँ कोई गंभीर त्रुटि इंगित होती है
-
-            # 2. प्राप्तकर्ता का बैलेंस बढ़ाएँ
-            self.balances[recipient] += amount
+    def apply_block(self, block):
+        """
+        चेन में अभी-अभी जोड़े गए एक ब्लॉक को बैलेंस में लागू करता है (पूरी चेन दोबारा चलाए बिना)।
+        """
+        self._update_balances_from_block(block)
 
     def recalculate_balances(self):
         """
         चेन के जेनेसिस ब्लॉक से शुरू करके सभी बैलेंस की गणना करता है।
         यह कंसेंसस के बाद या नोड शुरू होने पर चलाया जाता है।
         """
-        self.balances = {} # बैलेंस को रीसेट करें
+        start = time.perf_counter()
+        # बैलेंस को रीसेट करें (pruned नोड पर: प्रून किए गए ब्लॉक्स के बाद का स्नैपशॉट)
+        self.ledger.reset(getattr(self.blockchain, 'balance_snapshot', None) or {})
         
-        # चेन के हर ब्लॉक को क्रम से प्रोसेस करें
-        for block in self.blockchain.chain:
-            self._update_balances_from_block(block)
+        # चेन के हर ब्लॉक को क्रम से प्रोसेस करें (प्रून किए गए हेडर स्नैपशॉट में पहले से शामिल हैं)
+        with span('balance_replay'):
+            for block in self.blockchain.chain:
+                if 'transactions' not in block:
+                    continue
+                self._update_balances_from_block(block)
             
+        RECALCULATE_SECONDS.observe(time.perf_counter() - start)
         return self.balances
 
     def get_balance(self, address):
@@ -56,8 +63,7 @@ class BalanceManager:
         किसी दिए गए पते (address) का वर्तमान बैलेंस रिटर्न करता है।
         अगर पता मौजूद नहीं है, तो 0.0 रिटर्न करता है।
         """
-        # यदि बैलेंस पहले ही गणना किया गया है, तो इसे सीधे रिटर्न करें
-        return self.balances.get(address, 0.0)
+        return self.ledger.get_balance(address)
 
 # ----------------------------------------------------
 # 2. ट्रांजैक्शन के लिए जाँच फ़ंक्शन
@@ -70,7 +76,8 @@ def has_sufficient_funds(balance_manager, sender_address, amount):
     current_balance = balance_manager.get_balance(sender_address)
     
     # यदि भेजने वाले का वर्तमान बैलेंस ट्रांजैक्शन राशि से बड़ा या बराबर है
-    if current_balance >= amount:
+    # (फ़िक्स्ड-पॉइंट इकाइयों में तुलना, ताकि float राउंडिंग से सीमा पर गलत नतीजा न आए)
+    if to_units(current_balance) >= to_units(amount):
         return True
     else:
         return False
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+ऐरे-आधारित पूर्णांक बैलेंस लेजर (Array-backed Integer Ledger)।
+
+1. पता इंटर्निंग (Address Interning): हर पता (~120 अक्षर का base64 DER) एक बार घने int id
+   में बदलता है। id कभी नहीं बदलते और टेबल केवल बढ़ती है, इसलिए पुराने स्नैपशॉट भी उसी
+   टेबल से पढ़ सकते हैं।
+2. फ़िक्स्ड-पॉइंट बैलेंस: राशि `COIN` (10^8) इकाइयों के पूर्णांक में, int64 ऐरे में रखी जाती है।
+   लाखों ट्रांसफ़र के बाद भी float राउंडिंग की गलती जमा नहीं होती।
+3. NumPy (वैकल्पिक) हो तो पूरे ब्लॉक के डेल्टा एक साथ (vectorized) लागू होते हैं; न हो तो
+   वही परिणाम साधारण लूप से।
+
+पुराने dict वाले व्यवहार से मेल: कॉइनबेस (SYSTEM_COINBASE) से कुछ नहीं घटता और
+भेजने वाले का बैलेंस शून्य से नीचे जाए तो शून्य कर दिया जाता है।
+"""
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - वैकल्पिक निर्भरता
+    np = None
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+# 1 कॉइन = 10^8 इकाइयाँ (int64 में ~9.2 * 10^10 कॉइन तक)
+COIN = 10 ** 8
+COINBASE_SENDER = 'SYSTEM_COINBASE'
+# इससे छोटे ब्लॉक्स पर NumPy का ओवरहेड साधारण लूप से ज़्यादा है
+VECTORIZE_MIN_TRANSACTIONS = 64
+
+
+def to_units(amount: float) -> int:
+    return int(round(amount * COIN))
+
+
+def from_units(units: int) -> float:
+    return units / COIN
+
+
+# ----------------------------------------------------
+# 1. पता इंटर्निंग टेबल
+# ----------------------------------------------------
+
+class AddressTable:
+    """ पता <-> घना id (केवल जोड़ना; एक ही लेखक, पाठक बिना लॉक के) """
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._addresses: List[str] = []
+
+    def intern(self, address: str) -> int:
+        address_id = self._ids.get(address)
+        if address_id is None:
+            address_id = len(self._addresses)
+            # पहले सूची, फिर dict: पाठक को मिला id हमेशा सूची में मौजूद होता है
+            self._addresses.append(address)
+            self._ids[address] = address_id
+        return address_id
+
+    def get(self, address: str) -> Optional[int]:
+        return self._ids.get(address)
+
+    def address(self, address_id: int) -> str:
+        return self._addresses[address_id]
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+
+# ----------------------------------------------------
+# 2. केवल-पढ़ने वाला स्नैपशॉट (ChainView.balances)
+# ----------------------------------------------------
+
+class LedgerSnapshot(Mapping):
+    """
+    किसी एक पल के बैलेंस (पता -> float)। इकाइयों की अपनी कॉपी रखता है, इसलिए लेजर आगे
+    बदलने पर भी नहीं बदलता। कॉपी एक memcpy है (dict कॉपी की तरह हर पते पर Python काम नहीं)।
+    """
+    __slots__ = ('_table', '_units')
+
+    def __init__(self, table: AddressTable, units: array):
+        self._table = table
+        self._units = units
+
+    def units(self, address: str) -> int:
+        address_id = self._table.get(address)
+        if address_id is None or address_id >= len(self._units):
+            return 0
+        return self._units[address_id]
+
+    def get(self, address: str, default: Any = None) -> Any:
+        address_id = self._table.get(address)
+        if address_id is None or address_id >= len(self._units):
+            return default
+        return self._units[address_id] / COIN
+
+    def __getitem__(self, address: str) -> float:
+        value = self.get(address)
+        if value is None:
+            raise KeyError(address)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for address_id in range(len(self._units)):
+            yield self._table.address(address_id)
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def __reduce__(self):
+        # IPC/पिकल के लिए साधारण dict
+        return dict, (dict(self.items()),)
+
+
+# ----------------------------------------------------
+# 3. लेजर
+# ----------------------------------------------------
+
+class Ledger:
+    """ id -> int64 इकाइयाँ; बदलाव केवल Blockchain.lock के अंदर (एक ही लेखक) """
+    def __init__(self, table: Optional[AddressTable] = None):
+        self.table = table or AddressTable()
+        self._units = array('q')
+
+    def reset(self, balances: Optional[Mapping[str, float]] = None):
+        """ सारे बैलेंस शून्य करके `balances` (जैसे pruned स्नैपशॉट) से शुरू करें। id टेबल बनी रहती है। """
+        self._units = array('q', bytes(8 * len(self.table)))
+        for address, amount in (balances or {}).items():
+            self._units[self._intern(address)] = to_units(amount)
+
+    def _intern(self, address: str) -> int:
+        address_id = self.table.intern(address)
+        self._grow()
+        return address_id
+
+    def get_units(self, address: str) -> int:
+        address_id = self.table.get(address)
+        if address_id is None or address_id >= len(self._units):
+            return 0
+        return self._units[address_id]
+
+    def get_balance(self, address: str) -> float:
+        return self.get_units(address) / COIN
+
+    def snapshot(self) -> LedgerSnapshot:
+        return LedgerSnapshot(self.table, array('q', self._units))
+
+    # ------------------------------------------------
+    # ब्लॉक लागू करना
+    # ------------------------------------------------
+    def _ids(self, addresses: List[str]) -> List[int]:
+        """ पतों के id (नए पते इंटर्न करके); लेजर ऐरे सभी id तक बढ़ा दिया जाता है """
+        lookup = self.table._ids.get
+        ids = [lookup(address) for address in addresses]
+        if None in ids:
+            ids = [self.table.intern(address) for address in addresses]
+            self._grow()
+        return ids
+
+    def _grow(self):
+        missing = len(self.table) - len(self._units)
+        if missing > 0:
+            self._units.frombytes(bytes(8 * missing))
+
+    def apply_block(self, block: Dict[str, Any]):
+        transactions = block['transactions']
+        if np is not None and len(transactions) >= VECTORIZE_MIN_TRANSACTIONS and self._apply_vectorized(transactions):
+            return
+
+        lookup = self.table._ids.get
+        units = self._units
+        for tx in transactions:
+            sender = tx['sender']
+            recipient = tx['recipient']
+            sender_id = lookup(sender)
+            if sender_id is None:
+                sender_id = self._intern(sender)
+                units = self._units
+            recipient_id = lookup(recipient)
+            if recipient_id is None:
+                recipient_id = self._intern(recipient)
+                units = self._units
+            amount = round(tx['amount'] * COIN)
+
+            # 1. भेजने वाले का बैलेंस घटाएँ (Coinbase को छोड़कर)
+            if sender != COINBASE_SENDER:
+                balance = units[sender_id] - amount
+                # शून्य से नीचे जाना कोई गंभीर त्रुटि इंगित करता है
+                units[sender_id] = balance if balance > 0 else 0
+            # 2. प्राप्तकर्ता का बैलेंस बढ़ाएँ
+            units[recipient_id] += amount
+
+    def _apply_vectorized(self, transactions: List[Dict[str, Any]]) -> bool:
+        """
+        पूरे ब्लॉक के डेल्टा एक साथ। केवल तभी जब कोई भेजने वाला ब्लॉक के बीच में शून्य से नीचे न जा
+        सके (शुरुआती बैलेंस >= ब्लॉक में उसका कुल भेजा)। वरना False: क्रम से लागू करें।
+        """
+        count = len(transactions)
+        sender_addresses = [tx['sender'] for tx in transactions]
+        senders = np.fromiter(self._ids(sender_addresses), dtype=np.int64, count=count)
+        recipients = np.fromiter(self._ids([tx['recipient'] for tx in transactions]), dtype=np.int64, count=count)
+        amounts = np.rint(np.fromiter((tx['amount'] for tx in transactions), dtype=np.float64, count=count)
+                          * COIN).astype(np.int64)
+        debit = np.fromiter((address != COINBASE_SENDER for address in sender_addresses), dtype=bool, count=count)
+
+        balances = np.frombuffer(self._units, dtype=np.int64)
+        try:
+            # हर भेजने वाले का ब्लॉक में कुल भेजा (केवल ब्लॉक के पतों पर काम, पूरे लेजर पर नहीं)
+            unique_senders, inverse = np.unique(senders[debit], return_inverse=True)
+            sent = np.zeros(len(unique_senders), dtype=np.int64)
+            np.add.at(sent, inverse, amounts[debit])
+            if (balances[unique_senders] < sent).any():
+                return False
+            balances[unique_senders] -= sent
+            np.add.at(balances, recipients, amounts)
+            return True
+        finally:
+            # NumPy व्यू रहते array का आकार नहीं बदल सकता
+            del balances
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(self.snapshot().items())
+
+
+def replay_balances(blocks: Iterable[Dict[str, Any]], start: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+    """
+    `start` (जैसे pruned बैलेंस स्नैपशॉट) से शुरू करके ब्लॉक्स पूर्णांक इकाइयों में लागू करता है और
+    float केवल अंत में बनाता है, ताकि प्रून स्नैपशॉट और स्नैपशॉट कमिटमेंट लाइव लेजर से बिल्कुल मेल खाएँ।
+    """
+    ledger = Ledger()
+    ledger.reset(start)
+    for block in blocks:
+        ledger.apply_block(block)
+    return ledger.to_dict()
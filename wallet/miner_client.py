@@ -0,0 +1,146 @@
+"""
+रेफ़रेंस रिमोट माइनर (get-work / submit-work, core/work_manager.py देखें)।
+
+पूरा नोड चलाए बिना किसी भी मशीन की CPU को नोड की माइनिंग में जोड़ता है:
+    1. GET /work से अपनी नॉन्स रेंज लें
+    2. sha256(f'{previous_hash}{nonce}') खोजें; share_difficulty वाला हर प्रूफ /work/submit पर भेजें
+    3. हर STATUS_INTERVAL_SECONDS पर /work/status पूछें; टिप बदल गई हो या रेंज ख़त्म हो तो नया काम लें
+
+--processes N से N स्वतंत्र वर्कर्स चलते हैं (हर एक की अपनी रेंज और आँकड़े: <miner>-<i>)।
+इसके लिए केवल `requests` चाहिए (PoW के लिए hashlib, pycryptodome नहीं)।
+
+उपयोग:
+    python -m wallet.miner_client --node http://127.0.0.1:5000 --reward-address <पता> --processes 4
+"""
+import argparse
+import hashlib
+import os
+import socket
+import time
+from multiprocessing import Process
+from typing import Any, Dict, Optional
+
+import requests
+
+# ----------------------------------------------------
+# ग्लोबल सेटिंग्स
+# ----------------------------------------------------
+
+NODE_URL = 'http://localhost:5000'
+# हर इतने सेकंड पर जाँचें कि काम अभी भी वर्तमान टिप पर है
+STATUS_INTERVAL_SECONDS = 1.0
+# स्टेटस जाँच के बीच कम से कम इतनी नॉन्स (घड़ी पढ़ना भी सस्ता नहीं)
+CHUNK_NONCES = 20_000
+# नोड न मिले / लोड हो रहा हो तो इतना रुकें
+RETRY_SECONDS = 2.0
+REPORT_INTERVAL_SECONDS = 10.0
+
+
+def fetch_work(session: requests.Session, node: str, miner: str, reward_address: Optional[str]) -> Optional[Dict[str, Any]]:
+    params = {'miner': miner}
+    if reward_address:
+        params['reward_address'] = reward_address
+    try:
+        response = session.get(f'{node}/work', params=params, timeout=10)
+        if response.status_code != 200:
+            return None
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+
+def work_is_valid(session: requests.Session, node: str, work_id: str) -> bool:
+    try:
+        response = session.get(f'{node}/work/status', params={'work_id': work_id}, timeout=5)
+        return response.status_code == 200 and response.json().get('valid', False)
+    except (requests.exceptions.RequestException, ValueError):
+        # नोड से बात न हो पाए तो खोज जारी रखें; submit पर पता चल जाएगा
+        return True
+
+
+def submit_share(session: requests.Session, node: str, work_id: str, nonce: int) -> Dict[str, Any]:
+    try:
+        response = session.post(f'{node}/work/submit', json={'work_id': work_id, 'nonce': nonce}, timeout=30)
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return {'result': 'error', 'message': str(e)}
+
+
+def mine_work(session: requests.Session, node: str, work: Dict[str, Any], stats: Dict[str, int]) -> str:
+    """
+    एक काम की रेंज खोजता है। रिटर्न: 'block' (हमने ब्लॉक पाया), 'stale' (टिप बदल गई) या 'exhausted'।
+    """
+    prefix = work['previous_hash'].encode()
+    share_target = '0' * work['share_difficulty']
+    nonce, end = work['nonce_start'], work['nonce_end']
+    sha256 = hashlib.sha256
+    last_check = time.monotonic()
+
+    while nonce < end:
+        chunk_end = min(end, nonce + CHUNK_NONCES)
+        for candidate in range(nonce, chunk_end):
+            if sha256(prefix + str(candidate).encode()).hexdigest().startswith(share_target):
+                result = submit_share(session, node, work['work_id'], candidate)
+                outcome = result.get('result')
+                stats[outcome] = stats.get(outcome, 0) + 1
+                if outcome in ('block', 'stale'):
+                    stats['hashes'] += candidate + 1 - nonce
+                    if outcome == 'block':
+                        print(f"Block {result.get('index')} found: {result.get('hash')} (reward {result.get('reward')})")
+                    return outcome
+        stats['hashes'] += chunk_end - nonce
+        nonce = chunk_end
+
+        now = time.monotonic()
+        if now - last_check >= STATUS_INTERVAL_SECONDS:
+            last_check = now
+            if not work_is_valid(session, node, work['work_id']):
+                stats['invalidated'] = stats.get('invalidated', 0) + 1
+                return 'stale'
+    return 'exhausted'
+
+
+def run_miner(node: str, miner: str, reward_address: Optional[str], max_blocks: Optional[int] = None):
+    """ एक वर्कर: काम लेना -> खोजना -> दोहराना (max_blocks ब्लॉक्स के बाद रुकता है) """
+    session = requests.Session()
+    stats: Dict[str, int] = {'hashes': 0}
+    started = last_report = time.monotonic()
+    blocks = 0
+
+    while max_blocks is None or blocks < max_blocks:
+        work = fetch_work(session, node, miner, reward_address)
+        if work is None:
+            time.sleep(RETRY_SECONDS)
+            continue
+        if mine_work(session, node, work, stats) == 'block':
+            blocks += 1
+
+        now = time.monotonic()
+        if now - last_report >= REPORT_INTERVAL_SECONDS:
+            last_report = now
+            print(f"[{miner}] {stats['hashes'] / (now - started):,.0f} H/s  "
+                  f"shares: {stats.get('share', 0) + stats.get('block', 0)}  blocks: {stats.get('block', 0)}  "
+                  f"stale: {stats.get('stale', 0) + stats.get('invalidated', 0)}")
+    print(f"[{miner}] done: {stats}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="MyCoin reference remote miner (get-work / submit-work)")
+    parser.add_argument('-n', '--node', type=str, default=NODE_URL, help='The URL of the MyCoin node API')
+    parser.add_argument('--reward-address', type=str, default=None,
+                        help='Address that receives block rewards (default: the node address)')
+    parser.add_argument('--miner', type=str, default=socket.gethostname(), help='Miner name shown in /work/miners')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Independent mining workers')
+    parser.add_argument('--max-blocks', type=int, default=None, help='Stop each worker after this many blocks')
+    args = parser.parse_args()
+
+    node = args.node.rstrip('/')
+    if args.processes <= 1:
+        run_miner(node, args.miner, args.reward_address, args.max_blocks)
+    else:
+        workers = [Process(target=run_miner, args=(node, f'{args.miner}-{i}', args.reward_address, args.max_blocks),
+                           daemon=True) for i in range(args.processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
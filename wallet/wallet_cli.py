@@ -1,10 +1,15 @@
+import csv
 import json
+import time
 import requests
 import os
 import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from Crypto.PublicKey import ECC
 
 # core/cryptos.py से आवश्यक फ़ंक्शन इंपोर्ट करें
-from core.cryptos import generate_wallet, sign_transaction 
+from core.cryptos import generate_wallet, sign_transaction, sign_transaction_with_key 
 
 # ----------------------------------------------------
 # ग्लोबल सेटिंग्स
@@ -131,7 +136,149 @@ def display_public_address_cli(address):
 
 
 # ----------------------------------------------------
-# 3. मुख्य CLI मेनू
+# 3. बैच मोड (Non-interactive Bulk Signing & Submission)
+# ----------------------------------------------------
+# उदाहरण:
+#   python wallet/wallet_cli.py --wallet alice_key.json --batch payouts.csv --out results.jsonl
+#   python wallet/wallet_cli.py --wallet alice_key.json --batch payouts.jsonl --dry-run --workers 8
+# इनपुट: CSV (हेडर: recipient,amount) या JSONL ({"recipient": ..., "amount": ...} प्रति लाइन)
+
+# हर वर्कर प्रोसेस में एक बार इंपोर्ट की गई प्राइवेट की
+_WORKER_KEY = None
+_WORKER_SENDER = None
+
+
+def load_payouts(path):
+    """ CSV या JSONL फ़ाइल से भुगतान (recipient, amount) की लिस्ट पढ़ें """
+    payouts = []
+    with open(path, 'r', newline='') as f:
+        if path.endswith('.jsonl') or path.endswith('.ndjson'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for line_no, row in enumerate(rows, start=1):
+            payouts.append({'line': line_no, 'recipient': row['recipient'].strip(), 'amount': float(row['amount'])})
+    return payouts
+
+
+def _init_signing_worker(private_key_pem, sender):
+    """ ProcessPool initializer: की को प्रति प्रोसेस केवल एक बार इंपोर्ट करें """
+    global _WORKER_KEY, _WORKER_SENDER
+    _WORKER_KEY = ECC.import_key(private_key_pem)
+    _WORKER_SENDER = sender
+
+
+def _sign_payout(payout):
+    return sign_transaction_with_key(_WORKER_KEY, _WORKER_SENDER, payout['recipient'], payout['amount'])
+
+
+def sign_payouts(wallet_data, payouts, workers):
+    """ सभी भुगतानों को वर्कर प्रोसेसेस में समानांतर (parallel) साइन करें """
+    sender = wallet_data['public_address']
+    if workers <= 1:
+        _init_signing_worker(wallet_data['private_key'], sender)
+        signatures = [_sign_payout(p) for p in payouts]
+    else:
+        chunksize = max(1, len(payouts) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_signing_worker,
+                                 initargs=(wallet_data['private_key'], sender)) as executor:
+            signatures = list(executor.map(_sign_payout, payouts, chunksize=chunksize))
+
+    return [{
+        'sender': sender,
+        'recipient': payout['recipient'],
+        'amount': payout['amount'],
+        'signature': signature,
+    } for payout, signature in zip(payouts, signatures)]
+
+
+def _make_session(concurrency):
+    """ keep-alive कनेक्शन पूल वाला सेशन; पूल का आकार समवर्तीता (concurrency) के बराबर """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _submit_one(session, transaction):
+    try:
+        response = session.post(f'{NODE_URL}/transactions/new', json=transaction, timeout=30)
+        try:
+            message = response.json().get('message')
+        except ValueError:
+            message = response.text
+        return [{'accepted': response.status_code == 201, 'status': response.status_code, 'message': message}]
+    except requests.exceptions.RequestException as e:
+        return [{'accepted': False, 'status': None, 'message': str(e)}]
+
+
+def _submit_chunk(session, transactions):
+    """ /transactions/batch पर एक साथ कई ट्रांजैक्शन भेजें """
+    try:
+        response = session.post(f'{NODE_URL}/transactions/batch', json={'transactions': transactions}, timeout=120)
+        if response.status_code != 200:
+            return [{'accepted': False, 'status': response.status_code, 'message': response.text}] * len(transactions)
+        return [{'accepted': r['accepted'], 'status': response.status_code, 'message': r['message']}
+                for r in response.json()['results']]
+    except requests.exceptions.RequestException as e:
+        return [{'accepted': False, 'status': None, 'message': str(e)}] * len(transactions)
+
+
+def submit_transactions(transactions, concurrency, chunk_size):
+    """ सीमित समवर्तीता (bounded concurrency) के साथ साझा सेशन पर ट्रांजैक्शन भेजें """
+    session = _make_session(concurrency)
+    chunks = [transactions[i:i + chunk_size] for i in range(0, len(transactions), chunk_size)]
+    submit = _submit_chunk if chunk_size > 1 else (lambda s, chunk: _submit_one(s, chunk[0]))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        chunk_results = list(executor.map(lambda chunk: submit(session, chunk), chunks))
+    session.close()
+    return [result for results in chunk_results for result in results]
+
+
+def run_batch(args):
+    """ बैच मोड: पढ़ें -> साइन करें -> (dry-run न हो तो) भेजें -> परिणाम फ़ाइल लिखें """
+    wallet_data = load_wallet(args.wallet)
+    if not wallet_data:
+        print(f"❌ वॉलेट फ़ाइल नहीं मिली: {args.wallet}")
+        return 1
+
+    payouts = load_payouts(args.batch)
+    print(f"Loaded {len(payouts)} payouts from {args.batch}")
+
+    start = time.perf_counter()
+    transactions = sign_payouts(wallet_data, payouts, args.workers)
+    sign_seconds = time.perf_counter() - start
+    print(f"Signed {len(transactions)} transactions in {sign_seconds:.2f}s "
+          f"({len(transactions) / sign_seconds if sign_seconds else 0:.1f} sig/s, {args.workers} workers)")
+
+    if args.dry_run:
+        results = [{'accepted': None, 'status': None, 'message': 'dry-run'}] * len(transactions)
+    else:
+        start = time.perf_counter()
+        results = submit_transactions(transactions, args.concurrency, args.chunk_size)
+        submit_seconds = time.perf_counter() - start
+        accepted = sum(1 for r in results if r['accepted'])
+        print(f"Submitted {len(results)} transactions in {submit_seconds:.2f}s "
+              f"({len(results) / submit_seconds if submit_seconds else 0:.1f} tx/s): "
+              f"{accepted} accepted, {len(results) - accepted} rejected")
+
+    with open(args.out, 'w') as f:
+        for payout, transaction, result in zip(payouts, transactions, results):
+            f.write(json.dumps({
+                'line': payout['line'],
+                'recipient': transaction['recipient'],
+                'amount': transaction['amount'],
+                'signature': transaction['signature'],
+                **result,
+            }) + '\n')
+    print(f"Results written to {args.out}")
+    return 0
+
+
+# ----------------------------------------------------
+# 4. मुख्य CLI मेनू
 # ----------------------------------------------------
 
 def main_menu():
@@ -191,8 +338,18 @@ if __name__ == '__main__':
         default='http://localhost:5000', 
         help='The URL of the MyCoin node API (default: http://localhost:5000)'
     )
+    parser.add_argument('--batch', type=str, default=None, help='CSV/JSONL file of payouts (recipient, amount); enables batch mode')
+    parser.add_argument('--wallet', type=str, default='my_key.json', help='Wallet file name inside wallet_data/ (batch mode)')
+    parser.add_argument('--out', type=str, default='batch_results.jsonl', help='Results file (batch mode)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Signing worker processes')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum in-flight HTTP requests')
+    parser.add_argument('--chunk-size', type=int, default=1, help='Transactions per request; >1 uses /transactions/batch')
+    parser.add_argument('--dry-run', action='store_true', help='Only sign, do not submit (measures signing throughput)')
     args = parser.parse_args()
     NODE_URL = args.node
     
+    if args.batch:
+        raise SystemExit(run_batch(args))
+
     print(f"Connecting to node at: {NODE_URL}")
     main_menu()